@@ -0,0 +1,70 @@
+"""Per-molecule cost of each ``from_smiles`` mode.
+
+Runs the same SMILES batch under every ``mode`` and prints seconds per
+molecule and the saving relative to the default full 3-D pipeline. Requires
+Java; run from the repository root::
+
+    python benchmarks/bench_modes.py --molecules 200 --repeats 3
+"""
+
+from __future__ import annotations
+
+# stdlib. imports
+import argparse
+import json
+import sys
+from os.path import dirname
+from statistics import median
+from time import perf_counter
+
+# PaDELPy imports
+from padelpy import from_smiles
+
+sys.path.insert(0, dirname(__file__))
+from corpus import generate  # noqa: E402
+
+MODES = (None, "2d", "fingerprints")
+
+
+def bench_mode(smiles: list, mode: str, repeats: int, threads: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        began = perf_counter()
+        from_smiles(smiles, mode=mode, threads=threads, timeout=None)
+        timings.append(perf_counter() - began)
+    seconds = median(timings)
+    return {
+        "mode": mode or "default",
+        "seconds": seconds,
+        "seconds_per_molecule": seconds / len(smiles),
+    }
+
+
+def main(argv: list = None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--molecules", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    smiles = generate(args.molecules, args.seed)
+    results = [bench_mode(smiles, mode, args.repeats, args.threads) for mode in MODES]
+
+    baseline = results[0]["seconds_per_molecule"]
+    print(f"{'mode':<14}{'s/molecule':>12}{'saving':>9}")
+    for result in results:
+        saving = 1 - result["seconds_per_molecule"] / baseline
+        result["saving_vs_default"] = saving
+        print(
+            f"{result['mode']:<14}{result['seconds_per_molecule']:>12.4f}{saving:>9.0%}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Deterministic SMILES corpus for benchmarks.
+
+Molecules are assembled from a small grammar (an optional ring, a chain of
+C/N/O atoms, and substituent branches) that only produces valence-correct
+SMILES, so the same ``seed`` and ``size`` always give the same corpus on every
+machine and Python version.
+"""
+
+from __future__ import annotations
+
+# stdlib. imports
+from random import Random
+
+RINGS = ["c1ccccc1", "C1CCCCC1", "c1ccncc1", "C1CCOC1", "c1ccsc1"]
+SUBSTITUENTS = ["F", "Cl", "O", "N", "C", "CC", "C(=O)O", "C(=O)N", "C#N", "OC"]
+# remaining single-bond valence of a chain atom with two chain neighbours
+BRANCH_SLOTS = {"C": 2, "N": 1, "O": 0}
+
+
+def _molecule(rng: Random) -> str:
+    parts = [rng.choice(RINGS)] if rng.random() < 0.6 else []
+    previous = None
+    for _ in range(rng.randint(1, 8)):
+        atom = rng.choices(["C", "N", "O"], weights=[6, 2, 2])[0]
+        if atom == "O" and previous == "O":
+            atom = "C"
+        branches = rng.randint(0, BRANCH_SLOTS[atom]) if rng.random() < 0.4 else 0
+        parts.append(
+            atom + "".join(f"({rng.choice(SUBSTITUENTS)})" for _ in range(branches))
+        )
+        previous = atom
+    return "".join(parts)
+
+
+def generate(size: int, seed: int = 0) -> list:
+    """Return ``size`` SMILES strings, identical for identical arguments."""
+    rng = Random(seed)
+    return [_molecule(rng) for _ in range(size)]
+
+
+if __name__ == "__main__":
+    print("\n".join(generate(20)))
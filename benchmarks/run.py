@@ -0,0 +1,403 @@
+"""padelpy benchmark suite.
+
+Measures PaDEL cold-start latency, ``from_smiles`` throughput across batch
+sizes and thread counts, fingerprint-only versus descriptor runs, fixed
+versus adaptive batch sizes, the cost of parsing PaDEL's CSV output
+(descriptors, count fingerprints and pandas DataFrames) and
+packed-fingerprint similarity search.
+Results are written to JSON so runs from different versions can be
+compared::
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+
+Benchmarks that need Java are skipped (and reported as such) when ``java`` is
+not on ``PATH``; the CSV parsing and fingerprint benchmarks always run.
+"""
+
+from __future__ import annotations
+
+# stdlib. imports
+import argparse
+import json
+import platform
+import sys
+from csv import writer
+from functools import partial
+from os.path import dirname, join
+from shutil import which
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter, strftime
+
+# PaDELPy imports
+from padelpy import (
+    __version__,
+    from_smiles,
+    from_smiles_adaptive,
+    from_smiles_sharded,
+    padeldescriptor,
+)
+from padelpy.descriptortypes import descriptor_classes, descriptor_columns
+from padelpy.functions import _read_padel_csv_rows
+from padelpy.ingest import read_csv_array
+from padelpy.jvm import JVMOptions
+from padelpy.wrapper import create_cds_archive
+
+sys.path.insert(0, dirname(__file__))
+from corpus import generate  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, requires_java: bool = True):
+    """Register ``func(args) -> list of (params, seconds list, items)``."""
+
+    def _register(func):
+        BENCHMARKS[name] = (func, requires_java)
+        return func
+
+    return _register
+
+
+def _time(func, repeats: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        began = perf_counter()
+        func()
+        timings.append(perf_counter() - began)
+    return timings
+
+
+@benchmark("cold_start")
+def bench_cold_start(args) -> list:
+    """One JVM launch calculating a single small molecule.
+
+    Measured with and without a class-data-sharing archive; the archive run
+    is left out when the JVM cannot create one (Java < 13).
+    """
+    variants = [(False, JVMOptions())]
+    try:
+        variants.append((True, JVMOptions(cds_archive=create_cds_archive())))
+    except RuntimeError as exc:
+        print(f"cold_start: no class-data-sharing archive ({exc})")
+    results = []
+    with TemporaryDirectory(prefix="padelpy_bench_") as tmpdir:
+        smi = join(tmpdir, "input.smi")
+        with open(smi, "w", encoding="utf-8") as smi_file:
+            smi_file.write("CCO")
+        csv_path = join(tmpdir, "out.csv")
+        for cds, jvm in variants:
+            timings = _time(
+                lambda j=jvm: padeldescriptor(
+                    mol_dir=smi, d_file=csv_path, d_2d=True, jvm=j
+                ),
+                args.repeats,
+            )
+            results.append(({"cds": cds}, timings, 1))
+    return results
+
+
+@benchmark("throughput")
+def bench_throughput(args) -> list:
+    """Molecules per second for ``from_smiles`` by batch size and threads."""
+    results = []
+    for batch_size in args.batch_sizes:
+        smiles = generate(batch_size, args.seed)
+        for threads in args.threads:
+            timings = _time(
+                lambda s=smiles, t=threads: from_smiles(s, threads=t, timeout=None),
+                args.repeats,
+            )
+            results.append(
+                ({"batch_size": batch_size, "threads": threads}, timings, batch_size)
+            )
+    return results
+
+
+@benchmark("fingerprints_vs_descriptors")
+def bench_fingerprints(args) -> list:
+    """Fingerprint-only, 2-D, and full descriptor runs on one batch."""
+    smiles = generate(args.batch_sizes[-1], args.seed)
+    variants = {
+        "fingerprints": {"mode": "fingerprints"},
+        "descriptors_2d": {"mode": "2d"},
+        "descriptors_3d": {},
+        "descriptors_and_fingerprints": {"fingerprints": True},
+    }
+    results = []
+    for variant, kwargs in variants.items():
+        timings = _time(
+            lambda kw=kwargs: from_smiles(smiles, timeout=None, **kw), args.repeats
+        )
+        results.append(({"variant": variant}, timings, len(smiles)))
+    return results
+
+
+@benchmark("adaptive_batches")
+def bench_adaptive_batches(args) -> list:
+    """Fixed 100-molecule shards versus adaptive batches (two 2-D classes)."""
+    smiles = generate(args.batch_sizes[-1], args.seed)
+    runners = {
+        "sharded_100": lambda: from_smiles_sharded(
+            smiles, shard_size=100, descriptors=["nC", "MW"]
+        ),
+        "adaptive": lambda: from_smiles_adaptive(smiles, descriptors=["nC", "MW"]),
+    }
+    results = []
+    for runner_name, run_batches in runners.items():
+        timings = _time(run_batches, args.repeats)
+        results.append(({"scheduler": runner_name}, timings, len(smiles)))
+    return results
+
+
+@benchmark("csv_parse", requires_java=False)
+def bench_csv_parse(args) -> list:
+    """Row-dict and array readers on a synthetic full-width PaDEL CSV."""
+    columns = ["Name"] + [
+        column for name in descriptor_classes() for column in descriptor_columns(name)
+    ]
+    results = []
+    with TemporaryDirectory(prefix="padelpy_bench_") as tmpdir:
+        for n_rows in args.csv_rows:
+            csv_path = join(tmpdir, f"rows{n_rows}.csv")
+            with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+                out = writer(csv_file)
+                out.writerow(columns)
+                for idx in range(n_rows):
+                    out.writerow(
+                        [f"AUTOGEN_{idx}"]
+                        + [
+                            f"{(idx * 7 + col) % 1000 / 7:.6f}"
+                            for col in range(1, len(columns))
+                        ]
+                    )
+            readers = {"dictreader": _read_padel_csv_rows}
+            for engine in _array_engines():
+                readers[engine] = partial(read_csv_array, engine=engine)
+            for reader_name, read in readers.items():
+                timings = _time(lambda p=csv_path, r=read: r(p), args.repeats)
+                params = {
+                    "reader": reader_name,
+                    "rows": n_rows,
+                    "columns": len(columns),
+                }
+                results.append((params, timings, n_rows))
+    return results
+
+
+@benchmark("count_fingerprint_parse", requires_java=False)
+def bench_count_fingerprint_parse(args) -> list:
+    """Row dicts versus CSR for 4860 Klekota-Roth counts, ~1% non-zero."""
+    readers = {"dictreader": _read_padel_csv_rows}
+    try:
+        import scipy  # noqa: F401
+
+        from padelpy.fingerprints import read_csv_counts
+
+        readers["sparse"] = read_csv_counts
+    except ImportError:
+        print("count_fingerprint_parse: sparse reader skipped (SciPy not installed)")
+    columns = ["Name"] + [f"KRFPC{idx}" for idx in range(1, 4861)]
+    results = []
+    with TemporaryDirectory(prefix="padelpy_bench_") as tmpdir:
+        for n_rows in args.csv_rows:
+            csv_path = join(tmpdir, f"counts{n_rows}.csv")
+            with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+                out = writer(csv_file)
+                out.writerow(columns)
+                for idx in range(n_rows):
+                    out.writerow(
+                        [f"AUTOGEN_{idx}"]
+                        + [
+                            str((idx + col) % 7) if (idx * 31 + col) % 97 == 0 else "0"
+                            for col in range(1, len(columns))
+                        ]
+                    )
+            for reader_name, read in readers.items():
+                timings = _time(lambda p=csv_path, r=read: r(p), args.repeats)
+                params = {"reader": reader_name, "rows": n_rows}
+                results.append((params, timings, n_rows))
+    return results
+
+
+@benchmark("dataframe_build", requires_java=False)
+def bench_dataframe_build(args) -> list:
+    """``pd.DataFrame`` of row dicts versus ``read_csv_dataframe``."""
+    try:
+        import pandas as pd
+
+        from padelpy.frames import read_csv_dataframe
+    except ImportError:
+        print("dataframe_build: skipped (pandas not installed)")
+        return []
+    columns = ["Name"] + [
+        column for name in descriptor_classes() for column in descriptor_columns(name)
+    ]
+    builders = {
+        "dicts": lambda path: pd.DataFrame(_read_padel_csv_rows(path)),
+        "float64": read_csv_dataframe,
+        "float32": partial(read_csv_dataframe, dtype="float32"),
+    }
+    results = []
+    with TemporaryDirectory(prefix="padelpy_bench_") as tmpdir:
+        for n_rows in args.csv_rows:
+            csv_path = join(tmpdir, f"rows{n_rows}.csv")
+            with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+                out = writer(csv_file)
+                out.writerow(columns)
+                for idx in range(n_rows):
+                    # every other column is a count, as with nC, nHBd, ...
+                    out.writerow(
+                        [f"AUTOGEN_{idx}"]
+                        + [
+                            str((idx + col) % 40)
+                            if col % 2
+                            else f"{(idx * 7 + col) % 1000 / 7:.6f}"
+                            for col in range(1, len(columns))
+                        ]
+                    )
+            for builder_name, build in builders.items():
+                timings = _time(lambda p=csv_path, b=build: b(p), args.repeats)
+                params = {"builder": builder_name, "rows": n_rows}
+                results.append((params, timings, n_rows))
+    return results
+
+
+@benchmark("fingerprint_search", requires_java=False)
+def bench_fingerprint_search(args) -> list:
+    """Packed 881-bit Tanimoto search: one query, and top-10 for 100 queries."""
+    if not _array_engines():
+        print("fingerprint_search: skipped (NumPy not installed)")
+        return []
+    import numpy as np
+
+    from padelpy.fingerprints import PackedFingerprints
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    for size in args.library_sizes:
+        # PubChem fingerprints of drug-like molecules set roughly 15% of bits
+        library = PackedFingerprints.from_bits(rng.random((size, 881)) < 0.15)
+        query, queries = library[0], library[:100]
+        library.similarity(query)  # bit counts are computed once
+        timings = _time(lambda lib=library, q=query: lib.similarity(q), args.repeats)
+        results.append(({"query": "one_vs_many", "library": size}, timings, size))
+        timings = _time(lambda lib=library, q=queries: lib.top_k(q, k=10), args.repeats)
+        results.append(({"query": "top10", "library": size}, timings, 100 * size))
+    return results
+
+
+def _array_engines() -> list:
+    """``read_csv_array`` engines whose dependencies are installed."""
+    engines = []
+    for engine, module in (("numpy", "numpy"), ("pyarrow", "pyarrow")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        engines.append(engine)
+    return engines
+
+
+def _metadata() -> dict:
+    return {
+        "padelpy": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "java": which("java"),
+        "timestamp": strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(args) -> dict:
+    records = []
+    have_java = which("java") is not None
+    for name, (func, requires_java) in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        if requires_java and not have_java:
+            records.append({"benchmark": name, "skipped": "java not found on PATH"})
+            print(f"{name:<30} skipped (java not found on PATH)")
+            continue
+        for params, timings, items in func(args):
+            seconds = median(timings)
+            record = {
+                "benchmark": name,
+                "params": params,
+                "median_seconds": seconds,
+                "min_seconds": min(timings),
+                "repeats": len(timings),
+                "items": items,
+                "items_per_second": items / seconds if seconds else None,
+            }
+            records.append(record)
+            rate = record["items_per_second"] or 0.0
+            print(f"{_label(record):<60} {seconds:>10.4f} s {rate:>12.1f}/s")
+    return {"meta": _metadata(), "results": records}
+
+
+def _label(record: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in record.get("params", {}).items())
+    return f"{record['benchmark']}[{params}]"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """Print best-time ratios against ``baseline``; return regression count.
+
+    The minimum over repeats is compared because it is the least sensitive
+    to background load.
+    """
+    previous = {
+        _label(record): record
+        for record in baseline["results"]
+        if "skipped" not in record
+    }
+    regressions = 0
+    print(f"\ncompared with padelpy {baseline['meta']['padelpy']}:")
+    for record in current["results"]:
+        if "skipped" in record or _label(record) not in previous:
+            continue
+        ratio = record["min_seconds"] / previous[_label(record)]["min_seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{_label(record):<60} {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown fraction reported as a regression (default 0.1)",
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, -1])
+    parser.add_argument("--csv-rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--library-sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(results, out, indent=2)
+    print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,48 @@
 """Public API for padelpy, a Python wrapper around PaDEL-Descriptor."""
 
-from .functions import from_mdl, from_sdf, from_smiles
+from .aio import afrom_sdf, afrom_smiles, apadeldescriptor
+from .cache import DescriptorCache
+from .checkpoint import from_sdf_resumable
+from .coalescer import BatchCoalescer
+from .functions import (
+    from_mdl,
+    from_sdf,
+    from_sdf_isolated,
+    from_smiles,
+    from_smiles_isolated,
+)
+from .parallel import from_sdf_sharded, from_smiles_sharded
+from .scheduler import from_smiles_adaptive
+from .streaming import iter_dataframes, iter_sdf, iter_smiles
 from .version import __version__
-from .wrapper import padeldescriptor
+from .wrapper import (
+    PaDELTimeoutError,
+    create_cds_archive,
+    iter_progress,
+    padeldescriptor,
+)
 
 __all__ = [
     "from_smiles",
     "from_mdl",
     "from_sdf",
     "padeldescriptor",
+    "BatchCoalescer",
+    "from_smiles_sharded",
+    "DescriptorCache",
+    "iter_smiles",
+    "iter_sdf",
+    "from_smiles_isolated",
+    "from_sdf_isolated",
+    "afrom_smiles",
+    "afrom_sdf",
+    "apadeldescriptor",
+    "iter_progress",
+    "create_cds_archive",
+    "from_sdf_resumable",
+    "from_sdf_sharded",
+    "iter_dataframes",
+    "from_smiles_adaptive",
+    "PaDELTimeoutError",
     "__version__",
 ]
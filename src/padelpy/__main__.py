@@ -0,0 +1,6 @@
+"""Run the ``padelpy`` command line with ``python -m padelpy``."""
+
+# PaDELPy imports
+from .cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,348 @@
+"""Asyncio variants of the PaDEL-Descriptor entry points."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import asyncio
+from contextlib import nullcontext
+from os.path import join, splitext
+from re import IGNORECASE, compile
+from subprocess import PIPE
+from tempfile import TemporaryDirectory
+
+# PaDELPy imports
+from .functions import (
+    _check_fingerprint_output,
+    _check_output,
+    _count_input_molecules,
+    _file_result,
+    _padel_options,
+    _read_mol_records,
+    _read_padel_csv_rows,
+    _smiles_result,
+    _timed_out,
+    _write_mol_records,
+    _write_padel_csv_rows,
+)
+from .instrument import _count, _exit_code, _stage, _timed_call
+from .timeouts import _is_policy, _timeout_seconds
+from .wrapper import (
+    _TIMEOUT_MESSAGE,
+    PaDELTimeoutError,
+    _padel_command,
+    _raise_for_stderr,
+)
+
+__all__ = [
+    "afrom_sdf",
+    "afrom_smiles",
+    "apadeldescriptor",
+]
+
+
+async def _acommunicate(command: list[str], timeout: float) -> tuple:
+    """Async counterpart of ``_popen_timeout``.
+
+    The subprocess is killed and reaped if ``timeout`` expires (raising
+    ``PaDELTimeoutError``) or the awaiting task is cancelled, so no JVM
+    outlives its caller.
+    """
+    with _stage("spawn"):
+        proc = await asyncio.create_subprocess_exec(*command, stdout=PIPE, stderr=PIPE)
+    try:
+        with _stage("padel"):
+            return await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        _count("timeouts")
+        raise PaDELTimeoutError(_TIMEOUT_MESSAGE) from None
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            # shielded so a second cancellation cannot leave a zombie behind
+            await asyncio.shield(proc.wait())
+        _exit_code(proc.returncode)
+
+
+@_timed_call
+async def apadeldescriptor(
+    semaphore: asyncio.Semaphore = None, sp_timeout: float = None, **options
+) -> None:
+    """Run PaDEL-Descriptor without blocking the event loop.
+
+    Accepts the same keyword options as :func:`~padelpy.padeldescriptor`.
+    Cancelling the awaiting task kills the PaDEL process.
+
+    Parameters
+    ----------
+    semaphore : asyncio.Semaphore, optional
+        If supplied, the PaDEL process is only started while holding it, which
+        caps the number of concurrent JVMs across all callers sharing it.
+    sp_timeout : float, optional
+        Subprocess timeout in seconds (time spent waiting on ``semaphore``
+        excluded); ``None`` waits indefinitely.
+    **options
+        Keyword arguments of :func:`~padelpy.padeldescriptor`.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ReferenceError
+        If ``java`` is not found on ``PATH``.
+    RuntimeError
+        If PaDEL reports an error on stderr (``PaDELTimeoutError`` if the
+        subprocess times out).
+    """
+    command = _padel_command(**options)
+    async with semaphore if semaphore is not None else nullcontext():
+        _, err = await _acommunicate(command, sp_timeout)
+    _raise_for_stderr(err)
+
+
+async def _arun_padel(
+    mol_path: str, csv_path: str, options: dict, semaphore, attempts: int = 3
+) -> None:
+    """Async ``_run_padel``: up to ``attempts`` tries on ``RuntimeError``.
+
+    As in ``_run_padel``, a timeout policy is resolved before each try and a
+    subprocess timeout is not retried.
+    """
+    for attempt in range(attempts):
+        run_options = options
+        if _is_policy(options.get("sp_timeout")):
+            molecules = await asyncio.to_thread(_count_input_molecules, mol_path)
+            seconds = _timeout_seconds(options["sp_timeout"], molecules)
+            run_options = {**options, "sp_timeout": seconds}
+        try:
+            await apadeldescriptor(
+                semaphore=semaphore, mol_dir=mol_path, d_file=csv_path, **run_options
+            )
+            break
+        except PaDELTimeoutError:
+            raise
+        except RuntimeError as exception:
+            if attempt == attempts - 1:
+                raise RuntimeError(exception) from exception
+            _count("retries")
+            continue
+
+
+async def _acompute_rows(
+    mol_path: str, options: dict, output_csv: str, semaphore, tmpdir: str
+) -> list:
+    csv_path = output_csv if output_csv is not None else join(tmpdir, "descriptors.csv")
+    await _arun_padel(mol_path, csv_path, options, semaphore)
+    return await asyncio.to_thread(_read_padel_csv_rows, csv_path)
+
+
+def _write_smiles(smi_path: str, smiles: list) -> None:
+    with open(smi_path, "w", encoding="utf-8") as smi_file:
+        smi_file.write("\n".join(smiles))
+
+
+async def _asmiles_rows(
+    smiles: list, options: dict, semaphore, output_csv: str = None
+) -> list:
+    """Run PaDEL once over ``smiles`` written to a temporary ``.smi`` file."""
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        smi_path = join(tmpdir, "input.smi")
+        with _stage("write_input"):
+            await asyncio.to_thread(_write_smiles, smi_path, smiles)
+        _count("molecules", len(smiles))
+        return await _acompute_rows(smi_path, options, output_csv, semaphore, tmpdir)
+
+
+async def _arecords_rows(
+    records: list, options: dict, suffix: str, semaphore, output_csv: str = None
+) -> list:
+    """Run PaDEL once over molblock records written to a temporary file."""
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        mol_path = join(tmpdir, f"input{suffix}")
+        with _stage("write_input"):
+            await asyncio.to_thread(_write_mol_records, mol_path, records)
+        _count("molecules", len(records))
+        return await _acompute_rows(mol_path, options, output_csv, semaphore, tmpdir)
+
+
+async def _arows_in_halves(molecules: list, acompute, output_csv: str = None) -> list:
+    """Async ``_rows_in_halves``: ``acompute`` is awaited on each half."""
+    _count("splits")
+    middle = len(molecules) // 2
+    rows = []
+    for half in (molecules[:middle], molecules[middle:]):
+        try:
+            rows.extend(await acompute(half))
+        except RuntimeError as exc:
+            if not _timed_out(exc, half):
+                raise
+            rows.extend(await _arows_in_halves(half, acompute))
+    if output_csv is not None:
+        await asyncio.to_thread(_write_padel_csv_rows, output_csv, rows)
+    return rows
+
+
+@_timed_call
+async def afrom_smiles(
+    smiles,
+    output_csv: str = None,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+    semaphore: asyncio.Semaphore = None,
+    output: str = "dict",
+    dtype: str = "float64",
+):
+    """Async :func:`~padelpy.from_smiles`.
+
+    Parameters
+    ----------
+    smiles : str or list of str
+        SMILES for one molecule, or a list of SMILES strings.
+    output_csv : str, optional
+        If supplied, also write descriptors to this CSV path.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, or a policy from
+        :mod:`padelpy.timeouts` resolved for the molecules in the run. A
+        run that times out is split in half and each half rerun, down to
+        single molecules.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+    semaphore : asyncio.Semaphore, optional
+        Limits how many PaDEL processes run at once (see
+        :func:`apadeldescriptor`).
+    output : {"dict", "array", "bits", "sparse", "dataframe"}, default "dict"
+        ``"array"`` returns a :class:`~padelpy.arrays.DescriptorArray`,
+        ``"bits"`` :class:`~padelpy.fingerprints.PackedFingerprints`,
+        ``"sparse"`` :class:`~padelpy.fingerprints.CountFingerprints` and
+        ``"dataframe"`` a pandas DataFrame.
+    dtype : str, default "float64"
+        Floating-point dtype of the array when ``output="array"``,
+        ``"sparse"`` or ``"dataframe"``.
+
+    Returns
+    -------
+    dict or list of dict or DescriptorArray or PackedFingerprints or CountFingerprints
+        As :func:`~padelpy.from_smiles`.
+    """
+    if isinstance(smiles, str):
+        smiles_list = [smiles]
+    elif isinstance(smiles, list):
+        smiles_list = smiles
+    else:
+        raise RuntimeError(f"Unknown input format for `smiles`: {type(smiles)}")
+    _check_output(output, dtype)
+
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    _check_fingerprint_output(output, options)
+
+    async def _rows(batch: list) -> list:
+        return await _asmiles_rows(batch, options, semaphore)
+
+    try:
+        rows = await _asmiles_rows(smiles_list, options, semaphore, output_csv)
+    except RuntimeError as exc:
+        if not _timed_out(exc, smiles_list):
+            raise
+        rows = await _arows_in_halves(smiles_list, _rows, output_csv)
+
+    return _smiles_result(smiles, rows, output, dtype)
+
+
+@_timed_call
+async def afrom_sdf(
+    sdf_file: str,
+    output_csv: str = None,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+    semaphore: asyncio.Semaphore = None,
+    output: str = "dict",
+    dtype: str = "float64",
+) -> list:
+    """Async :func:`~padelpy.from_sdf`.
+
+    Parameters
+    ----------
+    sdf_file : str
+        Path to an SDF file (``.sdf`` extension required).
+    output_csv : str, optional
+        If supplied, also write descriptors/fingerprints to this CSV path.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, or a policy from
+        :mod:`padelpy.timeouts` resolved for the molecules in the run. A
+        run that times out is split in half and each half rerun, down to
+        single molecules.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+    semaphore : asyncio.Semaphore, optional
+        Limits how many PaDEL processes run at once (see
+        :func:`apadeldescriptor`).
+    output : {"dict", "array", "bits", "sparse", "dataframe"}, default "dict"
+        ``"array"`` returns a :class:`~padelpy.arrays.DescriptorArray`,
+        ``"bits"`` :class:`~padelpy.fingerprints.PackedFingerprints`,
+        ``"sparse"`` :class:`~padelpy.fingerprints.CountFingerprints` and
+        ``"dataframe"`` a pandas DataFrame.
+    dtype : str, default "float64"
+        Floating-point dtype of the array when ``output="array"``,
+        ``"sparse"`` or ``"dataframe"``.
+
+    Returns
+    -------
+    list of dict or DescriptorArray or PackedFingerprints or CountFingerprints
+        As :func:`~padelpy.from_sdf`.
+    """
+    is_sdf = compile(r".*\.sdf$", IGNORECASE)
+    if is_sdf.match(sdf_file) is None:
+        raise ValueError(f"sdf file must have a `.sdf` extension: {sdf_file}")
+    _check_output(output, dtype)
+
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    _check_fingerprint_output(output, options)
+
+    suffix = splitext(sdf_file)[1]
+
+    async def _rows(records: list) -> list:
+        return await _arecords_rows(records, options, suffix, semaphore)
+
+    try:
+        with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+            rows = await _acompute_rows(
+                sdf_file, options, output_csv, semaphore, tmpdir
+            )
+    except RuntimeError as exc:
+        # the file is only split into records once a run has timed out
+        timed_out = isinstance(exc, PaDELTimeoutError)
+        records = (
+            await asyncio.to_thread(_read_mol_records, sdf_file) if timed_out else []
+        )
+        if not _timed_out(exc, records):
+            raise
+        rows = await _arows_in_halves(records, _rows, output_csv)
+
+    return _file_result(rows, output, dtype)
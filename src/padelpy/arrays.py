@@ -0,0 +1,84 @@
+"""Columnar NumPy representation of PaDEL-Descriptor output (optional NumPy)."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy
+
+__all__ = [
+    "DescriptorArray",
+]
+
+
+class DescriptorArray(NamedTuple):
+    """Descriptor matrix with one shared list of column names.
+
+    ``values`` is a 2-D floating-point NumPy array with one row per molecule
+    and one column per entry of ``columns``. Empty or non-numeric PaDEL cells
+    are NaN.
+    """
+
+    columns: list
+    values: numpy.ndarray
+
+
+def _require_numpy():
+    """Import NumPy, raising an actionable error when it is not installed."""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "NumPy is required for array output. "
+            "Install it with `pip install padelpy[numpy]`."
+        ) from exc
+    return numpy
+
+
+def _float_dtype(dtype):
+    np = _require_numpy()
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise ValueError(f"`dtype` must be a floating-point dtype: {dtype}")
+    return dtype
+
+
+def _parse_float(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return float("nan")
+
+
+def _cells_to_matrix(cells: list, n_columns: int, dtype):
+    """Convert a row-major list of string cells to a float matrix.
+
+    Fully numeric blocks are converted in one ``np.array`` call. Otherwise
+    (empty cells) the block goes through one vectorized ``astype``, and only
+    if that also fails (a non-numeric cell is present) does conversion fall
+    back to parsing cell by cell.
+    """
+    np = _require_numpy()
+    dtype = _float_dtype(dtype)
+    if not cells:
+        return np.empty((0, n_columns), dtype=dtype)
+    try:
+        return np.array(cells, dtype=dtype)
+    except ValueError:
+        pass
+    text = np.char.strip(np.asarray(cells, dtype=str))
+    text[text == ""] = "nan"
+    try:
+        return text.astype(dtype)
+    except ValueError:
+        parse = np.vectorize(_parse_float, otypes=[dtype])
+        return parse(text)
+
+
+def _rows_to_array(rows: list, dtype="float64") -> DescriptorArray:
+    """Convert PaDEL row mappings (``Name`` already removed) to an array."""
+    columns = list(rows[0].keys()) if rows else []
+    cells = [[row.get(name, "") for name in columns] for row in rows]
+    return DescriptorArray(columns, _cells_to_matrix(cells, len(columns), dtype))
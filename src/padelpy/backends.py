@@ -0,0 +1,378 @@
+"""Pluggable backends that decide where PaDEL-Descriptor runs."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from json import dump, load
+from os import cpu_count, listdir, makedirs, rename
+from os.path import basename, exists, join, splitext
+from shutil import copyfile, rmtree
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter, sleep
+from typing import NamedTuple
+from uuid import uuid4
+
+# PaDELPy imports
+from .cache import _FILE_OPTIONS
+from .functions import _count_input_molecules, _run_padel
+from .jvm import JVMOptions
+from .timeouts import _is_policy
+from .wrapper import PaDELTimeoutError
+
+__all__ = [
+    "Backend",
+    "DirectoryBackend",
+    "ExecutorBackend",
+    "LocalBackend",
+    "PaDELTask",
+    "run_task",
+    "serve_directory",
+]
+
+# spool subdirectories: a task moves incoming -> pending -> running -> done,
+# each step an atomic rename, so a task is claimed by exactly one worker
+_INCOMING, _PENDING, _RUNNING, _DONE = "incoming", "pending", "running", "done"
+_TASK_FILE, _STATUS_FILE, _OUTPUT_FILE = "task.json", "status.json", "output.csv"
+
+
+class PaDELTask(NamedTuple):
+    """One PaDEL run: calculate ``input_path`` and write ``output_csv``.
+
+    ``options`` are :func:`~padelpy.padeldescriptor` keyword arguments other
+    than ``mol_dir`` and ``d_file``.
+    """
+
+    input_path: str
+    output_csv: str
+    options: dict
+
+
+def run_task(task: PaDELTask) -> float:
+    """Run ``task`` in this process and return the seconds it took.
+
+    This is what executor-based backends submit; it is a module-level
+    function so process and cluster executors can pickle it.
+    """
+    began = perf_counter()
+    _run_padel(task.input_path, task.output_csv, task.options)
+    return perf_counter() - began
+
+
+class Backend(ABC):
+    """Runs :class:`PaDELTask` objects somewhere and reports completion.
+
+    Subclasses implement :meth:`submit`, returning a
+    :class:`concurrent.futures.Future` that resolves to the seconds the run
+    took once ``task.output_csv`` is written, or raises if PaDEL failed.
+    Backends are context managers; leaving the block calls :meth:`shutdown`.
+    """
+
+    @abstractmethod
+    def submit(self, task: PaDELTask) -> Future:
+        """Start ``task`` and return a future for its run time in seconds."""
+
+    def shutdown(self, wait: bool = True) -> None:  # noqa: B027 (optional hook)
+        """Release the backend's resources (nothing by default)."""
+
+    def __enter__(self) -> Backend:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+class ExecutorBackend(Backend):
+    """Run tasks with any :class:`concurrent.futures.Executor`.
+
+    Thread, process and cluster executors (anything with a compatible
+    ``submit``) all work; tasks call :func:`run_task` where the executor
+    runs them, so a cluster executor needs the task paths on a shared file
+    system. The executor is not shut down with the backend.
+    """
+
+    def __init__(self, executor: Executor) -> None:
+        self.executor = executor
+
+    def submit(self, task: PaDELTask) -> Future:
+        return self.executor.submit(run_task, task)
+
+
+class LocalBackend(ExecutorBackend):
+    """Run tasks on this machine, ``workers`` PaDEL processes at a time.
+
+    Tasks are dispatched from a thread pool, or from a process pool with
+    ``use_processes=True``; either way each task runs its own JVM.
+    """
+
+    def __init__(self, workers: int = None, use_processes: bool = False) -> None:
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        super().__init__(executor_cls(max_workers=workers or cpu_count() or 1))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+
+def _as_backend(executor) -> Backend:
+    if isinstance(executor, Backend):
+        return executor
+    if callable(getattr(executor, "submit", None)):
+        return ExecutorBackend(executor)
+    raise TypeError(
+        "`executor` must be a concurrent.futures.Executor or a"
+        f" padelpy.backends.Backend: {type(executor).__name__}"
+    )
+
+
+def _write_json(path: str, content: dict) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        dump(content, handle)
+
+
+def _spool_dirs(spool_dir: str) -> None:
+    for name in (_INCOMING, _PENDING, _RUNNING, _DONE):
+        makedirs(join(spool_dir, name), exist_ok=True)
+
+
+class DirectoryBackend(Backend):
+    """Send tasks to workers through a shared directory (a file spool).
+
+    Each task's input file, and any descriptor-types, config or tautomer
+    file its options name, is copied into ``spool_dir``; a worker running
+    :func:`serve_directory` on the same directory (another process, or
+    another node on a shared file system) claims the task, runs PaDEL and
+    leaves the output CSV, which is copied back to ``task.output_csv``.
+    :class:`~padelpy.jvm.JVMOptions` in the options travel with the task,
+    so the ``java`` and ``cds_archive`` paths they name must exist on the
+    workers. A timeout policy (see :mod:`padelpy.timeouts`) is resolved to
+    seconds for the task's input when it is submitted; a
+    :class:`~padelpy.timeouts.Deadline` that has already passed makes
+    :meth:`submit` raise ``TimeoutError``. Nothing else is shared, which
+    makes it a stand-in for a cluster when testing and a simple way to farm
+    work out to other machines.
+
+    Parameters
+    ----------
+    spool_dir : str
+        Directory shared with the workers (created if missing).
+    poll_interval : float, default 0.1
+        Seconds between checks for finished tasks.
+    timeout : float, optional
+        Fail a task with ``TimeoutError`` if it has not finished this many
+        seconds after submission, whether or not a worker has claimed it (a
+        worker may have died mid-task); an output left by a worker after that
+        is discarded. By default, wait for a worker forever.
+    """
+
+    def __init__(
+        self, spool_dir: str, poll_interval: float = 0.1, timeout: float = None
+    ) -> None:
+        self.spool_dir = spool_dir
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._tasks = {}
+        # timed-out tasks a worker had claimed, whose late output is removed
+        self._expired = set()
+        self._lock = Lock()
+        self._stop = Event()
+        self._watcher = None
+        _spool_dirs(spool_dir)
+
+    def submit(self, task: PaDELTask) -> Future:
+        if self._stop.is_set():
+            raise RuntimeError("DirectoryBackend has been shut down")
+        options = dict(task.options)
+        if _is_policy(options.get("sp_timeout")):
+            options["sp_timeout"] = options["sp_timeout"].seconds(
+                _count_input_molecules(task.input_path)
+            )
+        task_id = uuid4().hex
+        staging = join(self.spool_dir, _INCOMING, task_id)
+        makedirs(staging)
+        input_name = "input" + splitext(task.input_path)[1]
+        copyfile(task.input_path, join(staging, input_name))
+        for name in _FILE_OPTIONS:
+            if options.get(name) is not None:
+                shipped = f"{name}-{basename(options[name])}"
+                copyfile(options[name], join(staging, shipped))
+                options[name] = shipped
+        if options.get("jvm") is not None:
+            options["jvm"] = options["jvm"]._asdict()
+        _write_json(
+            join(staging, _TASK_FILE), {"input": input_name, "options": options}
+        )
+        rename(staging, join(self.spool_dir, _PENDING, task_id))
+
+        future = Future()
+        with self._lock:
+            self._tasks[task_id] = (task, future, monotonic())
+            if self._watcher is None:
+                self._watcher = Thread(target=self._watch, daemon=True)
+                self._watcher.start()
+        return future
+
+    def _withdraw(self, task_id: str) -> bool:
+        """Remove a task no worker has claimed; False if one has."""
+        claimed = join(self.spool_dir, _INCOMING, f"{task_id}.withdrawn")
+        try:
+            rename(join(self.spool_dir, _PENDING, task_id), claimed)
+        except FileNotFoundError:
+            return False
+        rmtree(claimed, ignore_errors=True)
+        return True
+
+    def _finish(self, task_id: str, task: PaDELTask, future: Future) -> None:
+        done = join(self.spool_dir, _DONE, task_id)
+        with open(join(done, _STATUS_FILE), encoding="utf-8") as handle:
+            status = load(handle)
+        if future.set_running_or_notify_cancel():
+            if status["ok"]:
+                copyfile(join(done, _OUTPUT_FILE), task.output_csv)
+                future.set_result(status["seconds"])
+            else:
+                error = PaDELTimeoutError if status.get("timeout") else RuntimeError
+                future.set_exception(error(status["error"]))
+        rmtree(done, ignore_errors=True)
+
+    def _poll(self, task_id: str, task: PaDELTask, future: Future, submitted) -> bool:
+        """Settle a task's future if it is done, cancelled or timed out."""
+        if exists(join(self.spool_dir, _DONE, task_id, _STATUS_FILE)):
+            self._finish(task_id, task, future)
+            return True
+        if future.cancelled() and self._withdraw(task_id):
+            return True
+        if self.timeout is None or monotonic() - submitted <= self.timeout:
+            return False
+        if not self._withdraw(task_id):
+            self._expired.add(task_id)
+        _fail(
+            future,
+            TimeoutError(
+                f"No worker finished the task within {self.timeout} s"
+                f" (spool: {self.spool_dir})"
+            ),
+        )
+        return True
+
+    def _watch(self) -> None:
+        while True:
+            with self._lock:
+                tasks = list(self._tasks.items())
+            if not tasks and self._stop.is_set():
+                return
+            for task_id, (task, future, submitted) in tasks:
+                try:
+                    finished = self._poll(task_id, task, future, submitted)
+                except Exception as exc:
+                    # e.g. an unreadable status file or an unwritable output
+                    rmtree(join(self.spool_dir, _DONE, task_id), ignore_errors=True)
+                    _fail(future, exc)
+                    finished = True
+                if finished:
+                    with self._lock:
+                        del self._tasks[task_id]
+            for task_id in list(self._expired):
+                late = join(self.spool_dir, _DONE, task_id)
+                if exists(late):
+                    rmtree(late, ignore_errors=True)
+                    self._expired.discard(task_id)
+            sleep(self.poll_interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop watching the spool; with ``wait``, after every task is done.
+
+        Without ``wait``, unfinished tasks are withdrawn where no worker has
+        claimed them yet and their futures are cancelled.
+        """
+        if not wait:
+            with self._lock:
+                tasks = list(self._tasks.items())
+            for _, (_, future, _) in tasks:
+                future.cancel()
+        self._stop.set()
+        if wait and self._watcher is not None:
+            self._watcher.join()
+
+
+def _fail(future: Future, exc: Exception) -> None:
+    """Set ``exc`` on ``future`` unless it is already finished or cancelled."""
+    if future.running() or (
+        not future.done() and future.set_running_or_notify_cancel()
+    ):
+        future.set_exception(exc)
+
+
+def _run_spooled(task_dir: str) -> dict:
+    with open(join(task_dir, _TASK_FILE), encoding="utf-8") as handle:
+        spec = load(handle)
+    options = spec["options"]
+    for name in _FILE_OPTIONS:
+        if options.get(name) is not None:
+            options[name] = join(task_dir, options[name])
+    if options.get("jvm") is not None:
+        jvm = options["jvm"]
+        options["jvm"] = JVMOptions(**{**jvm, "flags": tuple(jvm["flags"])})
+    task = PaDELTask(
+        join(task_dir, spec["input"]), join(task_dir, _OUTPUT_FILE), options
+    )
+    try:
+        return {"ok": True, "seconds": run_task(task)}
+    except Exception as exc:
+        return {
+            "ok": False,
+            "error": f"{type(exc).__name__}: {exc}",
+            "timeout": isinstance(exc, PaDELTimeoutError),
+        }
+
+
+def serve_directory(
+    spool_dir: str,
+    stop: Event = None,
+    poll_interval: float = 0.1,
+    max_tasks: int = None,
+) -> int:
+    """Run tasks posted to ``spool_dir`` by a :class:`DirectoryBackend`.
+
+    This is the worker side of the directory backend: start it in as many
+    processes, or on as many machines sharing the directory, as should run
+    PaDEL. Tasks are claimed with an atomic rename, so each runs once.
+
+    Parameters
+    ----------
+    spool_dir : str
+        The backend's spool directory (created if missing).
+    stop : threading.Event, optional
+        Return once this is set (checked between tasks).
+    poll_interval : float, default 0.1
+        Seconds to wait when no task is pending.
+    max_tasks : int, optional
+        Return after running this many tasks.
+
+    Returns
+    -------
+    int
+        Number of tasks run.
+    """
+    _spool_dirs(spool_dir)
+    pending = join(spool_dir, _PENDING)
+    completed = 0
+    while (stop is None or not stop.is_set()) and (
+        max_tasks is None or completed < max_tasks
+    ):
+        claimed = None
+        for task_id in sorted(listdir(pending)):
+            try:
+                rename(join(pending, task_id), join(spool_dir, _RUNNING, task_id))
+            except FileNotFoundError:
+                continue  # taken by another worker, or withdrawn
+            claimed = task_id
+            break
+        if claimed is None:
+            sleep(poll_interval)
+            continue
+        task_dir = join(spool_dir, _RUNNING, claimed)
+        _write_json(join(task_dir, _STATUS_FILE), _run_spooled(task_dir))
+        rename(task_dir, join(spool_dir, _DONE, claimed))
+        completed += 1
+    return completed
@@ -0,0 +1,252 @@
+"""Content-addressed, on-disk cache of PaDEL-Descriptor rows."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+from hashlib import sha256
+from json import dumps, loads
+from os import makedirs
+from os.path import abspath, dirname, getmtime, getsize, isdir, join
+from threading import Lock
+from time import time
+
+# PaDELPy imports
+from .wrapper import _PADEL_PATH
+
+__all__ = [
+    "DescriptorCache",
+]
+
+# padeldescriptor options that change how a run behaves but not the values
+# it writes; they are left out of cache keys
+_VOLATILE_OPTIONS = frozenset(
+    {"headless", "jvm", "log", "maxruntime", "retainorder", "sp_timeout", "threads"}
+)
+
+# padeldescriptor options that name files whose *content* affects output
+_FILE_OPTIONS = frozenset({"config", "descriptortypes", "tautomerlist"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    key TEXT PRIMARY KEY,
+    row TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_accessed ON rows (accessed);
+"""
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, mtime: float, size: int) -> str:
+    """SHA-256 of a file; ``mtime``/``size`` are part of the memo key."""
+    digest = sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_hash(path: str) -> str:
+    path = abspath(path)
+    return _file_digest(path, getmtime(path), getsize(path))
+
+
+def _stable_options(options: dict) -> dict:
+    """Options that decide PaDEL's output values, with files as content hashes.
+
+    Volatile options and the per-run input/output paths are dropped; this is
+    what cache keys, checkpoint identities and scheduler plans depend on.
+    """
+    stable = {}
+    for name, value in sorted(options.items()):
+        if name in _VOLATILE_OPTIONS or name in ("mol_dir", "d_file"):
+            continue
+        if name in _FILE_OPTIONS and value is not None:
+            value = _content_hash(value)
+        stable[name] = value
+    return stable
+
+
+class DescriptorCache:
+    """Persistent SQLite cache of descriptor rows keyed by molecule content.
+
+    Keys are a SHA-256 over the molecule text (a SMILES string or an SDF/MDL
+    molblock), the effective ``padeldescriptor`` options, the content of any
+    descriptor-types/config files those options name, and the bundled PaDEL
+    JAR. Options that do not affect output values (threads, timeouts) are
+    ignored. Only rows that PaDEL actually calculated are stored.
+
+    The database runs in WAL mode with a busy timeout, so several threads or
+    processes may share one cache file.
+
+    Parameters
+    ----------
+    path : str
+        SQLite database file, or an existing directory in which
+        ``padelpy-cache.sqlite3`` is created.
+    max_entries : int, optional
+        Evict least-recently-used rows beyond this count.
+    max_bytes : int, optional
+        Evict least-recently-used rows once stored row data exceeds this size.
+    max_age : float, optional
+        Evict rows not read or written within this many seconds.
+    timeout : float, default 30.0
+        Seconds to wait for a lock held by another connection.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookups answered from (or missing in) the cache by this instance.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = None,
+        max_bytes: int = None,
+        max_age: float = None,
+        timeout: float = 30.0,
+    ) -> None:
+        if isdir(path):
+            path = join(path, "padelpy-cache.sqlite3")
+        parent = dirname(abspath(path))
+        makedirs(parent, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # one short-lived connection per operation keeps the cache safe to
+        # share between threads and processes
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def key(self, molecule: str, options: dict) -> str:
+        """Return the cache key for ``molecule`` under ``padeldescriptor`` options."""
+        return self.keys([molecule], options)[0]
+
+    def keys(self, molecules: list, options: dict) -> list:
+        """Return the cache keys for ``molecules``, all under the same options.
+
+        The JAR and option material is hashed once; each key then only adds
+        its molecule to a copy of that digest.
+        """
+        material = {"padel": _content_hash(_PADEL_PATH), **_stable_options(options)}
+        prefix = sha256(dumps(material, sort_keys=True).encode("utf-8"))
+        prefix.update(b"\0")
+        keys = []
+        for molecule in molecules:
+            digest = prefix.copy()
+            digest.update(molecule.encode("utf-8", "surrogateescape"))
+            keys.append(digest.hexdigest())
+        return keys
+
+    def get_many(self, keys: list) -> dict:
+        """Return ``{key: row}`` for the keys present in the cache."""
+        unique = list(dict.fromkeys(keys))
+        found = {}
+        now = time()
+        with closing(self._connect()) as conn:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, row in conn.execute(
+                    f"SELECT key, row FROM rows WHERE key IN ({marks})", chunk
+                ):
+                    found[key] = loads(row)
+                conn.execute(
+                    f"UPDATE rows SET accessed = ? WHERE key IN ({marks})",
+                    [now, *chunk],
+                )
+        with self._lock:
+            hits = sum(key in found for key in keys)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: dict) -> None:
+        """Store ``{key: row}`` and apply the eviction policy."""
+        if not items:
+            return
+        now = time()
+        records = []
+        for key, row in items.items():
+            text = dumps(row)
+            records.append((key, text, len(text.encode("utf-8")), now, now))
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?)", records
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+
+    def evict(self) -> int:
+        """Apply the eviction policy now; return the number of rows removed."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = self._evict(conn)
+            conn.execute("COMMIT")
+        return removed
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        removed = 0
+        if self.max_age is not None:
+            removed += conn.execute(
+                "DELETE FROM rows WHERE accessed < ?", (time() - self.max_age,)
+            ).rowcount
+        if self.max_entries is not None:
+            (count,) = conn.execute("SELECT COUNT(*) FROM rows").fetchone()
+            if count > self.max_entries:
+                removed += conn.execute(
+                    "DELETE FROM rows WHERE key IN (SELECT key FROM rows"
+                    " ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        if self.max_bytes is not None:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM rows"
+            ).fetchone()
+            excess = total - self.max_bytes
+            if excess > 0:
+                doomed = []
+                for key, size in conn.execute(
+                    "SELECT key, size FROM rows ORDER BY accessed ASC"
+                ):
+                    doomed.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM rows WHERE key = ?", doomed)
+                removed += len(doomed)
+        return removed
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the stored row count and size."""
+        with closing(self._connect()) as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM rows"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every stored row."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM rows")
@@ -0,0 +1,272 @@
+"""Checkpointed, resumable PaDEL-Descriptor runs over large SDF/MDL files."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections.abc import Iterator
+from functools import partial
+from hashlib import sha256
+from json import dump, dumps, load
+from os import fsync, makedirs, replace
+from os.path import basename, exists, join, splitext
+from re import IGNORECASE, compile
+
+# PaDELPy imports
+from .cache import _content_hash, _stable_options
+from .functions import (
+    _compute_records_rows,
+    _file_result,
+    _padel_options,
+    _read_padel_csv_rows,
+    _rows_splitting_timeouts,
+    _write_padel_csv_rows,
+)
+from .streaming import _chunks
+
+__all__ = [
+    "from_sdf_resumable",
+]
+
+_MANIFEST = "manifest.json"
+_MANIFEST_VERSION = 1
+
+
+def _records_from(mol_file: str, offset: int) -> Iterator[tuple]:
+    """Yield ``(record, end)`` for the molblocks after byte ``offset``.
+
+    ``end`` is the byte offset just past the record's ``$$$$`` line, where a
+    resumed run starts reading. Records match ``_iter_mol_records``.
+    """
+    position = offset
+    lines = []
+    with open(mol_file, "rb") as handle:
+        handle.seek(offset)
+        for line in handle:
+            position += len(line)
+            if line.rstrip(b"\r\n") == b"$$$$":
+                yield b"".join(lines).decode("utf-8", "surrogateescape"), position
+                lines = []
+            else:
+                lines.append(line.replace(b"\r\n", b"\n"))
+    if b"".join(lines).strip():
+        yield b"".join(lines).decode("utf-8", "surrogateescape"), position
+
+
+def _job_identity(mol_file: str, options: dict, shard_size: int) -> dict:
+    """What a job's committed shards depend on; resuming requires a match."""
+    return {
+        "input": _content_hash(mol_file),
+        "options": _stable_options(options),
+        "shard_size": shard_size,
+    }
+
+
+def _sync(path: str) -> None:
+    with open(path, "rb") as handle:
+        fsync(handle.fileno())
+
+
+class _ShardStore:
+    """Committed shard CSVs and a manifest in ``directory``, safe across crashes.
+
+    A shard's CSV is written under a temporary name, synced and renamed, so a
+    shard file that exists is complete; the manifest is replaced atomically.
+    The manifest records ``identity`` (what the shards depend on: input,
+    options and shard size) next to any ``state`` the caller keeps in it. An
+    existing manifest must have been started with the same identity.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the manifest and shard files (created if missing).
+    identity : dict
+        JSON-serializable description of what the shards depend on.
+    label : str
+        How errors refer to the directory, e.g. ``"Checkpoint job 'x'"``.
+    state : dict, optional
+        Initial caller state stored in a new manifest.
+
+    Raises
+    ------
+    ValueError
+        If an existing manifest has another version or identity.
+    """
+
+    def __init__(
+        self, directory: str, identity: dict, label: str, state: dict = None
+    ) -> None:
+        makedirs(directory, exist_ok=True)
+        self.directory = directory
+        path = join(directory, _MANIFEST)
+        if not exists(path):
+            self.manifest = {"version": _MANIFEST_VERSION, **identity, **(state or {})}
+            self.save_manifest()
+            return
+        with open(path, encoding="utf-8") as handle:
+            self.manifest = load(handle)
+        if self.manifest.get("version") != _MANIFEST_VERSION:
+            raise ValueError(f"Unsupported checkpoint manifest version: {path}")
+        if any(self.manifest.get(name) != value for name, value in identity.items()):
+            raise ValueError(
+                f"{label} was started with a different input file,"
+                " descriptor options or shard size"
+            )
+
+    def path(self, index: int) -> str:
+        """Path of shard ``index``'s committed CSV."""
+        return join(self.directory, f"shard-{index:06d}.csv")
+
+    def partial_path(self, index: int) -> str:
+        """Where shard ``index``'s CSV is written before :meth:`commit`."""
+        return f"{self.path(index)}.tmp"
+
+    def done(self, index: int) -> bool:
+        return exists(self.path(index))
+
+    def rows(self, index: int) -> list:
+        return _read_padel_csv_rows(self.path(index))
+
+    def commit(self, index: int) -> None:
+        """Make the CSV at :meth:`partial_path` durable, then shard ``index``."""
+        _sync(self.partial_path(index))
+        replace(self.partial_path(index), self.path(index))
+
+    def save(self, index: int, rows: list) -> None:
+        """Write and commit shard ``index`` from raw PaDEL rows."""
+        _write_padel_csv_rows(self.partial_path(index), rows)
+        self.commit(index)
+
+    def save_manifest(self) -> None:
+        """Atomically replace the manifest (written, synced, then renamed)."""
+        path = join(self.directory, _MANIFEST)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+            dump(self.manifest, handle, indent=1)
+            handle.flush()
+            fsync(handle.fileno())
+        replace(f"{path}.tmp", path)
+
+
+def from_sdf_resumable(
+    sdf_file: str,
+    checkpoint_dir: str,
+    job_id: str = None,
+    shard_size: int = 1000,
+    output_csv: str = None,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+    mode: str = None,
+) -> list:
+    """Calculate a large SDF/MDL file in checkpointed shards that survive restarts.
+
+    The file is calculated ``shard_size`` molecules at a time. Each shard's
+    PaDEL CSV is kept in ``checkpoint_dir/<job_id>/`` and recorded, with the
+    byte offset reached in the input, in a ``manifest.json`` that is replaced
+    atomically. If the process dies (out of memory, preemption, a single
+    molecule timing out), calling again with the same arguments skips the committed
+    shards and continues reading the input from the recorded offset. Once
+    every shard is committed, further calls only read the shard files.
+
+    A job must be run by one process at a time. The checkpoint directory is
+    not removed; delete it once the results are no longer needed.
+
+    Parameters
+    ----------
+    sdf_file : str
+        Path to an SDF or MDL file (``.sdf`` or ``.mdl`` extension).
+    checkpoint_dir : str
+        Directory holding one subdirectory per job (created if missing).
+    job_id : str, optional
+        Name of the job. By default it is derived from the input file's
+        content, the descriptor options and ``shard_size``, so rerunning the
+        same call resumes the same job. An explicit ``job_id`` must be
+        resumed with the same input, options and shard size.
+    shard_size : int, default 1000
+        Molecules per PaDEL run, and per checkpoint.
+    output_csv : str, optional
+        If supplied, also write all rows to this CSV path once the job is
+        complete.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per PaDEL run. A shard that times
+        out is split in half and each half rerun, down to single molecules.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+    mode : {"2d", "3d", "existing3d", "fingerprints"}, optional
+        Calculation mode, as for :func:`~padelpy.from_sdf`.
+
+    Returns
+    -------
+    list of dict
+        One mapping per compound, in file order.
+
+    Raises
+    ------
+    ValueError
+        If the extension or ``shard_size`` is invalid, or ``job_id`` names a
+        job started with a different input, options or shard size.
+    RuntimeError
+        If PaDEL fails on a shard or returns the wrong number of rows; the
+        shards committed before it are kept.
+    """
+    if compile(r".*\.(sdf|mdl)$", IGNORECASE).match(sdf_file) is None:
+        raise ValueError(f"File must have a `.sdf` or `.mdl` extension: {sdf_file}")
+    if shard_size < 1:
+        raise ValueError(f"`shard_size` must be at least 1: {shard_size}")
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, mode
+    )
+
+    identity = _job_identity(sdf_file, options, shard_size)
+    if job_id is None:
+        job_id = sha256(dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+        job_id = job_id[:16]
+    job_dir = join(checkpoint_dir, job_id)
+    store = _ShardStore(
+        job_dir,
+        identity,
+        f"Checkpoint job {job_id!r}",
+        {"offset": 0, "shards": [], "complete": False},
+    )
+    manifest = store.manifest
+
+    if not manifest["complete"]:
+        compute = partial(
+            _compute_records_rows, options=options, suffix=splitext(sdf_file)[1]
+        )
+        for shard in _chunks(_records_from(sdf_file, manifest["offset"]), shard_size):
+            index = len(manifest["shards"])
+            # a shard that times out is split in half and rerun, as in the CLI
+            rows = _rows_splitting_timeouts([record for record, _ in shard], compute)
+            if len(rows) != len(shard) or any(len(row) == 0 for row in rows):
+                raise RuntimeError(
+                    "PaDEL-Descriptor failed on one or more mols."
+                    " Ensure the input structures are correct."
+                )
+            # the shard file must be durable before the manifest points at it
+            store.save(index, rows)
+            manifest["shards"].append(
+                {"csv": basename(store.path(index)), "molecules": len(shard)}
+            )
+            manifest["offset"] = shard[-1][1]
+            store.save_manifest()
+        manifest["complete"] = True
+        store.save_manifest()
+
+    rows = []
+    for shard in manifest["shards"]:
+        rows.extend(_read_padel_csv_rows(join(job_dir, shard["csv"])))
+    if output_csv is not None:
+        _write_padel_csv_rows(output_csv, rows)
+    return _file_result(rows, "dict", "float64")
@@ -0,0 +1,610 @@
+"""Command-line batch tool: ``padelpy`` (or ``python -m padelpy``)."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from csv import DictWriter
+from functools import partial
+from glob import glob
+from json import dumps, loads
+from os import cpu_count, remove, replace
+from os.path import abspath, exists, splitext
+from shutil import copyfileobj
+from tempfile import TemporaryFile
+from time import perf_counter
+from typing import NamedTuple
+from zipfile import ZipFile
+
+# PaDELPy imports
+from .arrays import _require_numpy, _rows_to_array
+from .cache import DescriptorCache, _content_hash, _stable_options
+from .checkpoint import _ShardStore
+from .functions import (
+    _compute_records_rows,
+    _compute_smiles_rows,
+    _iter_mol_records,
+    _padel_options,
+    _rows_splitting_timeouts,
+    _rows_with_cache,
+)
+from .streaming import _chunks
+from .timeouts import ScaledTimeout
+from .version import __version__
+
+__all__ = [
+    "main",
+]
+
+_SMILES_SUFFIXES = (".smi", ".smiles", ".txt")
+_MOL_SUFFIXES = (".sdf", ".mdl")
+_FORMATS = {".csv": "csv", ".parquet": "parquet", ".npz": "npz"}
+# shards submitted ahead of the one being written, per worker
+_PREFETCH = 2
+# rows of names read back at a time when an .npz archive is closed
+_NPZ_CHUNK = 10000
+
+
+class _Shard(NamedTuple):
+    """Molecules of input ``path`` from position ``start``, numbered ``index``."""
+
+    index: int
+    suffix: str
+    molecules: list
+    path: str
+    start: int
+
+
+def _input_suffix(path: str) -> str:
+    """PaDEL input suffix for ``path``: ``.smi`` for SMILES, else the file's."""
+    if path == "-":
+        return ".smi"
+    suffix = splitext(path)[1].lower()
+    if suffix in _SMILES_SUFFIXES:
+        return ".smi"
+    if suffix in _MOL_SUFFIXES:
+        return suffix
+    raise ValueError(
+        f"Unsupported input file (expected .smi, .smiles, .txt, .sdf or .mdl): {path}"
+    )
+
+
+def _expand_inputs(patterns: list) -> list:
+    """Expand glob patterns and check that every input exists and is supported."""
+    paths = []
+    for pattern in patterns:
+        if pattern != "-" and any(char in pattern for char in "*?["):
+            matches = sorted(glob(pattern, recursive=True))
+            if not matches:
+                raise ValueError(f"No input files match {pattern!r}")
+            paths.extend(matches)
+        elif pattern != "-" and not exists(pattern):
+            raise ValueError(f"Input file not found: {pattern}")
+        else:
+            paths.append(pattern)
+    if paths.count("-") > 1:
+        raise ValueError("Standard input (-) can only be read once")
+    for path in paths:
+        _input_suffix(path)
+    return paths
+
+
+def _iter_molecules(path: str):
+    """Yield the SMILES strings (one per non-blank line) or molblocks of ``path``."""
+    if _input_suffix(path) != ".smi":
+        yield from _iter_mol_records(path)
+        return
+    if path == "-":
+        yield from (line.strip() for line in sys.stdin if line.strip())
+        return
+    with open(path, encoding="utf-8", errors="surrogateescape") as handle:
+        yield from (line.strip() for line in handle if line.strip())
+
+
+def _iter_shards(paths: list, shard_size: int):
+    """Yield :class:`_Shard` objects; a shard never spans two inputs."""
+    index = 0
+    for path in paths:
+        suffix = _input_suffix(path)
+        start = 0
+        for molecules in _chunks(_iter_molecules(path), shard_size):
+            yield _Shard(index, suffix, molecules, path, start)
+            index += 1
+            start += len(molecules)
+
+
+def _run_shard(shard: _Shard, options: dict, cache: DescriptorCache = None) -> list:
+    """Raw PaDEL rows for one shard; batches that time out are split."""
+    if shard.suffix == ".smi":
+        compute = partial(_compute_smiles_rows, options=options)
+    else:
+        compute = partial(_compute_records_rows, options=options, suffix=shard.suffix)
+    split_on_timeout = partial(_rows_splitting_timeouts, compute=compute)
+
+    if cache is None:
+        rows = split_on_timeout(shard.molecules)
+    else:
+        rows = _rows_with_cache(cache, shard.molecules, options, split_on_timeout)
+    if len(rows) != len(shard.molecules) or any(len(row) == 0 for row in rows):
+        raise RuntimeError(
+            f"PaDEL-Descriptor failed on one or more mols in shard {shard.index}."
+            " Ensure the input structures are correct."
+        )
+    return rows
+
+
+def _iter_results(shards, options: dict, cache, workers: int, checkpoint):
+    """Yield ``(shard, rows, resumed)`` in shard order.
+
+    Shards run on ``workers`` threads (each one PaDEL process), with a bounded
+    number submitted ahead, so memory does not grow with the input.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def _finish() -> tuple:
+            shard, future = pending.popleft()
+            if future is None:
+                return shard, checkpoint.rows(shard.index), True
+            rows = future.result()
+            if checkpoint is not None:
+                checkpoint.save(shard.index, rows)
+            return shard, rows, False
+
+        try:
+            for shard in shards:
+                future = None
+                if checkpoint is None or not checkpoint.done(shard.index):
+                    future = executor.submit(_run_shard, shard, options, cache)
+                pending.append((shard, future))
+                while len(pending) > _PREFETCH * workers:
+                    yield _finish()
+            while pending:
+                yield _finish()
+        except BaseException:
+            # do not start shards whose results would be discarded
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+            raise
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "pyarrow is required for Parquet output. "
+            "Install it with `pip install padelpy[arrow]`."
+        ) from exc
+    return pyarrow
+
+
+_ID_COLUMNS = ("Name", "Source", "Index")
+
+
+def _identify(shard: _Shard, rows: list) -> tuple:
+    """Replace PaDEL's ``Name`` column of ``rows`` with names from the input.
+
+    PaDEL names SMILES ``AUTOGEN_...`` per run (and cached rows keep the name
+    they were stored under), so rows are identified by the input instead:
+    the SMILES string or the molblock's title line, the input path (``-``
+    for standard input) and the molecule's position in that input.
+
+    Returns
+    -------
+    tuple of list
+        ``(names, sources, indices)``, one entry per row.
+    """
+    for row in rows:
+        row.pop("Name", None)
+    if shard.suffix == ".smi":
+        names = list(shard.molecules)
+    else:
+        names = [record.split("\n", 1)[0].strip() for record in shard.molecules]
+    indices = list(range(shard.start, shard.start + len(rows)))
+    return names, [shard.path] * len(rows), indices
+
+
+class _CSVWriter:
+    """Write raw PaDEL rows as CSV after ``Name``, ``Source`` and ``Index``."""
+
+    def __init__(self, path: str, dtype: str) -> None:
+        self._handle = open(path, "w", encoding="utf-8", newline="")
+        self._writer = None
+
+    def write(self, shard: _Shard, rows: list) -> None:
+        if not rows:
+            return
+        names, sources, indices = _identify(shard, rows)
+        if self._writer is None:
+            fieldnames = [*_ID_COLUMNS, *rows[0].keys()]
+            self._writer = DictWriter(self._handle, fieldnames=fieldnames)
+            self._writer.writeheader()
+        for row, name, source, index in zip(rows, names, sources, indices, strict=True):
+            self._writer.writerow(
+                {"Name": name, "Source": source, "Index": index, **row}
+            )
+
+    def close(self) -> None:
+        if self._writer is None:
+            self._handle.write(",".join(_ID_COLUMNS) + "\n")
+        self._handle.close()
+
+
+class _ParquetWriter:
+    """Write rows as Parquet: ``Name``, ``Source``, ``Index``, the rest ``dtype``."""
+
+    def __init__(self, path: str, dtype: str) -> None:
+        self._pa = _require_pyarrow()
+        self._path = path
+        self._dtype = dtype
+        self._writer = None
+
+    def write(self, shard: _Shard, rows: list) -> None:
+        if not rows:
+            return
+        names, sources, indices = _identify(shard, rows)
+        array = _rows_to_array(rows, self._dtype)
+        columns = {
+            "Name": self._pa.array(names, self._pa.string()),
+            "Source": self._pa.array(sources, self._pa.string()),
+            "Index": self._pa.array(indices, self._pa.int64()),
+        }
+        for idx, name in enumerate(array.columns):
+            columns[name] = array.values[:, idx]
+        table = self._pa.table(columns)
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            string, int64 = self._pa.string(), self._pa.int64()
+            table = self._pa.table(
+                {
+                    "Name": self._pa.array([], string),
+                    "Source": self._pa.array([], string),
+                    "Index": self._pa.array([], int64),
+                }
+            )
+            self._pa.parquet.write_table(table, self._path)
+        else:
+            self._writer.close()
+
+
+class _NPZWriter:
+    """Write rows as a NumPy ``.npz`` archive.
+
+    The arrays are ``names``, ``sources`` and ``indices`` (see ``_identify``),
+    ``columns`` and the ``values`` matrix. Each shard's values and row names
+    are appended to temporary files and only copied into the archive by
+    :meth:`close`, so memory holds one shard at a time.
+    """
+
+    def __init__(self, path: str, dtype: str) -> None:
+        self._np = _require_numpy()
+        self._path = path
+        self._dtype = dtype
+        self._rows = 0
+        self._columns = []
+        self._values = TemporaryFile()
+        # one JSON [name, source, index] line per row
+        self._ids = TemporaryFile("w+", encoding="utf-8")
+
+    def write(self, shard: _Shard, rows: list) -> None:
+        if not rows:
+            return
+        for entry in zip(*_identify(shard, rows), strict=True):
+            self._ids.write(dumps(entry) + "\n")
+        array = _rows_to_array(rows, self._dtype)
+        self._columns = array.columns
+        self._values.write(self._np.ascontiguousarray(array.values).tobytes())
+        self._rows += len(rows)
+
+    def _ids_column(self, position: int):
+        """Yield lists of one identifier column, read back from the spool."""
+        self._ids.seek(0)
+        for lines in _chunks(self._ids, _NPZ_CHUNK):
+            yield [loads(line)[position] for line in lines]
+
+    def _member(self, archive: ZipFile, name: str, dtype, shape: tuple):
+        """Open ``name.npy`` in ``archive`` with its header written."""
+        member = archive.open(f"{name}.npy", "w", force_zip64=True)
+        header = {
+            "descr": self._np.lib.format.dtype_to_descr(self._np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": shape,
+        }
+        self._np.lib.format.write_array_header_1_0(member, header)
+        return member
+
+    def close(self) -> None:
+        np = self._np
+        try:
+            # stored, not compressed, like np.savez
+            with ZipFile(self._path, "w", allowZip64=True) as archive:
+                for position, name in enumerate(("names", "sources")):
+                    width = 1
+                    for chunk in self._ids_column(position):
+                        width = max(width, *map(len, chunk))
+                    dtype = f"<U{width}"
+                    with self._member(archive, name, dtype, (self._rows,)) as member:
+                        for chunk in self._ids_column(position):
+                            member.write(np.array(chunk, dtype).tobytes())
+                with self._member(archive, "indices", "<i8", (self._rows,)) as member:
+                    for chunk in self._ids_column(2):
+                        member.write(np.array(chunk, "<i8").tobytes())
+                with archive.open("columns.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array(member, np.array(self._columns, str))
+                shape = (self._rows, len(self._columns)) if self._rows else (0, 0)
+                with self._member(archive, "values", self._dtype, shape) as member:
+                    self._values.seek(0)
+                    copyfileobj(self._values, member)
+        finally:
+            self._values.close()
+            self._ids.close()
+
+
+_WRITERS = {"csv": _CSVWriter, "parquet": _ParquetWriter, "npz": _NPZWriter}
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise ArgumentTypeError(f"must be at least 1: {value}")
+    return value
+
+
+def _names(text: str) -> list:
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    if not names:
+        raise ArgumentTypeError("expected one or more comma-separated names")
+    return names
+
+
+def _parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="padelpy",
+        description=(
+            "Calculate PaDEL-Descriptor descriptors and fingerprints for SMILES,"
+            " SDF and MDL files, running shards of molecules in parallel."
+        ),
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="INPUT",
+        help=(
+            "SMILES file (.smi, .smiles or .txt, one per line), SDF or MDL file,"
+            " glob pattern, or - for SMILES on standard input"
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="output file: .csv, .parquet or .npz (see --format)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(_WRITERS),
+        help="output format (default: from the output file extension)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=_positive_int,
+        help="PaDEL processes run at once (default: CPU count)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=_positive_int,
+        default=100,
+        help="molecules per PaDEL process (default: 100)",
+    )
+    parser.add_argument(
+        "--descriptors",
+        type=_names,
+        metavar="NAMES",
+        help="comma-separated descriptor classes or columns (default: all)",
+    )
+    parser.add_argument(
+        "--no-descriptors", action="store_true", help="calculate no descriptors"
+    )
+    parser.add_argument(
+        "--fingerprints", action="store_true", help="calculate fingerprints"
+    )
+    parser.add_argument(
+        "--fingerprint-classes",
+        type=_names,
+        metavar="NAMES",
+        help="comma-separated fingerprint classes to calculate",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("2d", "3d", "existing3d", "fingerprints"),
+        help="calculate only what the mode needs (see from_smiles)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="seconds allowed per PaDEL process (default: 60)",
+    )
+    parser.add_argument(
+        "--timeout-per-molecule",
+        type=float,
+        metavar="SECONDS",
+        help="add this many seconds per molecule to --timeout",
+    )
+    parser.add_argument(
+        "--maxruntime",
+        type=int,
+        default=-1,
+        help="seconds allowed per molecule (default: unlimited)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="PaDEL threads per process (default: 1)",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=("float64", "float32"),
+        default="float64",
+        help="value dtype of Parquet and .npz output (default: float64)",
+    )
+    parser.add_argument(
+        "--cache", metavar="PATH", help="descriptor cache database (or directory)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="DIR",
+        help="keep finished shards in DIR and skip them when run again",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not print the summary"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    return parser
+
+
+def _summary(
+    output: str,
+    rows: int,
+    calculated: int,
+    resumed: int,
+    seconds: float,
+    workers: int,
+    cache: DescriptorCache = None,
+) -> str:
+    """One-line throughput summary printed at the end of a run."""
+    rate = calculated / seconds if seconds > 0 else 0.0
+    text = (
+        f"padelpy: wrote {rows} rows to {output} in {seconds:.1f} s;"
+        f" {calculated} molecules calculated ({rate:.1f} molecules/s,"
+        f" {workers} workers)"
+    )
+    if resumed:
+        text += f", {resumed} shards resumed"
+    if cache is not None:
+        text += f"; cache: {cache.hits} hits, {cache.misses} misses"
+    return text
+
+
+def _run(args, paths: list) -> int:
+    timeout = args.timeout
+    if args.timeout_per_molecule is not None:
+        timeout = ScaledTimeout(args.timeout_per_molecule, args.timeout)
+    descriptors = args.descriptors or not args.no_descriptors
+    fingerprints = args.fingerprint_classes or args.fingerprints
+    options = _padel_options(
+        descriptors, fingerprints, timeout, args.maxruntime, args.threads, args.mode
+    )
+
+    checkpoint = None
+    if args.resume is not None:
+        identity = {
+            "inputs": [[abspath(path), _content_hash(path)] for path in paths],
+            "options": _stable_options(options),
+            "shard_size": args.shard_size,
+        }
+        checkpoint = _ShardStore(
+            args.resume, identity, f"Resume directory {args.resume!r}"
+        )
+    cache = None if args.cache is None else DescriptorCache(args.cache)
+
+    began = perf_counter()
+    rows = calculated = resumed = 0
+    partial_output = f"{args.output}.partial"
+    writer = _WRITERS[args.format](partial_output, args.dtype)
+    try:
+        shards = _iter_shards(paths, args.shard_size)
+        for shard, shard_rows, from_checkpoint in _iter_results(
+            shards, options, cache, args.workers, checkpoint
+        ):
+            writer.write(shard, shard_rows)
+            rows += len(shard.molecules)
+            if from_checkpoint:
+                resumed += 1
+            else:
+                calculated += len(shard.molecules)
+        writer.close()
+    except BaseException:
+        writer.close()
+        if exists(partial_output):
+            remove(partial_output)
+        raise
+    replace(partial_output, args.output)
+
+    if not args.quiet:
+        seconds = perf_counter() - began
+        print(
+            _summary(
+                args.output, rows, calculated, resumed, seconds, args.workers, cache
+            ),
+            file=sys.stderr,
+        )
+    return 0
+
+
+def main(argv: list = None) -> int:
+    """Run the ``padelpy`` command line; returns the process exit code.
+
+    Inputs (SMILES, SDF and MDL files, glob patterns, or ``-`` for SMILES on
+    standard input) are split into shards of ``--shard-size`` molecules, and
+    ``--workers`` shards are calculated at once, each by its own PaDEL
+    process. Rows are written to ``--output`` in input order as they
+    arrive, as CSV or Parquet (``Name``, ``Source`` and ``Index`` columns
+    followed by PaDEL's) or a NumPy ``.npz`` archive (``names``,
+    ``sources``, ``indices``, ``columns`` and a ``values`` matrix). Each row
+    is named after its input: the SMILES string or the molblock's title
+    line, the input path (``-`` for standard input) and the molecule's
+    position in that input, counted from 0. A shard that times out is split
+    and rerun. ``--cache`` answers known molecules from a
+    :class:`~padelpy.cache.DescriptorCache`; ``--resume`` keeps finished
+    shards so an interrupted run restarts where it stopped. A throughput
+    summary is printed to standard error at the end.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments without the program name (default: ``sys.argv[1:]``).
+
+    Returns
+    -------
+    int
+        ``0`` on success, ``1`` if the calculation failed (usage errors exit
+        with ``2``).
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = _FORMATS.get(splitext(args.output)[1].lower())
+        if args.format is None:
+            parser.error(
+                "cannot tell the output format from the file extension;"
+                " use .csv, .parquet or .npz, or --format"
+            )
+    try:
+        paths = _expand_inputs(args.inputs)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.resume is not None and "-" in paths:
+        parser.error("--resume needs input files; standard input cannot be resumed")
+    if args.workers is None:
+        args.workers = cpu_count() or 1
+
+    try:
+        return _run(args, paths)
+    except (ImportError, OSError, ReferenceError, RuntimeError, ValueError) as exc:
+        print(f"padelpy: error: {exc}", file=sys.stderr)
+        return 1
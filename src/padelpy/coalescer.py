@@ -0,0 +1,243 @@
+"""Coalesce concurrent PaDEL-Descriptor jobs into shared PaDEL runs."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections import deque
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import monotonic
+
+# PaDELPy imports
+from .functions import _compute_file_rows, _compute_smiles_rows
+
+__all__ = [
+    "BatchCoalescer",
+]
+
+
+class _Job:
+    """A queued unit of work: SMILES to batch, or an MDL/SDF file to run."""
+
+    __slots__ = ("kind", "payload", "options", "attempts", "key", "future")
+
+    def __init__(self, kind: str, payload, options: dict, attempts: int) -> None:
+        self.kind = kind
+        self.payload = payload
+        self.options = options
+        self.attempts = attempts
+        self.key = (tuple(sorted(options.items())), attempts)
+        self.future = Future()
+
+
+class BatchCoalescer:
+    """Merge concurrent PaDEL-Descriptor jobs into shared PaDEL runs.
+
+    PaDEL-Descriptor has no server mode, so a JVM cannot be kept warm and
+    handed new jobs: every PaDEL run still starts its own JVM. What this
+    saves is the number of runs. Worker threads take queued SMILES jobs
+    that share the same options (and ``attempts``) and calculate them in a
+    single PaDEL invocation, so concurrent callers pay JVM start-up once per
+    batch rather than once per call. A caller making one call at a time
+    gains nothing. MDL/SDF jobs run one file per invocation.
+
+    A failed job only fails its own future; worker threads survive it. A
+    worker hit by an unexpected ``BaseException`` fails its batch and exits,
+    and :meth:`health_check` (also run on every submit) starts a new one.
+
+    Parameters
+    ----------
+    workers : int, default 2
+        Number of worker threads (concurrent PaDEL processes).
+    max_batch : int, default 1000
+        Maximum number of SMILES coalesced into a single PaDEL invocation.
+    linger : float, default 0.05
+        Seconds a worker waits for more compatible jobs before starting a
+        batch smaller than ``max_batch``.
+
+    Examples
+    --------
+    >>> with BatchCoalescer(workers=4) as coalescer:  # doctest: +SKIP
+    ...     rows = from_smiles(["CCC", "CCCC"], coalescer=coalescer)
+    """
+
+    def __init__(
+        self, workers: int = 2, max_batch: int = 1000, linger: float = 0.05
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"`workers` must be at least 1: {workers}")
+        if max_batch < 1:
+            raise ValueError(f"`max_batch` must be at least 1: {max_batch}")
+        self.workers = workers
+        self.max_batch = max_batch
+        self.linger = linger
+        self.respawned = 0
+        self._jobs = deque()
+        self._cond = Condition()
+        self._closed = False
+        self._threads = [self._spawn(idx) for idx in range(workers)]
+
+    def __enter__(self) -> BatchCoalescer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit_smiles(self, smiles: list, options: dict, attempts: int = 3) -> Future:
+        """Queue SMILES for calculation with ``padeldescriptor`` options.
+
+        Only jobs with equal ``options`` and ``attempts`` (tries per PaDEL
+        run) share a run.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the raw PaDEL rows (``Name`` column included), one per
+            SMILES in input order.
+        """
+        return self._submit(_Job("smiles", list(smiles), options, attempts))
+
+    def submit_file(self, mol_file: str, options: dict, attempts: int = 3) -> Future:
+        """Queue an MDL/SDF file for calculation with ``padeldescriptor`` options.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the raw PaDEL rows (``Name`` column included).
+        """
+        return self._submit(_Job("file", mol_file, options, attempts))
+
+    def health_check(self) -> int:
+        """Respawn dead worker threads and return the number of live workers."""
+        with self._cond:
+            if self._closed:
+                return 0
+            for idx, thread in enumerate(self._threads):
+                if not thread.is_alive():
+                    self._threads[idx] = self._spawn(idx)
+                    self.respawned += 1
+            return sum(thread.is_alive() for thread in self._threads)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting jobs; workers exit once the queue is drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _submit(self, job: _Job) -> Future:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchCoalescer is closed.")
+            self._jobs.append(job)
+            self._cond.notify()
+        # a worker that died since the last call must not strand the job
+        self.health_check()
+        return job.future
+
+    def _spawn(self, idx: int) -> Thread:
+        thread = Thread(target=self._work, name=f"padelpy-coalescer-{idx}", daemon=True)
+        thread.start()
+        return thread
+
+    def _next_batch(self) -> list | None:
+        """Block for the next job, then gather compatible SMILES jobs."""
+        with self._cond:
+            while not self._jobs:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            first = self._jobs.popleft()
+            if first.kind != "smiles":
+                return [first]
+
+            batch = [first]
+            size = len(first.payload)
+            deadline = monotonic() + self.linger
+            while size < self.max_batch:
+                for job in list(self._jobs):
+                    if job.kind != "smiles" or job.key != first.key:
+                        continue
+                    if size + len(job.payload) > self.max_batch:
+                        continue
+                    self._jobs.remove(job)
+                    batch.append(job)
+                    size += len(job.payload)
+                remaining = deadline - monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _work(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                if batch[0].kind == "file":
+                    self._run_file(batch[0])
+                else:
+                    self._run_smiles(batch)
+            except BaseException as exc:
+                # fail the batch rather than strand it; health_check respawns
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+                return
+
+    @staticmethod
+    def _run_file(job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(
+                _compute_file_rows(job.payload, job.options, attempts=job.attempts)
+            )
+        except Exception as exc:
+            job.future.set_exception(exc)
+
+    @staticmethod
+    def _run_smiles(batch: list) -> None:
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        smiles = [smi for job in batch for smi in job.payload]
+        try:
+            rows = _compute_smiles_rows(
+                smiles, batch[0].options, attempts=batch[0].attempts
+            )
+        except Exception as exc:
+            rows, error = None, exc
+        else:
+            error = None
+
+        if rows is not None and len(rows) == len(smiles):
+            start = 0
+            for job in batch:
+                stop = start + len(job.payload)
+                job.future.set_result(rows[start:stop])
+                start = stop
+            return
+
+        if len(batch) == 1:
+            if error is not None:
+                batch[0].future.set_exception(error)
+            else:
+                batch[0].future.set_result(rows)
+            return
+
+        # A failure (or a row-count mismatch) in a coalesced batch cannot be
+        # attributed to one caller; rerun each job alone so only the
+        # offending job sees the error.
+        for job in batch:
+            try:
+                job.future.set_result(
+                    _compute_smiles_rows(
+                        job.payload, job.options, attempts=job.attempts
+                    )
+                )
+            except Exception as exc:
+                job.future.set_exception(exc)
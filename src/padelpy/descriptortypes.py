@@ -0,0 +1,226 @@
+"""Descriptor subset selection via pruned PaDEL descriptor-types files."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from functools import lru_cache
+from hashlib import sha256
+from json import load
+from os import getpid, makedirs, replace
+from os.path import abspath, dirname, isfile, join
+from tempfile import gettempdir
+from threading import get_ident
+from xml.etree import ElementTree
+
+# PaDELPy imports
+from .wrapper import _PADEL_PATH
+
+__all__ = [
+    "column_classes",
+    "descriptor_classes",
+    "descriptor_columns",
+    "fingerprint_classes",
+    "write_descriptortypes",
+]
+
+_DESCRIPTORS_XML = join(dirname(_PADEL_PATH), "descriptors.xml")
+
+# output columns of every 2-D/3-D descriptor class, generated from the
+# "Detailed" sheet of the bundled PaDEL-Descriptor/Descriptors.xls
+_COLUMNS_JSON = join(dirname(abspath(__file__)), "descriptor_columns.json")
+
+# groups a descriptor subset may select from; fingerprints keep their
+# bundled settings unless a fingerprint subset is given, and are calculated
+# only with the ``fingerprints`` flag
+_DESCRIPTOR_GROUPS = ("2D", "3D")
+_FINGERPRINT_GROUP = "Fingerprint"
+
+
+@lru_cache(maxsize=1)
+def _class_groups() -> dict:
+    """``{class name: group}`` for every descriptor in ``descriptors.xml``."""
+    root = ElementTree.parse(_DESCRIPTORS_XML).getroot()
+    return {
+        descriptor.get("name"): group.get("name")
+        for group in root.iter("Group")
+        for descriptor in group.iter("Descriptor")
+    }
+
+
+@lru_cache(maxsize=1)
+def _columns() -> dict:
+    with open(_COLUMNS_JSON, encoding="utf-8") as columns_file:
+        return load(columns_file)
+
+
+@lru_cache(maxsize=1)
+def _column_index() -> dict:
+    return {column: name for name, columns in _columns().items() for column in columns}
+
+
+def descriptor_classes(group: str = None) -> list:
+    """Return PaDEL descriptor class names, in ``descriptors.xml`` order.
+
+    Parameters
+    ----------
+    group : {"2D", "3D"}, optional
+        Restrict to one group (default: both).
+
+    Returns
+    -------
+    list of str
+        Class names as used in descriptor-types files (e.g. ``"ALOGP"``).
+    """
+    if group is not None and group not in _DESCRIPTOR_GROUPS:
+        raise ValueError(f"`group` must be one of {_DESCRIPTOR_GROUPS}: {group!r}")
+    groups = (group,) if group is not None else _DESCRIPTOR_GROUPS
+    return [name for name, grp in _class_groups().items() if grp in groups]
+
+
+def fingerprint_classes() -> list:
+    """Return PaDEL fingerprint class names, in ``descriptors.xml`` order.
+
+    Only ``"PubchemFingerprinter"`` is enabled in the bundled file; the
+    ``...Count`` classes produce counts rather than bits.
+    """
+    return [name for name, grp in _class_groups().items() if grp == _FINGERPRINT_GROUP]
+
+
+def _fingerprint_subset(names: list) -> list:
+    if isinstance(names, str):
+        names = [names]
+    known = fingerprint_classes()
+    for name in names:
+        if name not in known:
+            raise ValueError(f"Unknown fingerprint class: {name!r} (one of {known})")
+    if not names:
+        raise ValueError("`fingerprints` selects no fingerprint classes")
+    return [name for name in known if name in names]
+
+
+def descriptor_columns(name: str) -> list:
+    """Return the output CSV columns PaDEL writes for descriptor class ``name``."""
+    if _class_groups().get(name) not in _DESCRIPTOR_GROUPS:
+        raise ValueError(f"Unknown descriptor class: {name!r}")
+    return list(_columns().get(name, []))
+
+
+def column_classes(names: list) -> list:
+    """Resolve descriptor class names and/or output column names to classes.
+
+    Parameters
+    ----------
+    names : list of str
+        Any mix of class names (``"ALOGP"``) and column names (``"AMR"``).
+
+    Returns
+    -------
+    list of str
+        The distinct classes needed, in ``descriptors.xml`` order.
+
+    Raises
+    ------
+    ValueError
+        If a name is neither a 2-D/3-D descriptor class nor an output column.
+    """
+    if isinstance(names, str):
+        names = [names]
+    groups = _class_groups()
+    index = _column_index()
+    needed = set()
+    for name in names:
+        if groups.get(name) in _DESCRIPTOR_GROUPS:
+            needed.add(name)
+        elif name in index:
+            needed.add(index[name])
+        else:
+            raise ValueError(f"Unknown descriptor class or column: {name!r}")
+    return [name for name in groups if name in needed]
+
+
+def _render_descriptortypes(classes: list, fingerprints: list = None) -> bytes:
+    """``descriptors.xml`` with only ``classes`` enabled in the 2D/3D groups.
+
+    ``None`` for either argument keeps the bundled settings of those groups.
+    """
+    root = ElementTree.parse(_DESCRIPTORS_XML).getroot()
+    for group in root.iter("Group"):
+        if group.get("name") in _DESCRIPTOR_GROUPS:
+            selected = classes
+        elif group.get("name") == _FINGERPRINT_GROUP:
+            selected = fingerprints
+        else:
+            continue
+        if selected is None:
+            continue
+        for descriptor in group.iter("Descriptor"):
+            enabled = descriptor.get("name") in selected
+            descriptor.set("value", "true" if enabled else "false")
+    return ElementTree.tostring(root, encoding="utf-8")
+
+
+def write_descriptortypes(
+    names: list = None, path: str = None, fingerprints: list = None
+) -> str:
+    """Write a descriptor-types file that enables only the classes ``names`` need.
+
+    The result can be passed to :func:`~padelpy.padeldescriptor` as
+    ``descriptortypes``. Settings not selected here are copied unchanged
+    from the bundled ``descriptors.xml``.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Descriptor class names and/or output column names (see
+        :func:`column_classes`). By default every 2-D/3-D class is kept.
+    path : str, optional
+        Destination file. By default the file is written to a shared
+        temporary directory under a name derived from its content, so equal
+        selections reuse one file.
+    fingerprints : list of str, optional
+        Fingerprint classes to enable (see :func:`fingerprint_classes`). By
+        default the bundled fingerprint settings are kept.
+
+    Returns
+    -------
+    str
+        Path of the descriptor-types file.
+    """
+    classes = None if names is None else column_classes(names)
+    if fingerprints is not None:
+        fingerprints = _fingerprint_subset(fingerprints)
+    content = _render_descriptortypes(classes, fingerprints)
+    if path is None:
+        directory = join(gettempdir(), "padelpy-descriptortypes")
+        makedirs(directory, exist_ok=True)
+        path = join(directory, f"{sha256(content).hexdigest()[:16]}.xml")
+        if isfile(path):
+            return path
+    # write then rename, so concurrent writers never expose a partial file
+    partial = f"{path}.{getpid()}.{get_ident()}.tmp"
+    with open(partial, "wb") as types_file:
+        types_file.write(content)
+    replace(partial, path)
+    return path
+
+
+def _subset_options(names: list = None, fingerprints: list = None) -> dict:
+    """``padeldescriptor`` options that calculate only the classes selected.
+
+    ``names`` selects descriptor classes and ``fingerprints`` fingerprint
+    classes; ``None`` leaves that part as bundled.
+    """
+    options = {}
+    classes = None
+    if names is not None:
+        classes = column_classes(names)
+        if not classes:
+            raise ValueError("`descriptors` selects no descriptor classes")
+        groups = {_class_groups()[name] for name in classes}
+        options.update(d_2d="2D" in groups, d_3d="3D" in groups)
+    if fingerprints is not None:
+        fingerprints = _fingerprint_subset(fingerprints)
+    options["descriptortypes"] = write_descriptortypes(
+        classes, fingerprints=fingerprints
+    )
+    return options
@@ -0,0 +1,607 @@
+"""Packed binary and sparse count PaDEL fingerprints, with similarity search."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import re
+from array import array
+from collections.abc import Iterator
+from csv import reader
+from numbers import Integral
+from typing import TYPE_CHECKING, NamedTuple
+
+# PaDELPy imports
+from .arrays import DescriptorArray, _float_dtype, _require_numpy
+from .ingest import _not_utf8, _picker, _read_header, read_csv_array
+from .instrument import _count, _stage
+
+if TYPE_CHECKING:
+    import numpy
+    import scipy.sparse
+
+__all__ = [
+    "CountFingerprints",
+    "Neighbors",
+    "PackedFingerprints",
+    "pack_fingerprints",
+    "read_csv_counts",
+    "sparse_counts",
+]
+
+# output columns of PaDEL's binary fingerprints (the count fingerprints
+# SubFPC, KRFPC and APC2D are not bits and are left out)
+_BIT_COLUMN = re.compile(
+    r"^(?:FP|ExtFP|EStateFP|GraphFP|MACCSFP|PubchemFP|SubFP|KRFP|AD2D)\d+$"
+)
+
+# output columns of PaDEL's count fingerprints
+_COUNT_COLUMN = re.compile(r"^(?:SubFPC|KRFPC|APC2D)\d+$")
+
+_METRICS = ("tanimoto", "dice")
+
+# row pairs compared per step; bounds the temporary arrays to a few MiB
+_PAIRS_PER_BLOCK = 1 << 18
+# default size of a block of scores (queries x whole library)
+_SCORES_PER_BLOCK = 1 << 22
+# dense cells converted at a time while a sparse matrix is built
+_CELLS_PER_CHUNK = 1 << 20
+
+
+class Neighbors(NamedTuple):
+    """Result of :meth:`PackedFingerprints.top_k`.
+
+    ``indices`` are library rows and ``scores`` their similarities, both of
+    shape ``(queries, k)`` and ordered from most to least similar (ties by
+    library row).
+    """
+
+    indices: numpy.ndarray
+    scores: numpy.ndarray
+
+
+class CountFingerprints(NamedTuple):
+    """Count fingerprints as a sparse matrix with one shared column list.
+
+    ``values`` is a SciPy ``csr_matrix`` with one row per molecule and one
+    column per entry of ``columns``; only non-zero counts are stored. PaDEL's
+    count fingerprints (``SubFPC``, ``KRFPC`` and ``APC2D`` columns) are
+    mostly zeros, so this is much smaller than rows or a dense array, and
+    SciPy-aware models such as scikit-learn estimators accept it as is.
+    """
+
+    columns: list
+    values: scipy.sparse.csr_matrix
+
+
+def _require_scipy():
+    """Import ``scipy.sparse``, raising an actionable error when missing."""
+    try:
+        import scipy.sparse
+    except ImportError as exc:
+        raise ImportError(
+            "SciPy is required for sparse output. "
+            "Install it with `pip install padelpy[scipy]`."
+        ) from exc
+    return scipy.sparse
+
+
+def _bit_columns(columns: list) -> list:
+    return [name for name in columns if _BIT_COLUMN.match(name)]
+
+
+def _count_columns(columns: list) -> list:
+    return [name for name in columns if _COUNT_COLUMN.match(name)]
+
+
+def _popcount(words):
+    """Set bits of each ``uint64`` element."""
+    np = _require_numpy()
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(words)
+    table = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+    counts = table[np.ascontiguousarray(words).view(np.uint8)]
+    return counts.reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+class PackedFingerprints:
+    """Binary fingerprints of several molecules, 64 bits per ``uint64`` word.
+
+    Row ``i`` of ``words`` holds the ``n_bits`` bits of molecule ``i``; the
+    unused bits of the last word are zero. An 881-bit PubChem fingerprint
+    takes 112 bytes this way, against tens of kilobytes as a dict of
+    ``"0"``/``"1"`` strings. Similarities are counted with a vectorized
+    popcount of the ANDed words.
+
+    Build instances with :func:`pack_fingerprints` (from PaDEL output),
+    :meth:`from_bits`, or ``output="bits"`` on :func:`~padelpy.from_smiles`,
+    :func:`~padelpy.from_mdl` and :func:`~padelpy.from_sdf`. Indexing with an
+    int or a slice returns a :class:`PackedFingerprints` of those rows.
+
+    Attributes
+    ----------
+    columns : list of str
+        Fingerprint column names, one per bit.
+    words : numpy.ndarray
+        ``uint64`` array of shape ``(molecules, ceil(n_bits / 64))``.
+    """
+
+    def __init__(self, columns: list, words: numpy.ndarray) -> None:
+        np = _require_numpy()
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        if words.ndim != 2 or words.shape[1] != -(-len(columns) // 64):
+            raise ValueError(
+                f"`words` must have shape (molecules, {-(-len(columns) // 64)})"
+                f" for {len(columns)} bits: {words.shape}"
+            )
+        self.columns = list(columns)
+        self.words = words
+        self._counts = None
+
+    @classmethod
+    def from_bits(cls, bits, columns: list = None) -> PackedFingerprints:
+        """Pack a 2-D array of 0/1 (or boolean) values, one row per molecule.
+
+        ``columns`` defaults to ``"bit0"``, ``"bit1"``, ...
+
+        Raises
+        ------
+        ValueError
+            If ``bits`` is not 2-D or holds values other than 0 and 1 (NaN
+            included).
+        """
+        np = _require_numpy()
+        bits = np.asarray(bits)
+        if bits.ndim != 2:
+            raise ValueError(f"`bits` must be 2-D: shape {bits.shape}")
+        n_bits = bits.shape[1]
+        if columns is None:
+            columns = [f"bit{idx}" for idx in range(n_bits)]
+        if len(columns) != n_bits:
+            raise ValueError(f"{len(columns)} column names for {n_bits} bits")
+        if bits.dtype != bool:
+            if not np.isin(bits, (0, 1)).all():
+                raise ValueError("Fingerprint bits must be 0 or 1")
+            bits = bits != 0
+        n_words = -(-n_bits // 64)
+        padded = np.zeros((len(bits), n_words * 64), dtype=bool)
+        padded[:, :n_bits] = bits
+        packed = np.packbits(padded, axis=1, bitorder="little")
+        return cls(columns, packed.view("<u8").astype(np.uint64))
+
+    @property
+    def n_bits(self) -> int:
+        return len(self.columns)
+
+    @property
+    def counts(self) -> numpy.ndarray:
+        """Number of bits set in each fingerprint."""
+        if self._counts is None:
+            np = _require_numpy()
+            self._counts = _popcount(self.words).sum(axis=1, dtype=np.int64)
+        return self._counts
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __getitem__(self, rows) -> PackedFingerprints:
+        if isinstance(rows, Integral):
+            if not -len(self) <= rows < len(self):
+                raise IndexError(f"Fingerprint index out of range: {rows}")
+            rows = slice(rows, rows + 1 or None)
+        return PackedFingerprints(self.columns, self.words[rows])
+
+    def __repr__(self) -> str:
+        return f"PackedFingerprints({len(self)} molecules, {self.n_bits} bits)"
+
+    def to_bits(self) -> numpy.ndarray:
+        """Unpack to a ``uint8`` array of 0/1, shape ``(molecules, n_bits)``."""
+        np = _require_numpy()
+        packed = self.words.astype("<u8").view(np.uint8)
+        return np.unpackbits(packed, axis=1, count=self.n_bits, bitorder="little")
+
+    def _check_queries(self, queries: PackedFingerprints) -> None:
+        if not isinstance(queries, PackedFingerprints):
+            raise TypeError(
+                f"Queries must be PackedFingerprints: {type(queries).__name__}"
+            )
+        if queries.columns != self.columns:
+            raise ValueError("Queries and library have different fingerprint columns")
+
+    def _scores(self, queries: PackedFingerprints, metric: str, start: int, stop: int):
+        """Similarity of every query to library rows ``start:stop``."""
+        np = _require_numpy()
+        library = self.words[start:stop].T.copy()  # one contiguous row per word
+        shape = (len(queries), stop - start)
+        # narrow, reused buffers keep each pass over the words in cache
+        common = np.zeros(
+            shape, dtype=np.uint16 if self.n_bits < 1 << 16 else np.uint32
+        )
+        both = np.empty(shape, dtype=np.uint64)
+        for word in range(library.shape[0]):
+            np.bitwise_and(queries.words[:, word, None], library[word], out=both)
+            common += _popcount(both)
+        common = common.astype(np.int64)
+        total = queries.counts[:, None] + self.counts[None, start:stop]
+        if metric == "tanimoto":
+            total -= common
+        else:
+            common *= 2
+        scores = np.zeros(common.shape, dtype=np.float64)
+        # two empty fingerprints share no bits: similarity 0
+        np.divide(common, total, out=scores, where=total > 0)
+        return scores
+
+    def _blocks(self, queries: PackedFingerprints, metric: str, block_size: int):
+        """Yield ``(query rows, scores against the whole library)`` blocks."""
+        if metric not in _METRICS:
+            raise ValueError(f"`metric` must be one of {_METRICS}: {metric!r}")
+        self._check_queries(queries)
+        np = _require_numpy()
+        if block_size is None:
+            block_size = max(1, _SCORES_PER_BLOCK // max(len(self), 1))
+        elif block_size < 1:
+            raise ValueError(f"`block_size` must be at least 1: {block_size}")
+        step = max(1, _PAIRS_PER_BLOCK // block_size)
+        for first in range(0, len(queries), block_size):
+            block = queries[first : first + block_size]
+            scores = [
+                self._scores(block, metric, start, min(start + step, len(self)))
+                for start in range(0, len(self), step)
+            ]
+            if scores:
+                yield first, np.hstack(scores)
+            else:
+                yield first, np.zeros((len(block), 0), dtype=np.float64)
+
+    def similarity(
+        self, query: PackedFingerprints, metric: str = "tanimoto"
+    ) -> numpy.ndarray:
+        """Similarity of one fingerprint to every fingerprint in this library.
+
+        Parameters
+        ----------
+        query : PackedFingerprints
+            A single fingerprint (e.g. ``library[0]``) with the same columns.
+        metric : {"tanimoto", "dice"}, default "tanimoto"
+            Tanimoto ``c / (a + b - c)`` or Dice ``2c / (a + b)``, where ``a``
+            and ``b`` are the bits set in each fingerprint and ``c`` those set
+            in both. Two empty fingerprints have similarity 0.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``float64`` scores, one per library fingerprint.
+        """
+        if len(query) != 1:
+            raise ValueError(
+                f"`query` must hold one fingerprint: {len(query)};"
+                " use similarity_matrix for several"
+            )
+        return self.similarity_matrix(query, metric)[0]
+
+    def similarity_matrix(
+        self,
+        queries: PackedFingerprints = None,
+        metric: str = "tanimoto",
+        block_size: int = None,
+    ) -> numpy.ndarray:
+        """Similarity of every query to every fingerprint in this library.
+
+        The work is done in blocks of query and library rows, so temporary
+        memory stays bounded however large both sets are; only the result,
+        ``len(queries) * len(self)`` floats, is allocated in full.
+
+        Parameters
+        ----------
+        queries : PackedFingerprints, optional
+            Fingerprints with the same columns (default: this library).
+        metric : {"tanimoto", "dice"}, default "tanimoto"
+            As for :meth:`similarity`.
+        block_size : int, optional
+            Queries compared per block (default: sized from the library).
+
+        Returns
+        -------
+        numpy.ndarray
+            ``float64`` array of shape ``(len(queries), len(self))``.
+        """
+        np = _require_numpy()
+        if queries is None:
+            queries = self
+        result = np.empty((len(queries), len(self)), dtype=np.float64)
+        for first, scores in self._blocks(queries, metric, block_size):
+            result[first : first + len(scores)] = scores
+        return result
+
+    def top_k(
+        self,
+        queries: PackedFingerprints,
+        k: int = 10,
+        metric: str = "tanimoto",
+        block_size: int = None,
+    ) -> Neighbors:
+        """Find the ``k`` library fingerprints most similar to each query.
+
+        Only one block of scores is held at a time, so a large query set can
+        be searched against a large library.
+
+        Parameters
+        ----------
+        queries : PackedFingerprints
+            Fingerprints with the same columns as this library.
+        k : int, default 10
+            Neighbours per query (at most ``len(self)``).
+        metric : {"tanimoto", "dice"}, default "tanimoto"
+            As for :meth:`similarity`.
+        block_size : int, optional
+            Queries compared per block (default: sized from the library).
+
+        Returns
+        -------
+        Neighbors
+            Library row indices and scores, shape ``(len(queries), k)``.
+        """
+        np = _require_numpy()
+        if k < 1:
+            raise ValueError(f"`k` must be at least 1: {k}")
+        k = min(k, len(self))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.empty((len(queries), k), dtype=np.float64)
+        if k == 0:
+            return Neighbors(indices, scores)
+        for first, block in self._blocks(queries, metric, block_size):
+            best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            best.sort(axis=1)
+            best_scores = np.take_along_axis(block, best, axis=1)
+            # stable sort of the index-ordered candidates breaks ties by row
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            rows = slice(first, first + len(block))
+            indices[rows] = np.take_along_axis(best, order, axis=1)
+            scores[rows] = np.take_along_axis(best_scores, order, axis=1)
+        return Neighbors(indices, scores)
+
+
+def _no_bit_columns() -> ValueError:
+    return ValueError(
+        "No binary fingerprint columns found; calculate with"
+        " `fingerprints=True` or `mode='fingerprints'`"
+    )
+
+
+def _pack_matrix(columns: list, values) -> PackedFingerprints:
+    picked = _bit_columns(columns)
+    if not picked:
+        raise _no_bit_columns()
+    if len(picked) != len(columns):
+        position = {name: idx for idx, name in enumerate(columns)}
+        values = values[:, [position[name] for name in picked]]
+    return PackedFingerprints.from_bits(values, picked)
+
+
+def pack_fingerprints(result) -> PackedFingerprints:
+    """Pack the binary fingerprint columns of PaDEL output.
+
+    Descriptor columns and count fingerprints in ``result`` are ignored.
+
+    Parameters
+    ----------
+    result : list of dict or DescriptorArray
+        Rows as returned by :func:`~padelpy.from_smiles` (a single row dict
+        is also accepted) or an ``output="array"`` result.
+
+    Returns
+    -------
+    PackedFingerprints
+        One fingerprint per row, in order.
+
+    Raises
+    ------
+    ValueError
+        If there are no binary fingerprint columns, or a cell is not 0 or 1
+        (such as an empty cell of a molecule PaDEL failed on).
+    """
+    np = _require_numpy()
+    if isinstance(result, DescriptorArray):
+        return _pack_matrix(result.columns, result.values)
+    if isinstance(result, dict):
+        result = [result]
+    columns = _bit_columns(list(result[0].keys())) if result else []
+    cells = [[row.get(name, "") for name in columns] for row in result]
+    try:
+        values = np.array(cells, dtype=np.float64).reshape(len(cells), len(columns))
+    except ValueError as exc:
+        raise ValueError("Fingerprint bits must be 0 or 1") from exc
+    return _pack_matrix(columns, values)
+
+
+def _padel_failed() -> RuntimeError:
+    return RuntimeError(
+        "PaDEL-Descriptor failed on one or more mols."
+        " Ensure the input structures are correct."
+    )
+
+
+def _read_csv_bits(csv_path: str) -> tuple:
+    """Read only the bit columns of a PaDEL CSV into packed fingerprints."""
+    columns = _bit_columns(_read_header(csv_path))
+    if not columns:
+        raise _no_bit_columns()
+    names, array = read_csv_array(csv_path, columns=columns, dtype="float32")
+    try:
+        return names, _pack_matrix(array.columns, array.values)
+    except ValueError as exc:
+        raise _padel_failed() from exc
+
+
+def _no_count_columns() -> ValueError:
+    return ValueError(
+        "No count fingerprint columns found; calculate them with, for"
+        " example, `fingerprints=['KlekotaRothFingerprintCount']`"
+    )
+
+
+def _stack_sparse(columns: list, blocks, dtype) -> CountFingerprints:
+    """Convert dense row blocks to CSR one at a time and stack them."""
+    np = _require_numpy()
+    sparse = _require_scipy()
+    parts = []
+    for block in blocks:
+        if np.isnan(block).any():
+            raise ValueError("Count fingerprint cells must be numbers")
+        parts.append(sparse.csr_matrix(block))
+    if not parts:
+        return CountFingerprints(columns, sparse.csr_matrix((0, len(columns)), dtype))
+    return CountFingerprints(columns, sparse.vstack(parts, format="csr"))
+
+
+def _array_blocks(values, picked: list, dtype) -> Iterator:
+    step = max(1, _CELLS_PER_CHUNK // max(len(picked), 1))
+    for first in range(0, len(values), step):
+        yield values[first : first + step][:, picked].astype(dtype)
+
+
+def _row_blocks(rows: list, columns: list, dtype) -> Iterator:
+    np = _require_numpy()
+    step = max(1, _CELLS_PER_CHUNK // max(len(columns), 1))
+    for first in range(0, len(rows), step):
+        block = rows[first : first + step]
+        cells = [[row.get(name, "") for name in columns] for row in block]
+        try:
+            matrix = np.array(cells, dtype=dtype)
+        except ValueError as exc:
+            raise ValueError("Count fingerprint cells must be numbers") from exc
+        yield matrix.reshape(len(block), len(columns))
+
+
+def sparse_counts(result, dtype: str = "float64") -> CountFingerprints:
+    """Collect the count fingerprint columns of PaDEL output in a CSR matrix.
+
+    Descriptor and binary fingerprint columns in ``result`` are ignored.
+    Rows are converted a block at a time, so the dense form of the counts
+    is never held in full.
+
+    Parameters
+    ----------
+    result : list of dict or DescriptorArray
+        Rows as returned by :func:`~padelpy.from_smiles` (a single row dict
+        is also accepted) or an ``output="array"`` result.
+    dtype : str, default "float64"
+        Floating-point dtype of the matrix.
+
+    Returns
+    -------
+    CountFingerprints
+        One matrix row per result row, in order.
+
+    Raises
+    ------
+    ValueError
+        If there are no count fingerprint columns, or a cell is not a number
+        (such as an empty cell of a molecule PaDEL failed on).
+    """
+    _require_scipy()
+    dtype = _float_dtype(dtype)
+    if isinstance(result, DescriptorArray):
+        columns = _count_columns(result.columns)
+        position = {name: idx for idx, name in enumerate(result.columns)}
+        picked = [position[name] for name in columns]
+        blocks = _array_blocks(result.values, picked, dtype)
+    else:
+        if isinstance(result, dict):
+            result = [result]
+        columns = _count_columns(list(result[0].keys())) if result else []
+        blocks = _row_blocks(result, columns, dtype)
+    if not columns:
+        raise _no_count_columns()
+    return _stack_sparse(columns, blocks, dtype)
+
+
+def _parse_counts(cells: list, dtype):
+    np = _require_numpy()
+    try:
+        return np.array(cells, dtype=dtype)
+    except ValueError as exc:
+        raise ValueError("Count fingerprint cells must be numbers") from exc
+
+
+def read_csv_counts(csv_path: str, dtype: str = "float64") -> tuple:
+    """Read the count fingerprint columns of a PaDEL CSV into a CSR matrix.
+
+    Rows are scanned with the C ``csv`` reader and only their non-zero
+    cells are kept and converted, so neither row dicts nor a dense matrix
+    are built and memory follows the number of non-zero counts rather than
+    the width of the file.
+
+    Parameters
+    ----------
+    csv_path : str
+        PaDEL output CSV (UTF-8).
+    dtype : str, default "float64"
+        Floating-point dtype of the matrix.
+
+    Returns
+    -------
+    tuple of (list of str, CountFingerprints)
+        Molecule names (PaDEL's ``Name`` column) and the count matrix.
+
+    Raises
+    ------
+    RuntimeError
+        If the file is not valid UTF-8.
+    ValueError
+        If the file has no count fingerprint columns, or a count cell is
+        empty or not a number.
+    """
+    np = _require_numpy()
+    sparse = _require_scipy()
+    dtype = _float_dtype(dtype)
+    header = _read_header(csv_path)
+    columns = _count_columns(header)
+    if not columns:
+        raise _no_count_columns()
+    position = {name: idx for idx, name in enumerate(header)}
+    pick = _picker([position[name] for name in columns], len(header))
+    name_idx = header.index("Name") if "Name" in header else None
+
+    names, values, pending = [], [], []
+    indices, indptr = array("q"), array("q", [0])
+    with _stage("parse"):
+        try:
+            with open(csv_path, encoding="utf-8", newline="") as csv_file:
+                rows = (row for row in reader(csv_file) if row)
+                next(rows, None)
+                for row in rows:
+                    names.append(row[name_idx] if name_idx is not None else "")
+                    cells = pick(row)
+                    # PaDEL writes zero counts as "0"; other zeros are dropped below
+                    nonzero = [idx for idx, cell in enumerate(cells) if cell != "0"]
+                    indices.extend(nonzero)
+                    pending.extend([cells[idx] for idx in nonzero])
+                    indptr.append(len(indices))
+                    if len(pending) >= _CELLS_PER_CHUNK:
+                        values.append(_parse_counts(pending, dtype))
+                        pending = []
+        except UnicodeDecodeError as exc:
+            raise _not_utf8(csv_path) from exc
+        values.append(_parse_counts(pending, dtype))
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate(values),
+                np.frombuffer(indices, dtype=np.int64),
+                np.frombuffer(indptr, dtype=np.int64),
+            ),
+            shape=(len(names), len(columns)),
+        )
+        matrix.eliminate_zeros()
+    _count("rows", len(names))
+    return names, CountFingerprints(columns, matrix)
+
+
+def _read_csv_counts(csv_path: str, dtype: str) -> tuple:
+    """``read_csv_counts`` for PaDEL runs: empty cells mean a failed molecule."""
+    if not _count_columns(_read_header(csv_path)):
+        raise _no_count_columns()
+    try:
+        return read_csv_counts(csv_path, dtype)
+    except ValueError as exc:
+        raise _padel_failed() from exc
@@ -0,0 +1,199 @@
+"""pandas DataFrames of PaDEL-Descriptor output with compact numeric dtypes."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from typing import TYPE_CHECKING
+
+# PaDELPy imports
+from .arrays import _float_dtype, _require_numpy, _rows_to_array
+from .fingerprints import _BIT_COLUMN
+from .ingest import _chunks, _projection, _read_header
+from .instrument import _count, _stage
+
+if TYPE_CHECKING:
+    import pandas
+
+__all__ = [
+    "read_csv_dataframe",
+]
+
+_BIT_DTYPES = ("uint8", "bool")
+
+# float64 cells parsed at a time; bounds the parse buffer to 32 MiB
+_CELLS_PER_CHUNK = 1 << 22
+
+
+def _require_pandas():
+    """Import pandas, raising an actionable error when it is not installed."""
+    try:
+        import pandas
+    except ImportError as exc:
+        raise ImportError(
+            "pandas is required for DataFrame output. "
+            "Install it with `pip install padelpy[pandas]`."
+        ) from exc
+    return pandas
+
+
+def _check_frame_options(dtype, bits: str):
+    """Validate DataFrame dtypes up front; returns the float dtype."""
+    _require_pandas()
+    if bits not in _BIT_DTYPES:
+        raise ValueError(f"`bits` must be one of {_BIT_DTYPES}: {bits!r}")
+    return _float_dtype(dtype)
+
+
+_UNSIGNED = ("uint8", "uint16", "uint32", "uint64")
+_SIGNED = ("int8", "int16", "int32", "int64")
+
+
+def _int_dtype(low: float, high: float):
+    """Smallest integer dtype holding ``low..high``, or None if none does."""
+    np = _require_numpy()
+    for name in _UNSIGNED if low >= 0 else _SIGNED:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return np.dtype(name)
+    return None
+
+
+def _typed_columns(columns: list, values, dtype, bits: str, integers: bool) -> dict:
+    """Split a float64 matrix into one array per column, in compact dtypes.
+
+    Binary fingerprint columns holding only 0 and 1 become ``bits``; other
+    columns of whole numbers become the smallest integer dtype that holds
+    them (if ``integers``); everything else, including any column with a
+    missing value, becomes ``dtype``.
+    """
+    np = _require_numpy()
+    whole = np.isfinite(values).all(axis=0) & (values == np.trunc(values)).all(axis=0)
+    low = values.min(axis=0, initial=0.0)
+    high = values.max(axis=0, initial=0.0)
+    arrays = {}
+    for idx, name in enumerate(columns):
+        target = dtype
+        if whole[idx]:
+            if _BIT_COLUMN.match(name) and low[idx] >= 0 and high[idx] <= 1:
+                target = bits
+            elif integers:
+                target = _int_dtype(low[idx], high[idx]) or dtype
+        arrays[name] = values[:, idx].astype(target)
+    return arrays
+
+
+def _merge_columns(parts: list, dtype):
+    """Concatenate one column's chunks, widening to a dtype that holds all."""
+    np = _require_numpy()
+    if len(parts) == 1:
+        return parts[0]
+    if all(part.dtype == parts[0].dtype for part in parts):
+        target = parts[0].dtype
+    elif any(part.dtype.kind == "f" for part in parts):
+        target = dtype
+    else:
+        low = min(int(part.min()) for part in parts if len(part))
+        high = max(int(part.max()) for part in parts if len(part))
+        target = _int_dtype(low, high)
+    return np.concatenate(parts, dtype=target, casting="unsafe")
+
+
+def _frame(arrays: dict, index=None) -> pandas.DataFrame:
+    pd = _require_pandas()
+    return pd.DataFrame(arrays, index=index, copy=False)
+
+
+def _read_frame(
+    csv_path: str,
+    columns: list = None,
+    dtype="float64",
+    bits: str = "uint8",
+    integers: bool = True,
+    engine: str = "auto",
+) -> tuple:
+    """Read a PaDEL CSV into ``(names, DataFrame)`` with a default index.
+
+    The file is parsed a bounded block of float64 cells at a time, and each
+    block is converted to its compact column dtypes before the next is read.
+    """
+    dtype = _check_frame_options(dtype, bits)
+    np = _require_numpy()
+    header = _read_header(csv_path)
+    out_columns = [header[idx] for idx in _projection(header, columns)]
+    chunksize = max(1, _CELLS_PER_CHUNK // max(1, len(out_columns)))
+    names, parts = [], {name: [] for name in out_columns}
+    with _stage("parse"):
+        for chunk_names, array in _chunks(
+            csv_path, chunksize, columns, np.dtype("float64"), engine
+        ):
+            names.extend(chunk_names)
+            typed = _typed_columns(array.columns, array.values, dtype, bits, integers)
+            for name, values in typed.items():
+                parts[name].append(values)
+    _count("rows", len(names))
+    if not names:
+        return names, _frame({name: np.empty(0, dtype) for name in out_columns})
+    # merge column by column so only one column exists twice at a time
+    arrays = {name: _merge_columns(parts.pop(name), dtype) for name in out_columns}
+    return names, _frame(arrays)
+
+
+def _rows_to_frame(rows: list, dtype="float64") -> pandas.DataFrame:
+    """Convert PaDEL row mappings (``Name`` already removed) to a DataFrame."""
+    dtype = _check_frame_options(dtype, "uint8")
+    array = _rows_to_array(rows, "float64")
+    return _frame(_typed_columns(array.columns, array.values, dtype, "uint8", True))
+
+
+def read_csv_dataframe(
+    csv_path: str,
+    columns: list = None,
+    dtype: str = "float64",
+    bits: str = "uint8",
+    integers: bool = True,
+    engine: str = "auto",
+) -> pandas.DataFrame:
+    """Read a PaDEL CSV into a pandas DataFrame with explicit numeric dtypes.
+
+    Cells are parsed as numbers in native code (as in
+    :func:`~padelpy.ingest.read_csv_array`), never as Python strings or
+    row dicts, and each column gets a compact dtype: binary fingerprint
+    columns become ``bits``, columns of whole numbers (counts such as
+    ``nC``) become the smallest integer dtype that holds them, and the rest
+    become ``dtype``. A column with an empty or non-numeric cell is always
+    ``dtype``, with NaN for the missing values.
+
+    Parameters
+    ----------
+    csv_path : str
+        PaDEL output CSV (UTF-8).
+    columns : list of str, optional
+        Descriptor columns to read, in this order (default: every column
+        except ``Name``).
+    dtype : str, default "float64"
+        Floating-point dtype of the non-integer columns (``"float32"``
+        halves their memory).
+    bits : {"uint8", "bool"}, default "uint8"
+        Dtype of binary fingerprint columns.
+    integers : bool, default True
+        If False, whole-number columns stay ``dtype`` too.
+    engine : {"auto", "pyarrow", "numpy"}, default "auto"
+        ``"auto"`` uses pyarrow when it is installed.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per molecule, indexed by PaDEL's ``Name`` column.
+
+    Raises
+    ------
+    RuntimeError
+        If the file is not valid UTF-8.
+    ValueError
+        If a requested column is not in the file, or ``dtype`` or ``bits``
+        is not valid.
+    """
+    pd = _require_pandas()
+    names, frame = _read_frame(csv_path, columns, dtype, bits, integers, engine)
+    frame.index = pd.Index(names, name="Name")
+    return frame
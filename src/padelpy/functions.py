@@ -9,18 +9,36 @@
 
 # stdlib. imports
 from collections import OrderedDict
-from csv import DictReader
-from os.path import join
+from csv import DictReader, DictWriter
+from functools import partial
+from os.path import join, splitext
 from re import IGNORECASE, compile
 from tempfile import TemporaryDirectory
 
 # PaDELPy imports
-from .wrapper import padeldescriptor
+from .arrays import _float_dtype, _require_numpy, _rows_to_array
+from .descriptortypes import _subset_options
+from .fingerprints import (
+    _read_csv_bits,
+    _read_csv_counts,
+    _require_scipy,
+    pack_fingerprints,
+    sparse_counts,
+)
+from .frames import _check_frame_options, _read_frame, _rows_to_frame
+from .ingest import _not_utf8, read_csv_array
+from .instrument import _count, _stage, _timed_call
+from .isolation import IsolatedResult, _bisect, _strip_names
+from .jvm import JVMOptions
+from .timeouts import _is_policy, _timeout_seconds
+from .wrapper import PaDELTimeoutError, padeldescriptor
 
 __all__ = [
     "from_mdl",
     "from_smiles",
     "from_sdf",
+    "from_sdf_isolated",
+    "from_smiles_isolated",
 ]
 
 
@@ -32,23 +50,543 @@ def _read_padel_csv_rows(csv_path: str) -> list:
     PaDELPy caller-facing failures). No silent fallback encoding.
     """
     try:
-        with open(csv_path, encoding="utf-8") as desc_file:
-            return list(DictReader(desc_file))
+        with _stage("parse"), open(csv_path, encoding="utf-8") as desc_file:
+            rows = list(DictReader(desc_file))
     except UnicodeDecodeError as exc:
+        raise _not_utf8(csv_path) from exc
+    _count("rows", len(rows))
+    return rows
+
+
+def _write_padel_csv_rows(csv_path: str, rows: list) -> None:
+    """Write descriptor rows (``Name`` column included) to a UTF-8 CSV file."""
+    fieldnames = list(rows[0].keys()) if rows else ["Name"]
+    with open(csv_path, "w", encoding="utf-8", newline="") as desc_file:
+        writer = DictWriter(desc_file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# PaDEL 3-D flags per ``mode``; ``None`` keeps the historical behaviour
+_MODE_FLAGS = {
+    None: {"d_3d": True, "convert3d": True, "retain3d": True},
+    "3d": {"d_3d": True, "convert3d": True, "retain3d": True},
+    "existing3d": {"d_3d": True, "convert3d": False, "retain3d": True},
+    "2d": {"d_3d": False, "convert3d": False, "retain3d": False},
+    "fingerprints": {"d_3d": False, "convert3d": False, "retain3d": False},
+}
+
+
+def _padel_options(
+    descriptors,
+    fingerprints: bool | list,
+    timeout: int,
+    maxruntime: int,
+    threads: int,
+    mode: str = None,
+    jvm: JVMOptions = None,
+) -> dict:
+    """Build the ``padeldescriptor`` keyword arguments shared by the helpers.
+
+    ``maxruntime`` is given in seconds and converted to PaDEL's milliseconds.
+    ``descriptors`` may be a list of descriptor class or column names, in
+    which case a pruned descriptor-types file selects just those classes.
+    ``fingerprints`` may likewise be a list of fingerprint class names.
+    ``mode`` picks the 3-D flags (see ``_MODE_FLAGS``); ``"fingerprints"``
+    turns descriptors off and fingerprints on. ``jvm`` is passed on only
+    when given, so runs without it use the default of the process they run in.
+    """
+    if mode not in _MODE_FLAGS:
+        raise ValueError(
+            "`mode` must be one of '2d', '3d', 'existing3d', 'fingerprints'"
+            f" or None: {mode!r}"
+        )
+    flags = _MODE_FLAGS[mode]
+    if mode == "fingerprints":
+        descriptors = False
+        fingerprints = fingerprints if isinstance(fingerprints, list) else True
+
+    # unit conversion for maximum running time per molecule
+    # seconds -> milliseconds
+    if maxruntime != -1:
+        maxruntime = maxruntime * 1000
+
+    descriptor_subset = None if isinstance(descriptors, bool) else descriptors
+    fingerprint_subset = None if isinstance(fingerprints, bool) else fingerprints
+    options = {
+        "maxruntime": maxruntime,
+        "convert3d": flags["convert3d"],
+        "retain3d": flags["retain3d"],
+        "retainorder": True,
+        "d_2d": descriptors,
+        "d_3d": descriptors and flags["d_3d"],
+        "fingerprints": fingerprint_subset is not None or fingerprints,
+        "sp_timeout": timeout,
+        "threads": threads,
+    }
+    if jvm is not None:
+        options["jvm"] = jvm
+    if descriptor_subset is not None or fingerprint_subset is not None:
+        options.update(_subset_options(descriptor_subset, fingerprint_subset))
+    if descriptor_subset is not None:
+        if options["d_3d"] and not flags["d_3d"]:
+            raise ValueError(
+                f"`descriptors` selects 3D descriptor classes, which mode={mode!r}"
+                " does not calculate"
+            )
+    return options
+
+
+def _count_input_molecules(mol_path: str) -> int:
+    """Number of molecules in a SMILES (one per line) or MDL/SDF input file."""
+    if splitext(mol_path)[1].lower() == ".smi":
+        with open(mol_path, encoding="utf-8", errors="surrogateescape") as handle:
+            return sum(1 for line in handle if line.strip())
+    return sum(1 for _ in _iter_mol_records(mol_path))
+
+
+def _timed_out(exception: Exception, molecules: list) -> bool:
+    """Whether a failed run of ``molecules`` should be split and rerun."""
+    return len(molecules) > 1 and isinstance(exception, PaDELTimeoutError)
+
+
+def _run_padel(mol_path: str, csv_path: str, options: dict, attempts: int = 3) -> None:
+    """Call ``padeldescriptor``, making up to ``attempts`` tries on ``RuntimeError``.
+
+    A timeout policy in ``options["sp_timeout"]`` (see :mod:`padelpy.timeouts`)
+    is resolved before each try from the number of molecules in ``mol_path``.
+    A subprocess timeout is not retried: the same batch would only time out
+    again, so callers split it instead (see ``_rows_in_halves``).
+    """
+    for attempt in range(attempts):
+        run_options = options
+        if _is_policy(options.get("sp_timeout")):
+            seconds = _timeout_seconds(
+                options["sp_timeout"], _count_input_molecules(mol_path)
+            )
+            run_options = {**options, "sp_timeout": seconds}
+        try:
+            padeldescriptor(mol_dir=mol_path, d_file=csv_path, **run_options)
+            break
+        except PaDELTimeoutError:
+            raise
+        except RuntimeError as exception:
+            if attempt == attempts - 1:
+                raise RuntimeError(exception) from exception
+            _count("retries")
+            continue
+
+
+def _compute_smiles_rows(
+    smiles: list,
+    options: dict,
+    output_csv: str = None,
+    attempts: int = 3,
+    read=None,
+) -> list:
+    """Run PaDEL once over ``smiles`` and return the raw CSV rows.
+
+    Rows still carry PaDEL's ``Name`` column; callers validate and strip it.
+    ``read`` replaces ``_read_padel_csv_rows`` as the CSV reader.
+    """
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        smi_path = join(tmpdir, "input.smi")
+        with _stage("write_input"), open(smi_path, "w", encoding="utf-8") as smi_file:
+            smi_file.write("\n".join(smiles))
+        _count("molecules", len(smiles))
+
+        csv_path = (
+            output_csv if output_csv is not None else join(tmpdir, "descriptors.csv")
+        )
+        _run_padel(smi_path, csv_path, options, attempts)
+        return (read or _read_padel_csv_rows)(csv_path)
+
+
+def _compute_file_rows(
+    mol_file: str,
+    options: dict,
+    output_csv: str = None,
+    attempts: int = 3,
+    read=None,
+) -> list:
+    """Run PaDEL once over an MDL/SDF file and return the raw CSV rows."""
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        csv_path = (
+            output_csv if output_csv is not None else join(tmpdir, "descriptors.csv")
+        )
+        _run_padel(mol_file, csv_path, options, attempts)
+        return (read or _read_padel_csv_rows)(csv_path)
+
+
+def _compute_records_rows(
+    records: list,
+    options: dict,
+    suffix: str = ".sdf",
+    attempts: int = 3,
+    output_csv: str = None,
+    read=None,
+) -> list:
+    """Run PaDEL once over molblock records written to a temporary file."""
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        mol_path = join(tmpdir, f"input{suffix}")
+        with _stage("write_input"):
+            _write_mol_records(mol_path, records)
+        _count("molecules", len(records))
+        return _compute_file_rows(mol_path, options, output_csv, attempts, read)
+
+
+def _iter_mol_records(mol_file: str):
+    """Yield the molblock records of an MDL/SDF file (``$$$$`` excluded)."""
+    lines = []
+    with open(mol_file, encoding="utf-8", errors="surrogateescape") as handle:
+        for line in handle:
+            if line.rstrip("\r\n") == "$$$$":
+                yield "".join(lines)
+                lines = []
+            else:
+                lines.append(line)
+    if "".join(lines).strip():
+        yield "".join(lines)
+
+
+def _check_on_error(on_error: str, output: str) -> None:
+    if on_error not in ("raise", "collect"):
+        raise ValueError(f"`on_error` must be 'raise' or 'collect': {on_error!r}")
+    if on_error == "collect" and output != "dict":
+        raise ValueError("`on_error='collect'` requires `output='dict'`")
+
+
+def _check_output(output: str, dtype: str) -> None:
+    """Validate ``output``/``dtype`` before any PaDEL work is started."""
+    if output not in ("dict", "array", "bits", "sparse", "dataframe"):
+        raise ValueError(
+            "`output` must be 'dict', 'array', 'bits', 'sparse' or 'dataframe':"
+            f" {output!r}"
+        )
+    if output in ("array", "sparse"):
+        _float_dtype(dtype)
+    if output == "bits":
+        _require_numpy()
+    if output == "sparse":
+        _require_scipy()
+    if output == "dataframe":
+        _check_frame_options(dtype, "uint8")
+
+
+def _check_fingerprint_output(output: str, options: dict) -> None:
+    if output in ("bits", "sparse") and not options["fingerprints"]:
+        raise ValueError(
+            f"`output={output!r}` requires fingerprints (`fingerprints=...` or"
+            " `mode='fingerprints'`)"
+        )
+
+
+def _array_reader(output: str, dtype: str):
+    """CSV reader returning ``(names, result)`` for the array fast paths."""
+    if output == "bits":
+        return _read_csv_bits
+    if output == "sparse":
+        return partial(_read_csv_counts, dtype=dtype)
+    if output == "dataframe":
+        return partial(_read_frame, dtype=dtype)
+    return partial(read_csv_array, dtype=dtype)
+
+
+def _read_mol_records(mol_file: str) -> list:
+    """Split an MDL/SDF file into molblock records (``$$$$`` excluded)."""
+    return list(_iter_mol_records(mol_file))
+
+
+def _write_mol_records(mol_file: str, records: list) -> None:
+    """Write molblock records as an SDF-style file."""
+    with open(mol_file, "w", encoding="utf-8", errors="surrogateescape") as handle:
+        for record in records:
+            handle.write(record)
+            handle.write("$$$$\n")
+
+
+def _rows_with_cache(cache, molecules: list, options: dict, compute) -> list:
+    """Answer rows from ``cache``, computing only the misses via ``compute``.
+
+    ``compute`` maps a list of molecule texts to raw PaDEL rows. Calculated
+    rows are stored; rows PaDEL left empty are returned but never cached.
+    """
+    keys = cache.keys(molecules, options)
+    found = cache.get_many(keys)
+    missing = [idx for idx, key in enumerate(keys) if key not in found]
+
+    computed = {}
+    if missing:
+        miss_rows = compute([molecules[idx] for idx in missing])
+        if len(miss_rows) != len(missing):
+            raise RuntimeError(
+                "PaDEL-Descriptor failed on one or more mols."
+                " Ensure the input structures are correct."
+            )
+        computed = dict(zip(missing, miss_rows, strict=True))
+        cache.put_many(
+            {
+                keys[idx]: row
+                for idx, row in computed.items()
+                if any(value for name, value in row.items() if name != "Name")
+            }
+        )
+
+    return [
+        computed[idx] if idx in computed else dict(found[key])
+        for idx, key in enumerate(keys)
+    ]
+
+
+def _molblock_key(record: str) -> str:
+    """Connection table of a molblock record, the identity used by ``dedup``.
+
+    The three header lines (title, program/timestamp, comment) and SDF data
+    fields after ``M  END`` are ignored, as is trailing whitespace.
+    """
+    table = []
+    for line in record.splitlines()[3:]:
+        table.append(line.rstrip())
+        if line.startswith("M  END"):
+            break
+    return "\n".join(table)
+
+
+def _distinct(molecules: list, key=None) -> tuple:
+    """Return the first occurrence of each distinct molecule, in input order,
+    and for every input position the index of its distinct molecule.
+
+    ``key`` maps a molecule to its identity (default: the text itself). The
+    number of duplicates dropped is reported as the ``"duplicates"`` count.
+    """
+    slots = {}
+    unique, positions = [], []
+    for molecule in molecules:
+        identity = molecule if key is None else key(molecule)
+        if identity not in slots:
+            slots[identity] = len(unique)
+            unique.append(molecule)
+        positions.append(slots[identity])
+    _count("duplicates", len(molecules) - len(unique))
+    return unique, positions
+
+
+def _fan_out(rows: list, positions: list) -> list:
+    """Copy each distinct molecule's row to every position it occurs at."""
+    return [None if rows[pos] is None else dict(rows[pos]) for pos in positions]
+
+
+def _fan_out_result(
+    result: IsolatedResult, molecules: list, positions: list
+) -> IsolatedResult:
+    """Expand an isolated result over distinct molecules back to the input."""
+    failures = {error.index: error for error in result.errors}
+    errors = [
+        failures[pos]._replace(index=idx, molecule=molecules[idx])
+        for idx, pos in enumerate(positions)
+        if pos in failures
+    ]
+    return IsolatedResult(_fan_out(result.rows, positions), errors)
+
+
+def _rows_deduplicated(molecules: list, compute, key=None) -> list:
+    """Run ``compute`` on the distinct molecules only and fan the rows out."""
+    unique, positions = _distinct(molecules, key)
+    rows = compute(unique)
+    if len(rows) != len(unique):
         raise RuntimeError(
-            "PaDEL-Descriptor CSV is not valid UTF-8: "
-            f"{csv_path}. Re-export or convert the file to UTF-8."
-        ) from exc
+            "PaDEL-Descriptor failed on one or more mols."
+            " Ensure the input structures are correct."
+        )
+    return _fan_out(rows, positions)
+
+
+def _rows_in_halves(molecules: list, compute, output_csv: str = None) -> list:
+    """Rows for a batch whose PaDEL run timed out, computed half at a time.
+
+    ``compute`` maps a list of molecules to raw PaDEL rows. A half that times
+    out again is split again, down to single molecules; a single molecule
+    that times out raises. Each split is reported as the ``"splits"`` count,
+    and the joined rows are written to ``output_csv`` if given.
+    """
+    _count("splits")
+    middle = len(molecules) // 2
+    rows = []
+    for half in (molecules[:middle], molecules[middle:]):
+        try:
+            rows.extend(compute(half))
+        except RuntimeError as exc:
+            if not _timed_out(exc, half):
+                raise
+            rows.extend(_rows_in_halves(half, compute))
+    if output_csv is not None:
+        _write_padel_csv_rows(output_csv, rows)
+    return rows
+
+
+def _rows_splitting_timeouts(molecules: list, compute) -> list:
+    """``compute(molecules)``, split by ``_rows_in_halves`` if the run times out."""
+    try:
+        return compute(molecules)
+    except RuntimeError as exc:
+        if not _timed_out(exc, molecules):
+            raise
+    return _rows_in_halves(molecules, compute)
 
 
+def _smiles_rows(
+    smiles: list,
+    options: dict,
+    output_csv: str = None,
+    coalescer=None,
+    cache=None,
+    attempts: int = 3,
+    dedup: bool = False,
+) -> list:
+    """Raw PaDEL rows for ``smiles``, honouring the coalescer/cache/dedup options."""
+    if coalescer is None and cache is None and not dedup:
+        return _compute_smiles_rows(smiles, options, output_csv, attempts)
+
+    def _compute(batch: list) -> list:
+        if coalescer is not None:
+            return coalescer.submit_smiles(batch, options, attempts).result()
+        return _compute_smiles_rows(batch, options, attempts=attempts)
+
+    def _cached(batch: list) -> list:
+        if cache is None:
+            return _compute(batch)
+        return _rows_with_cache(cache, batch, options, _compute)
+
+    if dedup:
+        rows = _rows_deduplicated(smiles, _cached)
+    else:
+        rows = _cached(smiles)
+    if output_csv is not None:
+        _write_padel_csv_rows(output_csv, rows)
+    return rows
+
+
+def _file_rows(
+    mol_file: str,
+    options: dict,
+    output_csv: str = None,
+    coalescer=None,
+    cache=None,
+    dedup: bool = False,
+) -> list:
+    """Raw PaDEL rows for an MDL/SDF file, honouring coalescer/cache/dedup options."""
+    if coalescer is None and cache is None and not dedup:
+        return _compute_file_rows(mol_file, options, output_csv)
+
+    suffix = splitext(mol_file)[1]
+
+    def _compute(records: list) -> list:
+        if coalescer is None:
+            return _compute_records_rows(records, options, suffix)
+        with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+            path = join(tmpdir, f"input{suffix}")
+            _write_mol_records(path, records)
+            return coalescer.submit_file(path, options).result()
+
+    def _cached(records: list) -> list:
+        if cache is None:
+            return _compute(records)
+        return _rows_with_cache(cache, records, options, _compute)
+
+    if dedup:
+        records = _read_mol_records(mol_file)
+        rows = _rows_deduplicated(records, _cached, _molblock_key)
+    elif cache is not None:
+        rows = _cached(_read_mol_records(mol_file))
+    else:
+        rows = coalescer.submit_file(mol_file, options).result()
+    if output_csv is not None:
+        _write_padel_csv_rows(output_csv, rows)
+    return rows
+
+
+def _check_smiles_count(smiles, n_rows: int) -> None:
+    if isinstance(smiles, list) and n_rows != len(smiles):
+        raise RuntimeError(
+            "PaDEL-Descriptor failed on one or more mols."
+            " Ensure the input structures are correct."
+        )
+    elif isinstance(smiles, str) and n_rows == 0:
+        raise RuntimeError(
+            f"PaDEL-Descriptor failed on {smiles}. Ensure input structure is correct."
+        )
+
+
+def _check_file_count(n_rows: int) -> None:
+    if n_rows == 0:
+        raise RuntimeError(
+            "PaDEL-Descriptor returned no calculated values."
+            + " Ensure the input structure is correct."
+        )
+
+
+def _smiles_result(smiles, rows: list, output: str, dtype: str):
+    """Validate raw rows for ``smiles`` (str or list) and shape the result."""
+    smiles_list = [smiles] if isinstance(smiles, str) else smiles
+    _check_smiles_count(smiles, len(rows))
+
+    for idx, r in enumerate(rows):
+        if len(r) == 0:
+            raise RuntimeError(
+                f"PaDEL-Descriptor failed on {smiles_list[idx]}."
+                " Ensure input structure is correct."
+            )
+
+    for idx in range(len(rows)):
+        del rows[idx]["Name"]
+
+    if output == "array":
+        return _rows_to_array(rows, dtype)
+    if output == "bits":
+        return pack_fingerprints(rows)
+    if output == "sparse":
+        return sparse_counts(rows, dtype)
+    if output == "dataframe":
+        return _rows_to_frame(rows, dtype)
+    if isinstance(smiles, str):
+        return rows[0]
+    return rows
+
+
+def _file_result(rows: list, output: str, dtype: str):
+    """Validate raw rows for an MDL/SDF file and shape the result."""
+    _check_file_count(len(rows))
+    for row in rows:
+        del row["Name"]
+
+    if output == "array":
+        return _rows_to_array(rows, dtype)
+    if output == "bits":
+        return pack_fingerprints(rows)
+    if output == "sparse":
+        return sparse_counts(rows, dtype)
+    if output == "dataframe":
+        return _rows_to_frame(rows, dtype)
+    return rows
+
+
+@_timed_call
 def from_smiles(
     smiles,
     output_csv: str = None,
-    descriptors: bool = True,
-    fingerprints: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
     timeout: int = 60,
     maxruntime: int = -1,
     threads: int = -1,
+    coalescer=None,
+    cache=None,
+    output: str = "dict",
+    dtype: str = "float64",
+    on_error: str = "raise",
+    mode: str = None,
+    dedup: bool = False,
+    jvm: JVMOptions = None,
 ) -> OrderedDict:
     """Convert SMILES to QSPR descriptors and/or fingerprints via PaDEL.
 
@@ -58,101 +596,153 @@ def from_smiles(
         SMILES for one molecule, or a list of SMILES strings.
     output_csv : str, optional
         If supplied, also write descriptors to this CSV path.
-    descriptors : bool, default True
-        If True, calculate descriptors.
-    fingerprints : bool, default False
-        If True, calculate fingerprints.
-    timeout : int, default 60
-        Maximum subprocess time in seconds.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, or a policy that sets it for
+        each PaDEL run from the number of molecules in it, such as
+        :class:`~padelpy.timeouts.ScaledTimeout` or
+        :class:`~padelpy.timeouts.Deadline`. A run of several molecules
+        that times out is split in half and each half rerun, rather than
+        retried at the same size; each split is reported as the
+        ``"splits"`` count of :mod:`padelpy.instrument`.
     maxruntime : int, default -1
         Maximum running time per molecule in seconds (``-1`` = unlimited).
     threads : int, default -1
         Worker threads (``-1`` = use all available).
+    coalescer : BatchCoalescer, optional
+        If supplied, queue the calculation on this
+        :class:`~padelpy.coalescer.BatchCoalescer`, which may share one PaDEL
+        run with concurrent calls that use the same options.
+    cache : DescriptorCache, optional
+        If supplied, answer previously calculated molecules from this cache
+        and send only cache misses to PaDEL.
+    output : {"dict", "array", "bits", "sparse", "dataframe"}, default "dict"
+        ``"array"`` returns a :class:`~padelpy.arrays.DescriptorArray`: one
+        shared column list and a 2-D NumPy array (requires NumPy).
+        ``"bits"`` returns the binary fingerprint columns only, packed as
+        :class:`~padelpy.fingerprints.PackedFingerprints` (requires NumPy
+        and fingerprints; ``mode="fingerprints"`` skips the descriptors).
+        ``"sparse"`` returns the count fingerprint columns only, as a SciPy
+        CSR matrix in :class:`~padelpy.fingerprints.CountFingerprints`
+        (requires SciPy and a count fingerprint class in ``fingerprints``).
+        ``"dataframe"`` returns a pandas DataFrame read straight from
+        PaDEL's CSV, with fingerprint bits as ``uint8``, whole-number
+        columns as the smallest integer dtype that holds them and the rest
+        as ``dtype`` (requires pandas; see
+        :func:`~padelpy.frames.read_csv_dataframe`).
+    dtype : str, default "float64"
+        Floating-point dtype of the array when ``output="array"``,
+        ``"sparse"`` or ``"dataframe"``.
+    on_error : {"raise", "collect"}, default "raise"
+        ``"raise"`` fails the whole call if any molecule fails. ``"collect"``
+        keeps every successful row and returns an
+        :class:`~padelpy.isolation.IsolatedResult` with a per-molecule status
+        (``"ok"``, ``"empty"``, ``"timeout"`` or ``"parse_failure"``); failing
+        batches are split until the failures are isolated. ``output_csv``
+        then receives the successful rows only.
+    mode : {"2d", "3d", "fingerprints"}, optional
+        Calculate only what the mode needs: ``"2d"`` skips 3-D conversion and
+        3-D descriptors, ``"fingerprints"`` calculates fingerprints only (no
+        3-D conversion, ``descriptors`` ignored), and ``"3d"`` converts to
+        3-D and calculates both. The default matches ``"3d"``.
+    dedup : bool, default False
+        If True, send each distinct SMILES string to PaDEL once and copy its
+        values to every position it occurs at. Strings are compared as
+        given (no canonicalization). The number of duplicates skipped is
+        reported as the ``"duplicates"`` count of :mod:`padelpy.instrument`.
+    jvm : JVMOptions, optional
+        How to start the Java virtual machine for each PaDEL run (see
+        :class:`~padelpy.jvm.JVMOptions`). Defaults to the options set with
+        :func:`~padelpy.jvm.set_default_jvm` in this process.
 
     Returns
     -------
-    dict or list of dict
+    dict or list of dict or DescriptorArray or IsolatedResult
         Mapping of labels to values for a single SMILES, or a list of such
-        mappings when ``smiles`` is a list.
+        mappings when ``smiles`` is a list. With ``output="array"``, a
+        :class:`~padelpy.arrays.DescriptorArray` with one row per SMILES
+        (likewise a ``PackedFingerprints``, ``CountFingerprints`` or
+        ``DataFrame`` with ``"bits"``, ``"sparse"`` or ``"dataframe"``).
+        With ``on_error="collect"``, an
+        :class:`~padelpy.isolation.IsolatedResult` aligned with the input.
     """
-    # unit conversion for maximum running time per molecule
-    # seconds -> milliseconds
-    if maxruntime != -1:
-        maxruntime = maxruntime * 1000
-
     if isinstance(smiles, str):
-        smiles_text = smiles
+        smiles_list = [smiles]
     elif isinstance(smiles, list):
-        smiles_text = "\n".join(smiles)
+        smiles_list = smiles
     else:
         raise RuntimeError(f"Unknown input format for `smiles`: {type(smiles)}")
+    _check_output(output, dtype)
+    _check_on_error(on_error, output)
+    if mode == "existing3d":
+        raise ValueError("mode='existing3d' needs 3D input; SMILES have no coordinates")
 
-    save_csv = output_csv is not None
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, mode, jvm
+    )
+    _check_fingerprint_output(output, options)
 
-    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
-        smi_path = join(tmpdir, "input.smi")
-        with open(smi_path, "w", encoding="utf-8") as smi_file:
-            smi_file.write(smiles_text)
-
-        csv_path = output_csv if save_csv else join(tmpdir, "descriptors.csv")
-
-        for attempt in range(3):
-            try:
-                padeldescriptor(
-                    mol_dir=smi_path,
-                    d_file=csv_path,
-                    convert3d=True,
-                    retain3d=True,
-                    d_2d=descriptors,
-                    d_3d=descriptors,
-                    fingerprints=fingerprints,
-                    sp_timeout=timeout,
-                    retainorder=True,
-                    maxruntime=maxruntime,
-                    threads=threads,
-                )
-                break
-            except RuntimeError as exception:
-                if attempt == 2:
-                    raise RuntimeError(exception) from exception
-                continue
-
-        rows = _read_padel_csv_rows(csv_path)
-
-        if isinstance(smiles, list) and len(rows) != len(smiles):
-            raise RuntimeError(
-                "PaDEL-Descriptor failed on one or more mols."
-                " Ensure the input structures are correct."
-            )
-        elif isinstance(smiles, str) and len(rows) == 0:
-            raise RuntimeError(
-                f"PaDEL-Descriptor failed on {smiles}."
-                " Ensure input structure is correct."
+    if on_error == "collect":
+        # failures are isolated among distinct SMILES, then fanned out
+        unique = smiles_list
+        if dedup:
+            unique, positions = _distinct(smiles_list)
+        result = _bisect(
+            unique,
+            lambda batch: _smiles_rows(
+                batch, options, coalescer=coalescer, cache=cache, attempts=1
+            ),
+        )
+        if dedup:
+            result = _fan_out_result(result, smiles_list, positions)
+        if output_csv is not None:
+            _write_padel_csv_rows(
+                output_csv, [row for row in result.rows if row is not None]
             )
+        return _strip_names(result)
 
-        for idx, r in enumerate(rows):
-            if len(r) == 0:
-                raise RuntimeError(
-                    f"PaDEL-Descriptor failed on {smiles[idx]}."
-                    " Ensure input structure is correct."
-                )
-
-        for idx in range(len(rows)):
-            del rows[idx]["Name"]
+    def _rows(batch: list, output_csv: str = None) -> list:
+        return _smiles_rows(batch, options, output_csv, coalescer, cache, dedup=dedup)
 
-        if isinstance(smiles, str):
-            return rows[0]
-        return rows
+    try:
+        if output != "dict" and coalescer is None and cache is None and not dedup:
+            # PaDEL's CSV goes straight into a NumPy matrix, without row dicts
+            names, array = _compute_smiles_rows(
+                smiles_list, options, output_csv, read=_array_reader(output, dtype)
+            )
+            _check_smiles_count(smiles, len(names))
+            return array
+        rows = _rows(smiles_list, output_csv)
+    except RuntimeError as exc:
+        if not _timed_out(exc, smiles_list):
+            raise
+        rows = _rows_in_halves(smiles_list, _rows, output_csv)
+    return _smiles_result(smiles, rows, output, dtype)
 
 
+@_timed_call
 def from_mdl(
     mdl_file: str,
     output_csv: str = None,
-    descriptors: bool = True,
-    fingerprints: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
     timeout: int = 60,
     maxruntime: int = -1,
     threads: int = -1,
+    coalescer=None,
+    cache=None,
+    output: str = "dict",
+    dtype: str = "float64",
+    mode: str = None,
+    dedup: bool = False,
+    jvm: JVMOptions = None,
 ) -> list:
     """Convert an MDL MolFile to QSPR descriptors and/or fingerprints.
 
@@ -164,21 +754,73 @@ def from_mdl(
         Path to an MDL file (``.mdl`` extension required).
     output_csv : str, optional
         If supplied, also write descriptors/fingerprints to this CSV path.
-    descriptors : bool, default True
-        If True, calculate descriptors.
-    fingerprints : bool, default False
-        If True, calculate fingerprints.
-    timeout : int, default 60
-        Maximum subprocess time in seconds.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, or a policy that sets it for
+        each PaDEL run from the number of molecules in it, such as
+        :class:`~padelpy.timeouts.ScaledTimeout` or
+        :class:`~padelpy.timeouts.Deadline`. A run of several molecules
+        that times out is split in half and each half rerun, rather than
+        retried at the same size; each split is reported as the
+        ``"splits"`` count of :mod:`padelpy.instrument`.
     maxruntime : int, default -1
         Maximum running time per molecule in seconds (``-1`` = unlimited).
     threads : int, default -1
         Worker threads (``-1`` = use all available).
+    coalescer : BatchCoalescer, optional
+        If supplied, queue the calculation on this
+        :class:`~padelpy.coalescer.BatchCoalescer`, which may share one PaDEL
+        run with concurrent calls that use the same options.
+    cache : DescriptorCache, optional
+        If supplied, answer previously calculated molecules from this cache
+        and send only cache misses to PaDEL.
+    output : {"dict", "array", "bits", "sparse", "dataframe"}, default "dict"
+        ``"array"`` returns a :class:`~padelpy.arrays.DescriptorArray`: one
+        shared column list and a 2-D NumPy array (requires NumPy).
+        ``"bits"`` returns the binary fingerprint columns only, packed as
+        :class:`~padelpy.fingerprints.PackedFingerprints` (requires NumPy
+        and fingerprints; ``mode="fingerprints"`` skips the descriptors).
+        ``"sparse"`` returns the count fingerprint columns only, as a SciPy
+        CSR matrix in :class:`~padelpy.fingerprints.CountFingerprints`
+        (requires SciPy and a count fingerprint class in ``fingerprints``).
+        ``"dataframe"`` returns a pandas DataFrame read straight from
+        PaDEL's CSV, with fingerprint bits as ``uint8``, whole-number
+        columns as the smallest integer dtype that holds them and the rest
+        as ``dtype`` (requires pandas; see
+        :func:`~padelpy.frames.read_csv_dataframe`).
+    dtype : str, default "float64"
+        Floating-point dtype of the array when ``output="array"``,
+        ``"sparse"`` or ``"dataframe"``.
+    mode : {"2d", "3d", "existing3d", "fingerprints"}, optional
+        Calculate only what the mode needs: ``"2d"`` skips 3-D conversion and
+        3-D descriptors, ``"fingerprints"`` calculates fingerprints only (no
+        3-D conversion, ``descriptors`` ignored), ``"existing3d"`` calculates
+        3-D descriptors from the file's own coordinates without
+        re-embedding, and ``"3d"`` converts to 3-D and calculates both. The
+        default matches ``"3d"``.
+    dedup : bool, default False
+        If True, calculate each distinct structure once and copy its values
+        to every compound with the same connection table (molblock titles,
+        header lines and SDF data fields are ignored). The number of
+        duplicates skipped is reported as the ``"duplicates"`` count of
+        :mod:`padelpy.instrument`.
+    jvm : JVMOptions, optional
+        How to start the Java virtual machine for each PaDEL run (see
+        :class:`~padelpy.jvm.JVMOptions`). Defaults to the options set with
+        :func:`~padelpy.jvm.set_default_jvm` in this process.
 
     Returns
     -------
-    list of dict
-        One mapping per compound, in file order.
+    list of dict or DescriptorArray or PackedFingerprints or CountFingerprints
+        One mapping per compound, in file order (or one row per compound
+        with ``output="array"``, ``"bits"``, ``"sparse"`` or ``"dataframe"``).
     """
 
     is_mdl = compile(r".*\.mdl$", IGNORECASE)
@@ -193,18 +835,33 @@ def from_mdl(
         timeout=timeout,
         maxruntime=maxruntime,
         threads=threads,
+        coalescer=coalescer,
+        cache=cache,
+        output=output,
+        dtype=dtype,
+        mode=mode,
+        dedup=dedup,
+        jvm=jvm,
     )
     return rows
 
 
+@_timed_call
 def from_sdf(
     sdf_file: str,
     output_csv: str = None,
-    descriptors: bool = True,
-    fingerprints: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
     timeout: int = 60,
     maxruntime: int = -1,
     threads: int = -1,
+    coalescer=None,
+    cache=None,
+    output: str = "dict",
+    dtype: str = "float64",
+    mode: str = None,
+    dedup: bool = False,
+    jvm: JVMOptions = None,
 ) -> list:
     """Convert an SDF file to QSPR descriptors and/or fingerprints.
 
@@ -216,21 +873,73 @@ def from_sdf(
         Path to an SDF file (``.sdf`` extension required).
     output_csv : str, optional
         If supplied, also write descriptors/fingerprints to this CSV path.
-    descriptors : bool, default True
-        If True, calculate descriptors.
-    fingerprints : bool, default False
-        If True, calculate fingerprints.
-    timeout : int, default 60
-        Maximum subprocess time in seconds.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, or a policy that sets it for
+        each PaDEL run from the number of molecules in it, such as
+        :class:`~padelpy.timeouts.ScaledTimeout` or
+        :class:`~padelpy.timeouts.Deadline`. A run of several molecules
+        that times out is split in half and each half rerun, rather than
+        retried at the same size; each split is reported as the
+        ``"splits"`` count of :mod:`padelpy.instrument`.
     maxruntime : int, default -1
         Maximum running time per molecule in seconds (``-1`` = unlimited).
     threads : int, default -1
         Worker threads (``-1`` = use all available).
+    coalescer : BatchCoalescer, optional
+        If supplied, queue the calculation on this
+        :class:`~padelpy.coalescer.BatchCoalescer`, which may share one PaDEL
+        run with concurrent calls that use the same options.
+    cache : DescriptorCache, optional
+        If supplied, answer previously calculated molecules from this cache
+        and send only cache misses to PaDEL.
+    output : {"dict", "array", "bits", "sparse", "dataframe"}, default "dict"
+        ``"array"`` returns a :class:`~padelpy.arrays.DescriptorArray`: one
+        shared column list and a 2-D NumPy array (requires NumPy).
+        ``"bits"`` returns the binary fingerprint columns only, packed as
+        :class:`~padelpy.fingerprints.PackedFingerprints` (requires NumPy
+        and fingerprints; ``mode="fingerprints"`` skips the descriptors).
+        ``"sparse"`` returns the count fingerprint columns only, as a SciPy
+        CSR matrix in :class:`~padelpy.fingerprints.CountFingerprints`
+        (requires SciPy and a count fingerprint class in ``fingerprints``).
+        ``"dataframe"`` returns a pandas DataFrame read straight from
+        PaDEL's CSV, with fingerprint bits as ``uint8``, whole-number
+        columns as the smallest integer dtype that holds them and the rest
+        as ``dtype`` (requires pandas; see
+        :func:`~padelpy.frames.read_csv_dataframe`).
+    dtype : str, default "float64"
+        Floating-point dtype of the array when ``output="array"``,
+        ``"sparse"`` or ``"dataframe"``.
+    mode : {"2d", "3d", "existing3d", "fingerprints"}, optional
+        Calculate only what the mode needs: ``"2d"`` skips 3-D conversion and
+        3-D descriptors, ``"fingerprints"`` calculates fingerprints only (no
+        3-D conversion, ``descriptors`` ignored), ``"existing3d"`` calculates
+        3-D descriptors from the file's own coordinates without
+        re-embedding, and ``"3d"`` converts to 3-D and calculates both. The
+        default matches ``"3d"``.
+    dedup : bool, default False
+        If True, calculate each distinct structure once and copy its values
+        to every compound with the same connection table (molblock titles,
+        header lines and SDF data fields are ignored). The number of
+        duplicates skipped is reported as the ``"duplicates"`` count of
+        :mod:`padelpy.instrument`.
+    jvm : JVMOptions, optional
+        How to start the Java virtual machine for each PaDEL run (see
+        :class:`~padelpy.jvm.JVMOptions`). Defaults to the options set with
+        :func:`~padelpy.jvm.set_default_jvm` in this process.
 
     Returns
     -------
-    list of dict
-        One mapping per compound, in file order.
+    list of dict or DescriptorArray or PackedFingerprints or CountFingerprints
+        One mapping per compound, in file order (or one row per compound
+        with ``output="array"``, ``"bits"``, ``"sparse"`` or ``"dataframe"``).
     """
 
     is_sdf = compile(r".*\.sdf$", IGNORECASE)
@@ -245,6 +954,13 @@ def from_sdf(
         timeout=timeout,
         maxruntime=maxruntime,
         threads=threads,
+        coalescer=coalescer,
+        cache=cache,
+        output=output,
+        dtype=dtype,
+        mode=mode,
+        dedup=dedup,
+        jvm=jvm,
     )
     return rows
 
@@ -252,51 +968,152 @@ def from_sdf(
 def _from_mdl_lower(
     mol_file: str,
     output_csv: str = None,
-    descriptors: bool = True,
-    fingerprints: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
     timeout: int = 60,
     maxruntime: int = -1,
     threads: int = -1,
+    coalescer=None,
+    cache=None,
+    output: str = "dict",
+    dtype: str = "float64",
+    mode: str = None,
+    dedup: bool = False,
+    jvm: JVMOptions = None,
 ) -> list:
-    # unit conversion for maximum running time per molecule
-    # seconds -> milliseconds
-    if maxruntime != -1:
-        maxruntime = maxruntime * 1000
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, mode, jvm
+    )
 
-    save_csv = output_csv is not None
+    _check_output(output, dtype)
+    _check_fingerprint_output(output, options)
+    suffix = splitext(mol_file)[1]
 
-    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
-        csv_path = output_csv if save_csv else join(tmpdir, "descriptors.csv")
-
-        for attempt in range(3):
-            try:
-                padeldescriptor(
-                    maxruntime=maxruntime,
-                    mol_dir=mol_file,
-                    d_file=csv_path,
-                    convert3d=True,
-                    retain3d=True,
-                    retainorder=True,
-                    d_2d=descriptors,
-                    d_3d=descriptors,
-                    fingerprints=fingerprints,
-                    sp_timeout=timeout,
-                    threads=threads,
-                )
-                break
-            except RuntimeError as exception:
-                if attempt == 2:
-                    raise RuntimeError(exception) from exception
-                continue
-
-        rows = _read_padel_csv_rows(csv_path)
-
-        if len(rows) == 0:
-            raise RuntimeError(
-                "PaDEL-Descriptor returned no calculated values."
-                + " Ensure the input structure is correct."
+    def _records_rows(records: list) -> list:
+        with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+            path = join(tmpdir, f"input{suffix}")
+            _write_mol_records(path, records)
+            return _file_rows(path, options, None, coalescer, cache, dedup)
+
+    try:
+        if output != "dict" and coalescer is None and cache is None and not dedup:
+            names, array = _compute_file_rows(
+                mol_file, options, output_csv, read=_array_reader(output, dtype)
             )
-        for row in rows:
-            del row["Name"]
+            _check_file_count(len(names))
+            return array
+        rows = _file_rows(mol_file, options, output_csv, coalescer, cache, dedup)
+    except RuntimeError as exc:
+        # the file is only split into records once a run has timed out
+        timed_out = isinstance(exc, PaDELTimeoutError)
+        records = _read_mol_records(mol_file) if timed_out else []
+        if not _timed_out(exc, records):
+            raise
+        rows = _rows_in_halves(records, _records_rows, output_csv)
+    return _file_result(rows, output, dtype)
+
+
+def from_smiles_isolated(
+    smiles: list,
+    batch_size: int = None,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+) -> IsolatedResult:
+    """Calculate SMILES, isolating failures instead of failing the batch.
+
+    Unlike :func:`~padelpy.from_smiles`, a failing batch is not rerun three
+    times and then abandoned: it is split recursively until the offending
+    molecules are found, and every other molecule is calculated once.
 
-        return rows
+    Parameters
+    ----------
+    smiles : list of str
+        SMILES strings to calculate.
+    batch_size : int, optional
+        Initial number of SMILES per PaDEL run (default: all at once).
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per PaDEL run.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+
+    Returns
+    -------
+    IsolatedResult
+        ``rows`` aligned with ``smiles`` (``None`` for failures, ``Name``
+        removed) and ``errors``, one :class:`MoleculeError` per failure.
+    """
+    if not isinstance(smiles, list):
+        raise RuntimeError(f"Unknown input format for `smiles`: {type(smiles)}")
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    result = _bisect(
+        smiles,
+        lambda batch: _compute_smiles_rows(batch, options, attempts=1),
+        batch_size,
+    )
+    return _strip_names(result)
+
+
+def from_sdf_isolated(
+    sdf_file: str,
+    batch_size: int = None,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+) -> IsolatedResult:
+    """Calculate an SDF file, isolating failures instead of failing the batch.
+
+    Molecules are the ``$$$$``-delimited records of the file; failing batches
+    are split recursively as in :func:`from_smiles_isolated`.
+
+    Parameters
+    ----------
+    sdf_file : str
+        Path to an SDF file (``.sdf`` extension required).
+    batch_size : int, optional
+        Initial number of molecules per PaDEL run (default: all at once).
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per PaDEL run.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+
+    Returns
+    -------
+    IsolatedResult
+        ``rows`` aligned with the file's records (``None`` for failures) and
+        ``errors``, whose ``molecule`` field holds the failing molblock.
+    """
+    is_sdf = compile(r".*\.sdf$", IGNORECASE)
+    if is_sdf.match(sdf_file) is None:
+        raise ValueError(f"sdf file must have a `.sdf` extension: {sdf_file}")
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    result = _bisect(
+        _read_mol_records(sdf_file),
+        lambda batch: _compute_records_rows(batch, options, attempts=1),
+        batch_size,
+    )
+    return _strip_names(result)
@@ -0,0 +1,277 @@
+"""Fast, column-projected reading of PaDEL-Descriptor CSV output."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections.abc import Iterator
+from csv import reader
+from itertools import islice
+from operator import itemgetter
+
+# PaDELPy imports
+from .arrays import DescriptorArray, _cells_to_matrix, _float_dtype, _require_numpy
+from .instrument import _count, _stage
+
+__all__ = [
+    "iter_csv_arrays",
+    "read_csv_array",
+    "read_csv_rows",
+]
+
+_ENGINES = ("auto", "pyarrow", "numpy")
+
+
+def _not_utf8(csv_path: str) -> RuntimeError:
+    return RuntimeError(
+        "PaDEL-Descriptor CSV is not valid UTF-8: "
+        f"{csv_path}. Re-export or convert the file to UTF-8."
+    )
+
+
+def _read_header(csv_path: str) -> list:
+    try:
+        with open(csv_path, encoding="utf-8", newline="") as csv_file:
+            return next(reader(csv_file), [])
+    except UnicodeDecodeError as exc:
+        raise _not_utf8(csv_path) from exc
+
+
+def _projection(header: list, columns: list = None) -> list:
+    """Header positions of the descriptor columns to read (``Name`` excluded)."""
+    if columns is None:
+        return [idx for idx, name in enumerate(header) if name != "Name"]
+    positions = {name: idx for idx, name in enumerate(header)}
+    missing = [name for name in columns if name not in positions]
+    if missing:
+        raise ValueError(f"Columns not found in PaDEL output: {missing}")
+    return [positions[name] for name in columns]
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine not in _ENGINES:
+        raise ValueError(f"`engine` must be one of {_ENGINES}: {engine!r}")
+    if engine == "numpy":
+        return engine
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError as exc:
+        if engine == "pyarrow":
+            raise ImportError(
+                "pyarrow is required for engine='pyarrow'. "
+                "Install it with `pip install padelpy[arrow]`."
+            ) from exc
+        return "numpy"
+    return "pyarrow"
+
+
+def _picker(indices: list, width: int):
+    """Return ``row -> tuple of cells at indices``; short rows pad with ``""``."""
+    pick = itemgetter(*indices) if len(indices) > 1 else None
+
+    def _pick(row: list) -> tuple:
+        if len(row) >= width and pick is not None:
+            return pick(row)
+        return tuple(row[idx] if idx < len(row) else "" for idx in indices)
+
+    return _pick
+
+
+def _numpy_chunks(
+    csv_path: str, header: list, indices: list, chunksize: int, dtype, skip: int = 0
+) -> Iterator[tuple]:
+    """Parse with the C ``csv`` reader and convert each block with NumPy."""
+    columns = [header[idx] for idx in indices]
+    name_idx = header.index("Name") if "Name" in header else None
+    pick = _picker(indices, len(header))
+    try:
+        with open(csv_path, encoding="utf-8", newline="") as csv_file:
+            rows = (row for row in reader(csv_file) if row)
+            next(rows, None)
+            for _ in islice(rows, skip):
+                pass
+            while block := list(islice(rows, chunksize)):
+                names = [row[name_idx] if name_idx is not None else "" for row in block]
+                cells = [pick(row) for row in block]
+                values = _cells_to_matrix(cells, len(columns), dtype)
+                yield names, DescriptorArray(columns, values)
+    except UnicodeDecodeError as exc:
+        raise _not_utf8(csv_path) from exc
+
+
+def _rebatch(batches, chunksize: int):
+    """Regroup pyarrow record batches into tables of exactly ``chunksize`` rows."""
+    import pyarrow
+
+    pending, count = [], 0
+    for batch in batches:
+        pending.append(batch)
+        count += batch.num_rows
+        while count >= chunksize:
+            table = pyarrow.Table.from_batches(pending)
+            yield table.slice(0, chunksize)
+            rest = table.slice(chunksize)
+            pending, count = rest.to_batches(), rest.num_rows
+    if count:
+        yield pyarrow.Table.from_batches(pending)
+
+
+def _arrow_chunks(
+    csv_path: str, header: list, indices: list, chunksize: int, dtype
+) -> Iterator[tuple]:
+    """Parse and convert with pyarrow's multi-threaded CSV reader.
+
+    Cells pyarrow cannot parse as numbers (or invalid UTF-8) hand the rest of
+    the file to the NumPy engine, which applies PaDELPy's own conversion
+    rules and error contract.
+    """
+    import pyarrow
+    from pyarrow import csv as pacsv
+
+    np = _require_numpy()
+    columns = [header[idx] for idx in indices]
+    has_name = "Name" in header
+    column_types = {name: pyarrow.float64() for name in columns}
+    if has_name:
+        column_types["Name"] = pyarrow.string()
+    convert = pacsv.ConvertOptions(
+        column_types=column_types,
+        include_columns=(["Name"] if has_name else []) + columns,
+        strings_can_be_null=False,
+    )
+
+    done = 0
+    try:
+        if chunksize is None:
+            tables = [pacsv.read_csv(csv_path, convert_options=convert)]
+        else:
+            tables = _rebatch(
+                pacsv.open_csv(csv_path, convert_options=convert), chunksize
+            )
+        for table in tables:
+            values = np.empty((table.num_rows, len(columns)), dtype=dtype)
+            for position, name in enumerate(columns):
+                values[:, position] = table.column(name).to_numpy()
+            if has_name:
+                names = table.column("Name").to_pylist()
+            else:
+                names = [""] * table.num_rows
+            yield names, DescriptorArray(columns, values)
+            done += table.num_rows
+    except pyarrow.ArrowInvalid:
+        yield from _numpy_chunks(csv_path, header, indices, chunksize, dtype, done)
+
+
+def _chunks(csv_path, chunksize, columns, dtype, engine) -> Iterator[tuple]:
+    header = _read_header(csv_path)
+    indices = _projection(header, columns)
+    if _resolve_engine(engine) == "pyarrow":
+        return _arrow_chunks(csv_path, header, indices, chunksize, dtype)
+    return _numpy_chunks(csv_path, header, indices, chunksize, dtype)
+
+
+def read_csv_array(
+    csv_path: str,
+    columns: list = None,
+    dtype: str = "float64",
+    engine: str = "auto",
+) -> tuple:
+    """Read a PaDEL CSV straight into a NumPy matrix.
+
+    No per-row dicts or per-cell Python strings are kept: with pyarrow the
+    file is parsed and converted in native code; otherwise the C ``csv``
+    reader feeds one vectorized NumPy conversion. Empty or non-numeric cells
+    become NaN, as with ``output="array"``.
+
+    Parameters
+    ----------
+    csv_path : str
+        PaDEL output CSV (UTF-8).
+    columns : list of str, optional
+        Descriptor columns to read, in this order (default: every column
+        except ``Name``). Other columns are never converted.
+    dtype : str, default "float64"
+        Floating-point dtype of the matrix.
+    engine : {"auto", "pyarrow", "numpy"}, default "auto"
+        ``"auto"`` uses pyarrow when it is installed.
+
+    Returns
+    -------
+    tuple of (list of str, DescriptorArray)
+        Molecule names (PaDEL's ``Name`` column) and the descriptor matrix.
+
+    Raises
+    ------
+    RuntimeError
+        If the file is not valid UTF-8.
+    ValueError
+        If a requested column is not in the file.
+    """
+    np = _require_numpy()
+    dtype = _float_dtype(dtype)
+    with _stage("parse"):
+        chunks = list(_chunks(csv_path, None, columns, dtype, engine))
+    names = [name for chunk_names, _ in chunks for name in chunk_names]
+    _count("rows", len(names))
+    if len(chunks) == 1:
+        return names, chunks[0][1]
+    header = _read_header(csv_path)
+    out_columns = [header[idx] for idx in _projection(header, columns)]
+    if not chunks:
+        return names, DescriptorArray(
+            out_columns, np.empty((0, len(out_columns)), dtype=dtype)
+        )
+    values = np.concatenate([array.values for _, array in chunks])
+    return names, DescriptorArray(out_columns, values)
+
+
+def iter_csv_arrays(
+    csv_path: str,
+    chunksize: int = 10000,
+    columns: list = None,
+    dtype: str = "float64",
+    engine: str = "auto",
+) -> Iterator[tuple]:
+    """Read a PaDEL CSV in chunks of ``chunksize`` rows.
+
+    Memory use is bounded by the chunk size. Parameters are as for
+    :func:`read_csv_array`.
+
+    Returns
+    -------
+    iterator of tuple of (list of str, DescriptorArray)
+        Names and descriptor matrix for each chunk, in file order.
+    """
+    if chunksize < 1:
+        raise ValueError(f"`chunksize` must be at least 1: {chunksize}")
+    dtype = _float_dtype(dtype)
+    return _chunks(csv_path, chunksize, columns, dtype, engine)
+
+
+def read_csv_rows(csv_path: str, columns: list = None) -> list:
+    """Read a PaDEL CSV into row dicts, keeping only ``columns`` (stdlib only).
+
+    ``Name`` is always kept. Values stay strings, as with
+    :func:`~padelpy.from_smiles`; only the projected columns are stored.
+
+    Raises
+    ------
+    RuntimeError
+        If the file is not valid UTF-8.
+    ValueError
+        If a requested column is not in the file.
+    """
+    header = _read_header(csv_path)
+    indices = _projection(header, columns)
+    if "Name" in header:
+        indices = [header.index("Name"), *indices]
+    keys = [header[idx] for idx in indices]
+    pick = _picker(indices, len(header))
+    try:
+        with _stage("parse"), open(csv_path, encoding="utf-8", newline="") as csv_file:
+            rows = reader(csv_file)
+            next(rows, None)
+            out = [dict(zip(keys, pick(row), strict=True)) for row in rows if row]
+    except UnicodeDecodeError as exc:
+        raise _not_utf8(csv_path) from exc
+    _count("rows", len(out))
+    return out
@@ -0,0 +1,234 @@
+"""Stage-level timing and counters for PaDEL calls, reported to registered hooks."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from itertools import count
+from threading import Lock
+from time import perf_counter
+from typing import NamedTuple
+
+__all__ = [
+    "Event",
+    "Report",
+    "add_hook",
+    "instrument",
+    "remove_hook",
+]
+
+
+class Event(NamedTuple):
+    """One instrumentation record.
+
+    ``kind`` is ``"call"`` (wall time of a public entry point, ``value`` in
+    seconds), ``"stage"`` (wall time of one step such as ``"write_input"``,
+    ``"spawn"``, ``"padel"`` or ``"parse"``), ``"count"`` (``"molecules"``,
+    ``"rows"``, ``"retries"``, ``"timeouts"``, ``"duplicates"``,
+    ``"splits"``) or
+    ``"exit_code"`` (the PaDEL subprocess return code).
+
+    ``call`` numbers the outermost entry point call (``from_smiles``,
+    ``afrom_sdf``, ``padeldescriptor``...) the event happened in, so events
+    of concurrent calls can be told apart; it is ``None`` outside any call.
+    A run a coalescer merges from several calls counts as its own
+    ``padeldescriptor`` call.
+    """
+
+    kind: str
+    name: str
+    value: float
+    call: int | None = None
+
+
+# replaced, never mutated, so emitters can iterate without a lock
+_hooks: tuple = ()
+_hooks_lock = Lock()
+
+_DISABLED = nullcontext()
+
+# the running entry point call; copied into asyncio tasks and to_thread calls
+_call_id: ContextVar = ContextVar("padelpy_call_id", default=None)
+_call_ids = count(1)
+
+
+def add_hook(hook: Callable[[Event], None]) -> None:
+    """Call ``hook(event)`` for every :class:`Event` from now on.
+
+    Hooks run synchronously in the thread doing the work (including coalescer and
+    shard worker threads), so they should be cheap and thread-safe.
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Callable[[Event], None]) -> None:
+    """Unregister a hook added with :func:`add_hook`."""
+    global _hooks
+    with _hooks_lock:
+        remaining = list(_hooks)
+        remaining.remove(hook)
+        _hooks = tuple(remaining)
+
+
+def _emit(kind: str, name: str, value: float) -> None:
+    event = Event(kind, name, value, _call_id.get())
+    for hook in _hooks:
+        hook(event)
+
+
+class _Timer:
+    __slots__ = ("kind", "name", "began")
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.began = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        _emit(self.kind, self.name, perf_counter() - self.began)
+
+
+def _stage(name: str):
+    """Time a block as stage ``name``; a shared no-op when no hook is set."""
+    if not _hooks:
+        return _DISABLED
+    return _Timer("stage", name)
+
+
+def _count(name: str, value: int = 1) -> None:
+    if _hooks:
+        _emit("count", name, value)
+
+
+def _exit_code(code: int) -> None:
+    if _hooks:
+        _emit("exit_code", "padeldescriptor", code)
+
+
+@contextmanager
+def _call_scope() -> Iterator[None]:
+    """Give the events of the block a new call id, unless one is already set."""
+    if _call_id.get() is not None:
+        yield
+        return
+    token = _call_id.set(next(_call_ids))
+    try:
+        yield
+    finally:
+        _call_id.reset(token)
+
+
+def _timed_call(func):
+    """Report the wall time of each call to ``func`` as a ``"call"`` event.
+
+    ``func`` may be a coroutine function. Its events, and those of the calls
+    it makes, carry one call id (see :class:`Event`).
+    """
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def _async_wrapper(*args, **kwargs):
+            if not _hooks:
+                return await func(*args, **kwargs)
+            with _call_scope(), _Timer("call", func.__name__):
+                return await func(*args, **kwargs)
+
+        return _async_wrapper
+
+    @wraps(func)
+    def _wrapper(*args, **kwargs):
+        if not _hooks:
+            return func(*args, **kwargs)
+        with _call_scope(), _Timer("call", func.__name__):
+            return func(*args, **kwargs)
+
+    return _wrapper
+
+
+class Report:
+    """Hook that accumulates events; see :func:`instrument`.
+
+    Attributes
+    ----------
+    events : list of Event
+        Every event received, in arrival order.
+    """
+
+    def __init__(self) -> None:
+        self.events = []
+        self._lock = Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def _total(self, kind: str) -> dict:
+        totals = {}
+        for event in list(self.events):
+            if event.kind == kind:
+                totals[event.name] = totals.get(event.name, 0) + event.value
+        return totals
+
+    @property
+    def calls(self) -> dict:
+        """Total seconds per entry point (``from_smiles``, ``padeldescriptor``...)."""
+        return self._total("call")
+
+    @property
+    def stages(self) -> dict:
+        """Total seconds per stage."""
+        return self._total("stage")
+
+    @property
+    def counts(self) -> dict:
+        """Summed counters (molecules, rows, retries, timeouts, duplicates, splits)."""
+        return self._total("count")
+
+    @property
+    def exit_codes(self) -> list:
+        """Return codes of the PaDEL subprocesses, in completion order."""
+        return [event.value for event in list(self.events) if event.kind == "exit_code"]
+
+    @property
+    def by_call(self) -> dict:
+        """One :class:`Report` per call id (see :class:`Event`), in order of arrival.
+
+        Events recorded outside any entry point call are under ``None``.
+        """
+        reports = {}
+        for event in list(self.events):
+            if event.call not in reports:
+                reports[event.call] = Report()
+            reports[event.call].events.append(event)
+        return reports
+
+
+@contextmanager
+def instrument() -> Iterator[Report]:
+    """Collect instrumentation events while the block runs.
+
+    Events from every thread are collected, so concurrent calls made outside
+    the block while it is active are included too; :attr:`Report.by_call`
+    separates them.
+
+    Examples
+    --------
+    >>> with instrument() as report:  # doctest: +SKIP
+    ...     from_smiles(["CCC", "CCO"])
+    >>> report.stages  # doctest: +SKIP
+    {'write_input': 0.0002, 'spawn': 0.003, 'padel': 2.1, 'parse': 0.001}
+    """
+    report = Report()
+    add_hook(report)
+    try:
+        yield report
+    finally:
+        remove_hook(report)
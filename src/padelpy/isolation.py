@@ -0,0 +1,158 @@
+"""Failure isolation: bisect failing PaDEL batches down to the offending molecules.
+
+This module holds the bisection engine and its result types; the
+``from_*_isolated`` entry points live in :mod:`padelpy.functions`.
+"""
+
+from __future__ import annotations
+
+# stdlib. imports
+from typing import NamedTuple
+
+# PaDELPy imports
+from .wrapper import PaDELTimeoutError
+
+__all__ = [
+    "STATUS_EMPTY",
+    "STATUS_OK",
+    "STATUS_PARSE_FAILURE",
+    "STATUS_TIMEOUT",
+    "IsolatedResult",
+    "MoleculeError",
+]
+
+
+# per-molecule statuses reported by IsolatedResult.status
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_TIMEOUT = "timeout"
+STATUS_PARSE_FAILURE = "parse_failure"
+
+
+class MoleculeError(NamedTuple):
+    """A molecule PaDEL could not calculate, identified by input position.
+
+    ``status`` is ``"empty"`` (PaDEL wrote a row without values),
+    ``"timeout"`` (the subprocess timed out on the molecule alone, or a
+    :class:`~padelpy.timeouts.Deadline` passed before it could run) or
+    ``"parse_failure"`` (PaDEL rejected the structure). A molecule PaDEL
+    gave up on after ``maxruntime`` is ``"empty"``: its row cannot be told
+    apart from other rows without values.
+    """
+
+    index: int
+    molecule: str
+    status: str
+    message: str
+
+
+class IsolatedResult(NamedTuple):
+    """Rows aligned with the input (``None`` where a molecule failed) and errors.
+
+    ``errors`` is ordered by input index.
+    """
+
+    rows: list
+    errors: list
+
+    @property
+    def failed(self) -> list:
+        """Input indices of the molecules that failed."""
+        return [error.index for error in self.errors]
+
+    @property
+    def status(self) -> list:
+        """Per-input status: ``"ok"`` or the failing molecule's status."""
+        statuses = [STATUS_OK] * len(self.rows)
+        for error in self.errors:
+            statuses[error.index] = error.status
+        return statuses
+
+
+def _has_values(row: dict) -> bool:
+    return any(value for name, value in row.items() if name != "Name")
+
+
+def _bisect(molecules: list, compute, batch_size: int = None) -> IsolatedResult:
+    """Calculate ``molecules``, splitting failing batches in half until the
+    failures are pinned to single molecules.
+
+    ``compute`` maps a list of molecule texts to raw PaDEL rows in a single
+    attempt. A batch that raises, or returns the wrong number of rows, is
+    split and each half retried; a batch with the right number of rows keeps
+    its good rows and marks rows without values as failed directly. Every
+    molecule in a batch that succeeds is therefore calculated only once.
+    Rows keep PaDEL's ``Name`` column.
+
+    A row without values is reported as ``"empty"``, even with a
+    ``maxruntime`` set: PaDEL's output does not say whether it gave up on the
+    molecule or could not calculate it, so ``"timeout"`` is kept for runs
+    that confirmably timed out. When ``compute`` raises ``TimeoutError`` (a
+    :class:`~padelpy.timeouts.Deadline` has passed), the whole batch is
+    marked ``"timeout"`` without splitting it.
+    """
+    rows = [None] * len(molecules)
+    errors = []
+    step = batch_size or max(len(molecules), 1)
+    pending = [
+        list(range(start, min(start + step, len(molecules))))
+        for start in range(0, len(molecules), step)
+    ]
+    pending.reverse()
+
+    while pending:
+        indices = pending.pop()
+        try:
+            batch_rows = compute([molecules[idx] for idx in indices])
+        except TimeoutError as exc:
+            # a Deadline passed before the run: splitting cannot help
+            errors.extend(
+                MoleculeError(idx, molecules[idx], STATUS_TIMEOUT, str(exc))
+                for idx in indices
+            )
+            continue
+        except RuntimeError as exc:
+            batch_rows, failure, message = None, exc, str(exc)
+        else:
+            failure = None
+            message = (
+                "PaDEL-Descriptor failed on one or more mols."
+                " Ensure the input structures are correct."
+            )
+
+        if batch_rows is not None and len(batch_rows) == len(indices):
+            for idx, row in zip(indices, batch_rows, strict=True):
+                if _has_values(row):
+                    rows[idx] = row
+                else:
+                    errors.append(
+                        MoleculeError(
+                            idx,
+                            molecules[idx],
+                            STATUS_EMPTY,
+                            "PaDEL-Descriptor returned no values."
+                            " Ensure input structure is correct.",
+                        )
+                    )
+        elif len(indices) == 1:
+            timed_out = isinstance(failure, PaDELTimeoutError)
+            status = STATUS_TIMEOUT if timed_out else STATUS_PARSE_FAILURE
+            errors.append(
+                MoleculeError(indices[0], molecules[indices[0]], status, message)
+            )
+        else:
+            middle = len(indices) // 2
+            # push the second half first so batches stay in input order
+            pending.append(indices[middle:])
+            pending.append(indices[:middle])
+
+    errors.sort()
+    return IsolatedResult(rows, errors)
+
+
+def _strip_names(result: IsolatedResult) -> IsolatedResult:
+    """Remove PaDEL's ``Name`` column from the successful rows, in place."""
+    for row in result.rows:
+        if row is not None:
+            del row["Name"]
+    return result
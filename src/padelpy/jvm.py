@@ -0,0 +1,107 @@
+"""Java virtual machine settings for the PaDEL-Descriptor subprocess."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import re
+from threading import Lock
+from typing import NamedTuple
+
+__all__ = [
+    "JVMOptions",
+    "get_default_jvm",
+    "set_default_jvm",
+]
+
+_GC_FLAGS = {
+    "serial": "-XX:+UseSerialGC",
+    "parallel": "-XX:+UseParallelGC",
+    "g1": "-XX:+UseG1GC",
+    "z": "-XX:+UseZGC",
+    "shenandoah": "-XX:+UseShenandoahGC",
+}
+
+_HEAP_SIZE = re.compile(r"^\d+[kKmMgGtT]?$")
+
+
+def _heap_flag(prefix: str, size) -> str:
+    """``-Xmx``/``-Xms`` flag for ``size`` (a JVM size string or an int in MiB)."""
+    if isinstance(size, int) and not isinstance(size, bool) and size > 0:
+        return f"{prefix}{size}m"
+    if isinstance(size, str) and _HEAP_SIZE.match(size):
+        return f"{prefix}{size}"
+    raise ValueError(
+        f"Heap size must be an int in MiB or a JVM size such as '4g': {size!r}"
+    )
+
+
+class JVMOptions(NamedTuple):
+    """How the Java virtual machine running PaDEL-Descriptor is started.
+
+    ``java`` is the executable (a name looked up on ``PATH`` or a path).
+    ``max_heap`` and ``initial_heap`` set ``-Xmx``/``-Xms`` (an int in MiB or
+    a JVM size string such as ``"4g"``); large 3-D batches may need a larger
+    ``max_heap`` than the JVM's default. ``gc`` selects a garbage collector
+    (``"serial"``, ``"parallel"``, ``"g1"``, ``"z"`` or ``"shenandoah"``;
+    ``"serial"`` suits short single-molecule runs). ``cds_archive`` is a
+    class-data-sharing archive made by :func:`~padelpy.create_cds_archive`
+    that shortens JVM start-up. ``flags`` are passed to ``java`` as given,
+    after the others.
+    """
+
+    java: str = "java"
+    max_heap: str | int = None
+    initial_heap: str | int = None
+    gc: str = None
+    cds_archive: str = None
+    flags: tuple = ()
+
+    def args(self) -> list:
+        """JVM arguments placed between the executable and ``-jar``.
+
+        Raises
+        ------
+        ValueError
+            If ``max_heap``, ``initial_heap`` or ``gc`` is not valid.
+        """
+        args = []
+        if self.max_heap is not None:
+            args.append(_heap_flag("-Xmx", self.max_heap))
+        if self.initial_heap is not None:
+            args.append(_heap_flag("-Xms", self.initial_heap))
+        if self.gc is not None:
+            if self.gc not in _GC_FLAGS:
+                raise ValueError(
+                    f"`gc` must be one of {sorted(_GC_FLAGS)}: {self.gc!r}"
+                )
+            args.append(_GC_FLAGS[self.gc])
+        if self.cds_archive is not None:
+            args.append(f"-XX:SharedArchiveFile={self.cds_archive}")
+        args.extend(self.flags)
+        return args
+
+
+_default = JVMOptions()
+_default_lock = Lock()
+
+
+def set_default_jvm(options: JVMOptions = None) -> None:
+    """Use ``options`` for every PaDEL run in this process not given its own.
+
+    This covers runs started by :func:`~padelpy.from_smiles` and the other
+    high-level functions in this process; ``None`` restores the plain
+    ``java`` defaults. The default is not inherited by worker processes
+    (``spawn`` starts them afresh), so the sharded functions send it along
+    with each shard; elsewhere pass ``jvm=`` or set the default in the
+    worker.
+    """
+    global _default
+    if options is not None:
+        options.args()  # fail here rather than in a later PaDEL call
+    with _default_lock:
+        _default = options if options is not None else JVMOptions()
+
+
+def get_default_jvm() -> JVMOptions:
+    """Return the :class:`JVMOptions` set with :func:`set_default_jvm`."""
+    return _default
@@ -0,0 +1,344 @@
+"""Sharded, multi-process PaDEL-Descriptor execution for large SMILES batches."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from os import cpu_count
+from os.path import join, splitext
+from re import IGNORECASE, compile
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import NamedTuple
+
+# PaDELPy imports
+from .backends import PaDELTask, _as_backend
+from .functions import (
+    _compute_file_rows,
+    _compute_smiles_rows,
+    _padel_options,
+    _read_padel_csv_rows,
+)
+from .jvm import JVMOptions, get_default_jvm
+from .sdfindex import SDFIndex, index_sdf
+
+__all__ = [
+    "ShardTiming",
+    "ShardedResult",
+    "from_sdf_sharded",
+    "from_smiles_sharded",
+]
+
+
+class ShardTiming(NamedTuple):
+    """Wall time for one shard; ``start``/``stop`` index the input list."""
+
+    index: int
+    start: int
+    stop: int
+    seconds: float
+
+
+class ShardedResult(NamedTuple):
+    """Rows in input order plus per-shard timings."""
+
+    rows: list
+    shards: list
+
+
+def _run_shard(smiles: list, options: dict) -> tuple:
+    """Compute one shard; module level so process pools can pickle it."""
+    began = perf_counter()
+    rows = _compute_smiles_rows(smiles, options)
+    return rows, perf_counter() - began
+
+
+def _write_smiles_shard(smiles: list, start: int, stop: int, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as smi_file:
+        smi_file.write("\n".join(smiles[start:stop]))
+
+
+def _run_file_shard(index: SDFIndex, start: int, stop: int, options: dict) -> tuple:
+    """Copy one shard's records to a temporary file and compute it."""
+    began = perf_counter()
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        shard_path = join(tmpdir, f"shard{splitext(index.path)[1]}")
+        index.copy(start, stop, shard_path)
+        rows = _compute_file_rows(shard_path, options)
+    return rows, perf_counter() - began
+
+
+def _collect(bounds: list, futures: list, unit: str, result=None) -> ShardedResult:
+    """Check and concatenate shard results in shard order.
+
+    ``result(idx, future)`` returns a shard's ``(rows, seconds)``; by default
+    that is what the future resolves to.
+    """
+    rows, shards = [], []
+    try:
+        for idx, ((start, stop), future) in enumerate(
+            zip(bounds, futures, strict=True)
+        ):
+            shard_rows, seconds = (
+                future.result() if result is None else result(idx, future)
+            )
+            if len(shard_rows) != stop - start or any(
+                len(row) == 0 for row in shard_rows
+            ):
+                raise RuntimeError(
+                    f"PaDEL-Descriptor failed on one or more mols in shard"
+                    f" {idx} ({unit} {start}-{stop - 1})."
+                    " Ensure the input structures are correct."
+                )
+            for row in shard_rows:
+                del row["Name"]
+            rows.extend(shard_rows)
+            shards.append(ShardTiming(idx, start, stop, seconds))
+    except BaseException:
+        # do not start shards whose results would be discarded
+        for future in futures:
+            future.cancel()
+        raise
+    return ShardedResult(rows, shards)
+
+
+def _collect_tasks(
+    executor, bounds: list, write_shard, suffix: str, options: dict, unit: str
+) -> ShardedResult:
+    """Run each shard as a :class:`~padelpy.backends.PaDELTask` on ``executor``.
+
+    ``write_shard(start, stop, path)`` writes a shard's input file; inputs and
+    output CSVs live in a temporary directory until the rows are read back.
+    """
+    backend = _as_backend(executor)
+    with TemporaryDirectory(prefix="padelpy_", ignore_cleanup_errors=True) as tmpdir:
+        futures, outputs = [], []
+        try:
+            for idx, (start, stop) in enumerate(bounds):
+                input_path = join(tmpdir, f"shard{idx}{suffix}")
+                write_shard(start, stop, input_path)
+                outputs.append(join(tmpdir, f"shard{idx}.csv"))
+                futures.append(
+                    backend.submit(PaDELTask(input_path, outputs[idx], options))
+                )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        def _result(idx: int, future) -> tuple:
+            seconds = future.result()
+            return _read_padel_csv_rows(outputs[idx]), seconds
+
+        return _collect(bounds, futures, unit, _result)
+
+
+def from_smiles_sharded(
+    smiles: list,
+    shard_size: int = 100,
+    workers: int = None,
+    use_processes: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = 1,
+    executor=None,
+    jvm: JVMOptions = None,
+) -> ShardedResult:
+    """Split SMILES into shards and run one PaDEL process per shard concurrently.
+
+    Each shard gets its own JVM, so a pathological molecule only stalls (or
+    times out) its own shard. Rows are reassembled in input order.
+
+    Parameters
+    ----------
+    smiles : list of str
+        SMILES strings to calculate.
+    shard_size : int, default 100
+        Maximum number of SMILES per PaDEL process.
+    workers : int, optional
+        Number of PaDEL processes run at once (default: CPU count).
+    use_processes : bool, default False
+        If True, dispatch shards from a process pool instead of a thread
+        pool. Threads suffice because the work happens in the JVM.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per shard.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default 1
+        PaDEL worker threads per process. Defaults to 1 because parallelism
+        comes from running several processes.
+    executor : concurrent.futures.Executor or padelpy.backends.Backend, optional
+        Run the shards here instead of on a pool created for the call (see
+        :mod:`padelpy.backends`); ``workers`` and ``use_processes`` are then
+        ignored, and the executor is left running for the caller to shut down.
+    jvm : JVMOptions, optional
+        How to start each shard's Java virtual machine (see
+        :class:`~padelpy.jvm.JVMOptions`). Defaults to the options set with
+        :func:`~padelpy.jvm.set_default_jvm` in this process; either way they
+        travel with every shard, so process-pool and backend workers use
+        them too.
+
+    Returns
+    -------
+    ShardedResult
+        ``rows`` (list of dict, ``Name`` removed, input order) and ``shards``
+        (list of :class:`ShardTiming`, shard order).
+
+    Raises
+    ------
+    RuntimeError
+        If any shard fails or returns the wrong number of rows.
+    """
+    if not isinstance(smiles, list):
+        raise RuntimeError(f"Unknown input format for `smiles`: {type(smiles)}")
+    if shard_size < 1:
+        raise ValueError(f"`shard_size` must be at least 1: {shard_size}")
+    if workers is None:
+        workers = cpu_count() or 1
+
+    if jvm is None:
+        jvm = get_default_jvm()  # worker processes do not share this default
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, jvm=jvm
+    )
+    bounds = [
+        (start, min(start + shard_size, len(smiles)))
+        for start in range(0, len(smiles), shard_size)
+    ]
+    if executor is not None:
+        return _collect_tasks(
+            executor,
+            bounds,
+            partial(_write_smiles_shard, smiles),
+            ".smi",
+            options,
+            "inputs",
+        )
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_shard, smiles[start:stop], options)
+            for start, stop in bounds
+        ]
+        return _collect(bounds, futures, "inputs")
+
+
+def from_sdf_sharded(
+    sdf_file: str,
+    shard_size: int = 100,
+    shard_bytes: int = None,
+    workers: int = None,
+    use_processes: bool = False,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = 1,
+    executor=None,
+    jvm: JVMOptions = None,
+) -> ShardedResult:
+    """Split an SDF/MDL file into shards and run one PaDEL process per shard.
+
+    Records are located with :func:`~padelpy.sdfindex.index_sdf` (a
+    memory-mapped scan whose offsets are cached next to the file), and each
+    shard's byte range is copied to its own temporary file, so the input is
+    never loaded into Python memory. Rows are reassembled in file order.
+
+    Parameters
+    ----------
+    sdf_file : str
+        Path to an SDF or MDL file (``.sdf`` or ``.mdl`` extension).
+    shard_size : int, default 100
+        Maximum number of molecules per PaDEL process.
+    shard_bytes : int, optional
+        Maximum shard size in bytes, for files whose records vary widely in
+        size; a shard ends at whichever limit is reached first.
+    workers : int, optional
+        Number of PaDEL processes run at once (default: CPU count).
+    use_processes : bool, default False
+        If True, dispatch shards from a process pool instead of a thread
+        pool. Threads suffice because the work happens in the JVM.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per shard.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default 1
+        PaDEL worker threads per process. Defaults to 1 because parallelism
+        comes from running several processes.
+    executor : concurrent.futures.Executor or padelpy.backends.Backend, optional
+        Run the shards here instead of on a pool created for the call (see
+        :mod:`padelpy.backends`); ``workers`` and ``use_processes`` are then
+        ignored, and the executor is left running for the caller to shut down.
+    jvm : JVMOptions, optional
+        How to start each shard's Java virtual machine (see
+        :class:`~padelpy.jvm.JVMOptions`). Defaults to the options set with
+        :func:`~padelpy.jvm.set_default_jvm` in this process; either way they
+        travel with every shard, so process-pool and backend workers use
+        them too.
+
+    Returns
+    -------
+    ShardedResult
+        ``rows`` (list of dict, ``Name`` removed, file order) and ``shards``
+        (list of :class:`ShardTiming`, with ``start``/``stop`` indexing the
+        file's molecules).
+
+    Raises
+    ------
+    RuntimeError
+        If any shard fails or returns the wrong number of rows.
+    """
+    if compile(r".*\.(sdf|mdl)$", IGNORECASE).match(sdf_file) is None:
+        raise ValueError(f"File must have a `.sdf` or `.mdl` extension: {sdf_file}")
+    if shard_size < 1:
+        raise ValueError(f"`shard_size` must be at least 1: {shard_size}")
+    if workers is None:
+        workers = cpu_count() or 1
+
+    if jvm is None:
+        jvm = get_default_jvm()  # worker processes do not share this default
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, jvm=jvm
+    )
+    index = index_sdf(sdf_file)
+    bounds = [
+        (shard.start, shard.stop)
+        for shard in index.shards(molecules=shard_size, max_bytes=shard_bytes)
+    ]
+    if executor is not None:
+        return _collect_tasks(
+            executor,
+            bounds,
+            index.copy,
+            splitext(index.path)[1],
+            options,
+            "molecules",
+        )
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_file_shard, index, start, stop, options)
+            for start, stop in bounds
+        ]
+        return _collect(bounds, futures, "molecules")
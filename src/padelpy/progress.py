@@ -0,0 +1,138 @@
+"""Incremental reading of PaDEL-Descriptor's per-molecule progress output."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import re
+from collections.abc import Callable
+from queue import Empty, SimpleQueue
+from subprocess import Popen, TimeoutExpired
+from threading import Event, Thread
+from time import monotonic
+from typing import NamedTuple
+
+__all__ = [
+    "Progress",
+]
+
+# PaDEL workers print "Processing <name> in <file> (<i>/<n>). Average speed: ..."
+_PROCESSING = re.compile(rb"^Processing (.*?) in .* \((\d+)/(\d+)\)")
+
+# how often a follower with a cancel event checks it while PaDEL is silent
+_POLL_SECONDS = 0.1
+
+
+class Progress(NamedTuple):
+    """One progress update from a running PaDEL-Descriptor process.
+
+    ``processed`` molecules of ``total`` (as reported by PaDEL) are finished,
+    ``molecule`` being the last one, ``elapsed`` seconds after the process
+    started. ``rate`` is molecules per second since the first molecule
+    finished (so JVM start-up is excluded) and ``eta`` the seconds left at
+    that rate; both are ``None`` until two molecules have finished.
+    """
+
+    processed: int
+    total: int
+    molecule: str
+    elapsed: float
+    rate: float | None
+    eta: float | None
+
+
+class _Cancelled(Exception):
+    """Raised by :func:`_follow` when its cancel event is set."""
+
+
+class _Tracker:
+    """Turn PaDEL stdout lines into :class:`Progress` updates."""
+
+    def __init__(self) -> None:
+        self.started = monotonic()
+        self.processed = 0
+        self.first = None
+
+    def update(self, line: bytes) -> Progress | None:
+        match = _PROCESSING.match(line)
+        if match is None:
+            return None
+        now = monotonic()
+        # with several PaDEL threads the reported index is not monotonic, so
+        # count lines instead
+        self.processed += 1
+        total = max(int(match.group(3)), self.processed)
+        rate = eta = None
+        if self.first is None:
+            self.first = now
+        elif now > self.first:
+            rate = (self.processed - 1) / (now - self.first)
+            eta = (total - self.processed) / rate
+        return Progress(
+            self.processed,
+            total,
+            match.group(1).decode("utf-8", "replace"),
+            now - self.started,
+            rate,
+            eta,
+        )
+
+
+def _follow(
+    process: Popen,
+    timeout: float | None,
+    callback: Callable[[Progress], None],
+    cancel: Event = None,
+) -> tuple:
+    """``process.communicate(timeout=timeout)``, reporting progress on the way.
+
+    Output is read by two pump threads; ``callback`` runs in the calling
+    thread for each progress line. If the callback raises, the timeout
+    expires (``TimeoutExpired``) or ``cancel`` is set (``_Cancelled``), the
+    process is killed before the exception propagates.
+    """
+    lines = SimpleQueue()
+    stdout, stderr = [], []
+
+    def _pump_stdout() -> None:
+        for line in process.stdout:
+            stdout.append(line)
+            lines.put(line)
+        lines.put(None)
+
+    def _pump_stderr() -> None:
+        stderr.append(process.stderr.read())
+
+    pumps = [Thread(target=_pump_stdout, daemon=True)]
+    pumps.append(Thread(target=_pump_stderr, daemon=True))
+    for pump in pumps:
+        pump.start()
+    deadline = None if timeout is None else monotonic() + timeout
+    tracker = _Tracker()
+    try:
+        while True:
+            wait = None if deadline is None else deadline - monotonic()
+            if wait is not None and wait <= 0:
+                raise TimeoutExpired(process.args, timeout)
+            if cancel is not None:
+                if cancel.is_set():
+                    raise _Cancelled()
+                wait = _POLL_SECONDS if wait is None else min(wait, _POLL_SECONDS)
+            try:
+                line = lines.get(timeout=wait)
+            except Empty:
+                continue
+            if line is None:
+                break
+            update = tracker.update(line)
+            if update is not None:
+                callback(update)
+        process.wait(None if deadline is None else max(deadline - monotonic(), 0))
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        # the pipes reach EOF once the process has exited
+        for pump in pumps:
+            pump.join()
+    return b"".join(stdout), b"".join(stderr)
@@ -0,0 +1,458 @@
+"""Adaptive batch sizing and concurrency for large SMILES runs."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha256
+from json import dump, dumps, load
+from math import ceil, sqrt
+from os import cpu_count, getpid, makedirs, replace
+from os.path import abspath, dirname, exists
+from threading import get_ident
+from time import perf_counter, time
+from typing import NamedTuple
+
+# PaDELPy imports
+from .cache import _stable_options
+from .functions import _compute_smiles_rows, _padel_options
+from .timeouts import _timeout_seconds
+
+__all__ = [
+    "BatchTiming",
+    "SchedulePlan",
+    "ScheduledResult",
+    "from_smiles_adaptive",
+]
+
+_STATE_VERSION = 1
+# successful batches the latency model is fitted to (the most recent ones)
+_FIT_WINDOW = 32
+# a batch is sized to finish within this fraction of the subprocess timeout
+_TIMEOUT_MARGIN = 0.5
+# a concurrency change is kept only if throughput improves by this fraction
+_MIN_GAIN = 0.05
+
+
+class BatchTiming(NamedTuple):
+    """One successful PaDEL run: SMILES ``start:stop``, ``seconds`` of wall
+    time, and the number of runs (``concurrency``) allowed at once when it
+    was started.
+    """
+
+    start: int
+    stop: int
+    seconds: float
+    concurrency: int
+
+
+class SchedulePlan(NamedTuple):
+    """What the scheduler learned and chose.
+
+    ``startup_seconds`` and ``seconds_per_molecule`` are the fitted cost of
+    one PaDEL run (``startup + n * per_molecule`` seconds for ``n``
+    molecules), ``failure_rate`` the failed runs per molecule attempted, and
+    ``batch_size`` and ``workers`` the batch size and concurrency in use when
+    the run ended.
+    """
+
+    batch_size: int
+    workers: int
+    startup_seconds: float
+    seconds_per_molecule: float
+    failure_rate: float
+
+
+class ScheduledResult(NamedTuple):
+    """Rows in input order, the final :class:`SchedulePlan`, and one
+    :class:`BatchTiming` per successful run in completion order.
+    """
+
+    rows: list
+    plan: SchedulePlan
+    batches: list
+
+
+def _mode_key(options: dict) -> str:
+    """Key for the options that decide what PaDEL calculates (and so its cost)."""
+    stable = _stable_options(options)
+    return sha256(dumps(stable, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _load_plan(state_path: str, key: str) -> SchedulePlan:
+    if state_path is None or not exists(state_path):
+        return None
+    with open(state_path, encoding="utf-8") as handle:
+        state = load(handle)
+    if state.get("version") != _STATE_VERSION:
+        return None
+    entry = state["modes"].get(key)
+    if entry is None:
+        return None
+    return SchedulePlan(*(entry[name] for name in SchedulePlan._fields))
+
+
+def _save_plan(state_path: str, key: str, plan: SchedulePlan, molecules: int) -> None:
+    """Store ``plan`` under ``key``, keeping other modes (written, then renamed)."""
+    state = {"version": _STATE_VERSION, "modes": {}}
+    if exists(state_path):
+        with open(state_path, encoding="utf-8") as handle:
+            previous = load(handle)
+        if previous.get("version") == _STATE_VERSION:
+            state = previous
+    state["modes"][key] = {
+        **plan._asdict(),
+        "molecules": molecules,
+        "updated": time(),
+    }
+    makedirs(dirname(abspath(state_path)), exist_ok=True)
+    partial = f"{state_path}.{getpid()}.{get_ident()}.tmp"
+    with open(partial, "w", encoding="utf-8") as handle:
+        dump(state, handle, indent=1)
+    replace(partial, state_path)
+
+
+class _Scheduler:
+    """Latency model, batch sizing and concurrency hill-climbing.
+
+    Batch wall time is modelled as ``startup + n * per_molecule`` and fitted
+    by least squares to recent batches. The batch size is the smallest of
+    three limits: large enough that start-up is at most ``overhead`` of a
+    run, small enough that the expected cost of re-running failed batches
+    stays low (``sqrt(startup / (per_molecule * failure_rate))``), and
+    short enough to finish well inside ``timeout``; near the end of the
+    input, batches shrink so every concurrent run gets a share. Concurrency
+    moves one
+    step at a time while throughput improves and stops at the first step
+    that does not help.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        min_batch: int,
+        max_batch: int,
+        overhead: float,
+        timeout: float,
+        prior: SchedulePlan = None,
+    ) -> None:
+        self.workers = workers
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.overhead = overhead
+        self.timeout = timeout
+        self.prior = prior
+        self.points = deque(maxlen=_FIT_WINDOW)
+        self.attempted = 0
+        self.failures = 0
+        self.startup = prior.startup_seconds if prior else None
+        self.per_molecule = prior.seconds_per_molecule if prior else None
+        if prior:
+            self.concurrency = max(1, min(workers, prior.workers))
+            self.climbing = False
+        else:
+            self.concurrency = max(1, workers // 2)
+            self.climbing = self.concurrency < workers
+        self.batch_size = self._size() if prior else None
+        self._window_start = perf_counter()
+        self._window_molecules = 0
+        self._window_batches = 0
+        self._last_throughput = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model can size batches (after the probes)."""
+        return self.per_molecule is not None
+
+    @property
+    def failure_rate(self) -> float:
+        if self.attempted:
+            return self.failures / self.attempted
+        return self.prior.failure_rate if self.prior else 0.0
+
+    def _fit(self) -> None:
+        sizes = [n for n, _ in self.points]
+        times = [t for _, t in self.points]
+        mean_n = sum(sizes) / len(sizes)
+        mean_t = sum(times) / len(times)
+        spread = sum((n - mean_n) ** 2 for n in sizes)
+        if spread > 0:
+            slope = sum((n - mean_n) * (t - mean_t) for n, t in self.points) / spread
+            startup = min(max(mean_t - slope * mean_n, 0.0), min(times))
+        elif self.startup is not None:
+            startup = self.startup
+        else:
+            return
+        # refit the slope for the clipped intercept; never zero or negative
+        self.startup = startup
+        self.per_molecule = max(
+            sum(max(t - startup, 0.0) for t in times) / sum(sizes), 1e-6
+        )
+
+    def clamp(self, size: int) -> int:
+        return max(self.min_batch, min(size, self.max_batch))
+
+    def next_probe(self, probe_size: int) -> int:
+        """A probe size unlike those measured so far."""
+        if not self.points:
+            return self.clamp(probe_size)
+        largest = max(n for n, _ in self.points)
+        if largest < self.max_batch:
+            return self.clamp(2 * largest)
+        return self.clamp(largest // 2)
+
+    def _size(self) -> int:
+        startup, per_molecule = self.startup, self.per_molecule
+        limits = [self.max_batch]
+        if startup > 0:
+            limits.append(
+                ceil(startup * (1 - self.overhead) / (self.overhead * per_molecule))
+            )
+            if self.failure_rate > 0:
+                limits.append(ceil(sqrt(startup / (per_molecule * self.failure_rate))))
+        return self._within_timeout(self.clamp(min(limits)))
+
+    def _within_timeout(self, size: int) -> int:
+        """Shrink ``size`` until a batch that large fits its subprocess timeout.
+
+        A timeout policy is resolved for the size under consideration, and a
+        smaller batch may be given a smaller timeout, so this repeats until
+        the size fits (or reaches ``min_batch``).
+        """
+        while size > self.min_batch:
+            try:
+                seconds = _timeout_seconds(self.timeout, size)
+            except TimeoutError:
+                return self.min_batch  # the deadline passed; the run reports it
+            if seconds is None or seconds <= 0:
+                return size
+            budget = seconds * _TIMEOUT_MARGIN - self.startup
+            fits = int(budget / self.per_molecule)
+            if fits >= size:
+                return size
+            size = self.clamp(fits)
+        return size
+
+    def share(self, remaining: int) -> int:
+        """Next batch size, given ``remaining`` molecules not yet submitted.
+
+        Near the end of the input, batches shrink so that every concurrent
+        run gets a share, but not below the size at which start-up is half
+        of a run.
+        """
+        fair = ceil(remaining / self.concurrency)
+        floor = ceil(self.startup / self.per_molecule)
+        return self.clamp(min(self.batch_size, max(fair, floor)))
+
+    def record(self, size: int, seconds: float) -> None:
+        self.attempted += size
+        self.points.append((size, seconds))
+        self._fit()
+        if self.ready:
+            self.batch_size = self._size()
+        self._window_molecules += size
+        self._window_batches += 1
+        if self._window_batches >= max(2, self.concurrency):
+            self._climb()
+
+    def record_failure(self, size: int) -> None:
+        self.attempted += size
+        self.failures += 1
+        if self.ready:
+            self.batch_size = self._size()
+
+    def _climb(self) -> None:
+        now = perf_counter()
+        throughput = self._window_molecules / max(now - self._window_start, 1e-9)
+        self._window_start, self._window_molecules, self._window_batches = now, 0, 0
+        if not self.climbing:
+            self._last_throughput = throughput
+            return
+        if self._last_throughput is not None and throughput < self._last_throughput * (
+            1 + _MIN_GAIN
+        ):
+            # the last step did not pay off: undo it and stay there
+            self.concurrency -= 1
+            self.climbing = False
+        elif self.concurrency < self.workers:
+            self.concurrency += 1
+        else:
+            self.climbing = False
+        self._last_throughput = throughput
+
+    def plan(self) -> SchedulePlan:
+        return SchedulePlan(
+            self.batch_size or self.min_batch,
+            self.concurrency,
+            self.startup or 0.0,
+            self.per_molecule or 0.0,
+            self.failure_rate,
+        )
+
+
+def _run_batch(smiles: list, options: dict) -> tuple:
+    """Compute one batch once (a failed batch is split, not retried)."""
+    began = perf_counter()
+    rows = _compute_smiles_rows(smiles, options, attempts=1)
+    if len(rows) != len(smiles) or any(len(row) == 0 for row in rows):
+        raise RuntimeError("PaDEL-Descriptor failed on one or more mols")
+    return rows, perf_counter() - began
+
+
+def from_smiles_adaptive(
+    smiles: list,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    mode: str = None,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = 1,
+    workers: int = None,
+    probe_size: int = 8,
+    min_batch: int = 1,
+    max_batch: int = 1000,
+    overhead: float = 0.1,
+    state_path: str = None,
+) -> ScheduledResult:
+    """Calculate SMILES in batches whose size and concurrency adapt to the run.
+
+    Two probe batches (``probe_size`` and twice that) measure PaDEL's
+    start-up time and per-molecule latency; later batches are sized from
+    the fitted latency, the failure rate and ``timeout`` (see
+    :class:`SchedulePlan`), and the number of concurrent PaDEL processes
+    is raised step by step while throughput improves. A batch that fails
+    or times out is split in half and re-run, so one slow or invalid
+    molecule costs little; a single molecule that still fails raises.
+
+    Parameters
+    ----------
+    smiles : list of str
+        SMILES strings to calculate.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    mode : {"2d", "3d", "fingerprints"}, optional
+        Calculation mode, as for :func:`~padelpy.from_smiles`.
+    timeout : int or timeout policy, default 60
+        Maximum subprocess time in seconds, per batch, or a policy from
+        :mod:`padelpy.timeouts`, resolved for each batch size. Batches are
+        sized to take at most half of it.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default 1
+        PaDEL worker threads per process.
+    workers : int, optional
+        Most PaDEL processes run at once (default: CPU count).
+    probe_size : int, default 8
+        Size of the first probe batch.
+    min_batch, max_batch : int, default 1 and 1000
+        Bounds on the batch size.
+    overhead : float, default 0.1
+        Largest acceptable share of a batch's time spent starting PaDEL.
+    state_path : str, optional
+        JSON file of learned plans, one per descriptor mode (the options
+        that decide what is calculated). A plan found there replaces the
+        probes, and the plan this run ends with is saved back.
+
+    Returns
+    -------
+    ScheduledResult
+        ``rows`` (list of dict, ``Name`` removed, input order), ``plan``
+        (the final :class:`SchedulePlan`) and ``batches``.
+
+    Raises
+    ------
+    RuntimeError
+        If a single molecule fails on its own.
+    """
+    if not isinstance(smiles, list):
+        raise RuntimeError(f"Unknown input format for `smiles`: {type(smiles)}")
+    if not 1 <= min_batch <= max_batch:
+        raise ValueError(
+            f"Need 1 <= `min_batch` <= `max_batch`: {min_batch}, {max_batch}"
+        )
+    if probe_size < 1:
+        raise ValueError(f"`probe_size` must be at least 1: {probe_size}")
+    if not 0 < overhead < 1:
+        raise ValueError(f"`overhead` must be between 0 and 1: {overhead}")
+    workers = workers or cpu_count() or 1
+
+    options = _padel_options(
+        descriptors, fingerprints, timeout, maxruntime, threads, mode
+    )
+    key = _mode_key(options)
+    scheduler = _Scheduler(
+        workers,
+        min_batch,
+        max_batch,
+        overhead,
+        timeout,
+        _load_plan(state_path, key),
+    )
+    probes = deque()
+    if not scheduler.ready:
+        probes.extend(scheduler.clamp(size) for size in (probe_size, 2 * probe_size))
+
+    results, batches = {}, []
+    retry = deque()
+    cursor = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        try:
+            while retry or cursor < len(smiles) or running:
+                if not (scheduler.ready or probes or running or retry):
+                    # the probes failed or were too alike to fit: probe again
+                    probes.append(scheduler.next_probe(probe_size))
+                # until the model is ready, only probes (and their halves) run
+                while len(running) < scheduler.concurrency and (
+                    retry or (cursor < len(smiles) and (scheduler.ready or probes))
+                ):
+                    if retry:
+                        start, stop = retry.popleft()
+                    else:
+                        size = (
+                            probes.popleft()
+                            if probes
+                            else scheduler.share(len(smiles) - cursor)
+                        )
+                        start, stop = cursor, min(cursor + size, len(smiles))
+                        cursor = stop
+                    future = executor.submit(_run_batch, smiles[start:stop], options)
+                    running[future] = (start, stop, scheduler.concurrency)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop, concurrency = running.pop(future)
+                    try:
+                        rows, seconds = future.result()
+                    except RuntimeError as exc:
+                        scheduler.record_failure(stop - start)
+                        if stop - start == 1:
+                            raise RuntimeError(
+                                f"PaDEL-Descriptor failed on {smiles[start]}."
+                                " Ensure input structure is correct."
+                            ) from exc
+                        middle = (start + stop) // 2
+                        retry.extendleft([(middle, stop), (start, middle)])
+                        continue
+                    scheduler.record(stop - start, seconds)
+                    for row in rows:
+                        del row["Name"]
+                    results[start] = rows
+                    batches.append(BatchTiming(start, stop, seconds, concurrency))
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    plan = scheduler.plan()
+    if state_path is not None and batches:
+        _save_plan(state_path, key, plan, len(smiles))
+    rows = [row for start in sorted(results) for row in results[start]]
+    return ScheduledResult(rows, plan, batches)
@@ -0,0 +1,189 @@
+"""Byte-offset index of the molblock records in SDF/MDL files, for sharding."""
+
+from __future__ import annotations
+
+# stdlib. imports
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from mmap import ACCESS_READ, mmap
+from os import fstat, getpid, replace, stat
+from struct import Struct
+from threading import get_ident
+from typing import NamedTuple
+
+__all__ = [
+    "SDFIndex",
+    "SDFShard",
+    "index_sdf",
+]
+
+# a record ends with a line holding only "$$$$", as in ``_iter_mol_records``
+_DELIMITER = re.compile(rb"^\$\$\$\$\r*(?:\n|\Z)", re.MULTILINE)
+_NON_SPACE = re.compile(rb"\S")
+
+# cache file: magic, indexed file size and mtime, record count, then the
+# record boundaries as little-endian int64
+_HEADER = Struct("<8sqqq")
+_MAGIC = b"PADELIX1"
+_SUFFIX = ".padelidx"
+
+_COPY_CHUNK = 1 << 20
+
+
+class SDFShard(NamedTuple):
+    """Records ``start`` to ``stop - 1``: ``length`` bytes from ``offset``."""
+
+    index: int
+    start: int
+    stop: int
+    offset: int
+    length: int
+
+
+class SDFIndex:
+    """Record boundaries of an SDF/MDL file.
+
+    Record ``i`` occupies bytes ``bounds[i]`` to ``bounds[i + 1]`` of the
+    file, its ``$$$$`` line included. Only the boundaries are held in memory
+    (8 bytes per record), never the file content.
+
+    Attributes
+    ----------
+    path : str
+        The indexed file.
+    bounds : array.array
+        ``len(index) + 1`` byte offsets (int64).
+    """
+
+    def __init__(self, path: str, bounds: array) -> None:
+        self.path = path
+        self.bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    def span(self, start: int, stop: int) -> tuple:
+        """Return ``(offset, length)`` in bytes of records ``start:stop``."""
+        return self.bounds[start], self.bounds[stop] - self.bounds[start]
+
+    def shards(self, molecules: int = None, max_bytes: int = None) -> list:
+        """Split the records into consecutive shards.
+
+        A shard holds at most ``molecules`` records and at most ``max_bytes``
+        bytes, whichever limit is reached first (a single record larger than
+        ``max_bytes`` gets a shard of its own).
+
+        Returns
+        -------
+        list of SDFShard
+        """
+        if molecules is None and max_bytes is None:
+            raise ValueError("Give `molecules` and/or `max_bytes`")
+        if molecules is not None and molecules < 1:
+            raise ValueError(f"`molecules` must be at least 1: {molecules}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"`max_bytes` must be at least 1: {max_bytes}")
+        shards, start, total = [], 0, len(self)
+        while start < total:
+            stop = total
+            if molecules is not None:
+                stop = min(stop, start + molecules)
+            if max_bytes is not None:
+                fits = bisect_right(self.bounds, self.bounds[start] + max_bytes) - 1
+                stop = min(stop, max(fits, start + 1))
+            shards.append(SDFShard(len(shards), start, stop, *self.span(start, stop)))
+            start = stop
+        return shards
+
+    def copy(self, start: int, stop: int, dest: str) -> None:
+        """Write records ``start:stop`` to ``dest``, in bounded memory."""
+        offset, remaining = self.span(start, stop)
+        with open(self.path, "rb") as source, open(dest, "wb") as target:
+            source.seek(offset)
+            while remaining > 0:
+                chunk = source.read(min(remaining, _COPY_CHUNK))
+                if not chunk:
+                    raise RuntimeError(f"{self.path} changed while it was being read")
+                target.write(chunk)
+                remaining -= len(chunk)
+
+
+def _scan(path: str) -> tuple:
+    """Find record boundaries by scanning the memory-mapped file."""
+    bounds = array("q", [0])
+    with open(path, "rb") as handle:
+        info = fstat(handle.fileno())
+        if info.st_size:
+            with mmap(handle.fileno(), 0, access=ACCESS_READ) as mapped:
+                bounds.extend(match.end() for match in _DELIMITER.finditer(mapped))
+                # text after the last delimiter is a final, unterminated record
+                if _NON_SPACE.search(mapped, bounds[-1]):
+                    bounds.append(info.st_size)
+    return bounds, info
+
+
+def _load(cache_path: str, size: int, mtime_ns: int) -> array | None:
+    try:
+        with open(cache_path, "rb") as handle:
+            header = handle.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, cached_size, cached_mtime, count = _HEADER.unpack(header)
+            if (magic, cached_size, cached_mtime) != (_MAGIC, size, mtime_ns):
+                return None
+            bounds = array("q")
+            bounds.fromfile(handle, count)
+    except (OSError, EOFError):
+        return None
+    if sys.byteorder != "little":
+        bounds.byteswap()
+    return bounds
+
+
+def _save(cache_path: str, bounds: array, size: int, mtime_ns: int) -> None:
+    """Write the cache atomically; an unwritable directory is not an error."""
+    data = array("q", bounds)
+    if sys.byteorder != "little":
+        data.byteswap()
+    partial = f"{cache_path}.{getpid()}.{get_ident()}.tmp"
+    try:
+        with open(partial, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, size, mtime_ns, len(data)))
+            data.tofile(handle)
+        replace(partial, cache_path)
+    except OSError:
+        pass
+
+
+def index_sdf(path: str, cache: bool = True) -> SDFIndex:
+    """Index the ``$$$$``-delimited records of an SDF/MDL file.
+
+    The file is scanned through ``mmap``, so it is never read into Python
+    memory. With ``cache=True`` the index is stored next to the file as
+    ``<path>.padelidx`` and reused while the file's size and modification
+    time are unchanged; if that location is not writable the index is simply
+    rebuilt next time.
+
+    Parameters
+    ----------
+    path : str
+        SDF or MDL file.
+    cache : bool, default True
+        If True, read and write the ``.padelidx`` index cache.
+
+    Returns
+    -------
+    SDFIndex
+    """
+    cache_path = path + _SUFFIX
+    if cache:
+        info = stat(path)
+        bounds = _load(cache_path, info.st_size, info.st_mtime_ns)
+        if bounds is not None:
+            return SDFIndex(path, bounds)
+    bounds, info = _scan(path)
+    if cache:
+        _save(cache_path, bounds, info.st_size, info.st_mtime_ns)
+    return SDFIndex(path, bounds)
@@ -0,0 +1,310 @@
+"""Generators that yield PaDEL-Descriptor rows incrementally, in bounded memory."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from re import IGNORECASE, compile
+from typing import TYPE_CHECKING
+
+# PaDELPy imports
+from .frames import _check_frame_options, _read_frame, _require_pandas
+from .functions import (
+    _compute_records_rows,
+    _compute_smiles_rows,
+    _iter_mol_records,
+    _padel_options,
+)
+
+if TYPE_CHECKING:
+    import pandas
+
+__all__ = [
+    "iter_dataframes",
+    "iter_sdf",
+    "iter_smiles",
+]
+
+_FAILED = (
+    "PaDEL-Descriptor failed on one or more mols."
+    " Ensure the input structures are correct."
+)
+
+
+def _chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _smiles_entries(smiles: Iterable) -> Iterator[str]:
+    """Strip each SMILES, raising on a blank entry so rows keep input positions."""
+    for position, smi in enumerate(smiles):
+        smi = smi.strip()
+        if not smi:
+            raise ValueError(
+                f"Blank SMILES at input position {position}: rows are yielded"
+                " per input entry, so remove blank entries (or lines) first"
+            )
+        yield smi
+
+
+def _prefetch(chunks: Iterator[list], compute, options: dict) -> Iterator[tuple]:
+    """Yield ``(size, result)`` per chunk, calculating the next in the background.
+
+    At most two chunks (the one being consumed and the one being calculated)
+    are alive at any time.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        chunk = next(chunks, None)
+        pending = executor.submit(compute, chunk, options) if chunk else None
+        try:
+            while pending is not None:
+                result = pending.result()
+                size = len(chunk)
+                chunk = next(chunks, None)
+                pending = executor.submit(compute, chunk, options) if chunk else None
+                yield size, result
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+def _stream(chunks: Iterator[list], compute, options: dict) -> Iterator[dict]:
+    """Yield validated rows chunk by chunk (see :func:`_prefetch`)."""
+    for size, rows in _prefetch(chunks, compute, options):
+        if len(rows) != size or any(len(row) == 0 for row in rows):
+            raise RuntimeError(_FAILED)
+        for row in rows:
+            del row["Name"]
+        yield from rows
+
+
+def _stream_frames(chunks: Iterator[list], compute, options: dict) -> Iterator:
+    """Yield one DataFrame per chunk, indexed by position in the input."""
+    pd = _require_pandas()
+    start = 0
+    for size, (names, frame) in _prefetch(chunks, compute, options):
+        if len(names) != size:
+            raise RuntimeError(_FAILED)
+        frame.index = pd.RangeIndex(start, start + size)
+        start += size
+        yield frame
+
+
+def iter_smiles(
+    smiles: Iterable,
+    chunk_size: int = 1000,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+) -> Iterator[dict]:
+    """Stream descriptor rows for SMILES as PaDEL produces them.
+
+    SMILES are consumed lazily in chunks of ``chunk_size``; each chunk is one
+    PaDEL run, and the next chunk is calculated while the current one is being
+    consumed. Memory use is bounded by the chunk size, not the input size.
+
+    Parameters
+    ----------
+    smiles : iterable of str
+        SMILES strings (a list, a generator, an open file of lines, ...).
+        Surrounding whitespace is stripped; a blank entry raises
+        ``ValueError`` rather than being skipped, so that every row keeps
+        its input position.
+    chunk_size : int, default 1000
+        Number of SMILES per PaDEL run.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per chunk.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+
+    Returns
+    -------
+    iterator of dict
+        One mapping of labels to values per SMILES, in input order.
+
+    Raises
+    ------
+    RuntimeError
+        While iterating, if PaDEL fails on a chunk or returns the wrong
+        number of rows.
+    ValueError
+        While iterating, if an entry of ``smiles`` is blank.
+    """
+    if isinstance(smiles, str):
+        raise RuntimeError(
+            "Unknown input format for `smiles`: expected an iterable of SMILES,"
+            " got a single str"
+        )
+    if chunk_size < 1:
+        raise ValueError(f"`chunk_size` must be at least 1: {chunk_size}")
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    return _stream(
+        _chunks(_smiles_entries(smiles), chunk_size),
+        _compute_smiles_rows,
+        options,
+    )
+
+
+def iter_sdf(
+    sdf_file: str,
+    chunk_size: int = 1000,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+) -> Iterator[dict]:
+    """Stream descriptor rows for an SDF file as PaDEL produces them.
+
+    The file is read record by record and calculated in chunks of
+    ``chunk_size`` molecules, so memory use stays bounded however large the
+    file is.
+
+    Parameters
+    ----------
+    sdf_file : str
+        Path to an SDF file (``.sdf`` extension required).
+    chunk_size : int, default 1000
+        Number of molecules per PaDEL run.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per chunk.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+
+    Returns
+    -------
+    iterator of dict
+        One mapping of labels to values per compound, in file order.
+
+    Raises
+    ------
+    RuntimeError
+        While iterating, if PaDEL fails on a chunk or returns the wrong
+        number of rows.
+    """
+    is_sdf = compile(r".*\.sdf$", IGNORECASE)
+    if is_sdf.match(sdf_file) is None:
+        raise ValueError(f"sdf file must have a `.sdf` extension: {sdf_file}")
+    if chunk_size < 1:
+        raise ValueError(f"`chunk_size` must be at least 1: {chunk_size}")
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    return _stream(
+        _chunks(_iter_mol_records(sdf_file), chunk_size), _compute_records_rows, options
+    )
+
+
+def iter_dataframes(
+    molecules,
+    chunksize: int = 10000,
+    descriptors: bool | list = True,
+    fingerprints: bool | list = False,
+    timeout: int = 60,
+    maxruntime: int = -1,
+    threads: int = -1,
+    dtype: str = "float64",
+    bits: str = "uint8",
+    integers: bool = True,
+) -> Iterator[pandas.DataFrame]:
+    """Stream descriptors as pandas DataFrames, one per chunk of molecules.
+
+    Each chunk of ``chunksize`` molecules is one PaDEL run whose CSV is read
+    straight into a DataFrame with compact dtypes (see
+    :func:`~padelpy.frames.read_csv_dataframe`); the next chunk is calculated
+    while the current one is consumed, so memory use is bounded by the chunk
+    size however large the input is.
+
+    Parameters
+    ----------
+    molecules : iterable of str or str
+        SMILES strings (a list, a generator, an open file of lines, ...), or
+        the path of an SDF/MDL file (``.sdf`` or ``.mdl`` extension), which
+        is read record by record. A blank SMILES entry raises
+        ``ValueError``, as in :func:`iter_smiles`.
+    chunksize : int, default 10000
+        Number of molecules per PaDEL run and per DataFrame.
+    descriptors : bool or list of str, default True
+        If True, calculate descriptors. A list of descriptor class and/or
+        output column names calculates only the classes they belong to
+        (see :mod:`padelpy.descriptortypes`).
+    fingerprints : bool or list of str, default False
+        If True, calculate fingerprints. A list of fingerprint class names
+        calculates those fingerprints instead of the bundled default (see
+        :func:`~padelpy.descriptortypes.fingerprint_classes`).
+    timeout : int, default 60
+        Maximum subprocess time in seconds, per chunk.
+    maxruntime : int, default -1
+        Maximum running time per molecule in seconds (``-1`` = unlimited).
+    threads : int, default -1
+        Worker threads (``-1`` = use all available).
+    dtype : str, default "float64"
+        Floating-point dtype of the non-integer columns.
+    bits : {"uint8", "bool"}, default "uint8"
+        Dtype of binary fingerprint columns.
+    integers : bool, default True
+        Store whole-number columns as the smallest integer dtype that holds
+        them. Dtypes are chosen per chunk, so pass False (or cast) when
+        every chunk must have identical dtypes.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        One DataFrame per chunk, indexed by each molecule's position in the
+        input. Molecules PaDEL could not calculate have NaN values.
+
+    Raises
+    ------
+    RuntimeError
+        While iterating, if PaDEL fails on a chunk or returns the wrong
+        number of rows.
+    ValueError
+        While iterating, if a SMILES entry is blank.
+    """
+    _check_frame_options(dtype, bits)
+    if chunksize < 1:
+        raise ValueError(f"`chunksize` must be at least 1: {chunksize}")
+    options = _padel_options(descriptors, fingerprints, timeout, maxruntime, threads)
+    read = partial(_read_frame, dtype=dtype, bits=bits, integers=integers)
+    if isinstance(molecules, str):
+        suffix = compile(r".*(\.sdf|\.mdl)$", IGNORECASE).match(molecules)
+        if suffix is None:
+            raise ValueError(
+                "`molecules` must be an iterable of SMILES or the path of an"
+                f" `.sdf`/`.mdl` file: {molecules}"
+            )
+        return _stream_frames(
+            _chunks(_iter_mol_records(molecules), chunksize),
+            partial(_compute_records_rows, suffix=suffix.group(1), read=read),
+            options,
+        )
+    return _stream_frames(
+        _chunks(_smiles_entries(molecules), chunksize),
+        partial(_compute_smiles_rows, read=read),
+        options,
+    )
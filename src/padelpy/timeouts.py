@@ -0,0 +1,106 @@
+"""Subprocess timeout policies that scale with the size of each PaDEL run."""
+
+from __future__ import annotations
+
+# stdlib. imports
+from time import monotonic
+from typing import NamedTuple
+
+__all__ = [
+    "Deadline",
+    "ScaledTimeout",
+]
+
+
+class ScaledTimeout(NamedTuple):
+    """Allow ``startup + per_molecule * n`` seconds for a run of ``n`` molecules.
+
+    A fixed ``timeout`` is either too short for a large batch or far too long
+    for a small one; this budget grows with the batch, so a split batch gets
+    a proportionally shorter limit. ``startup`` covers JVM start-up and CDK
+    class loading, paid once per run.
+
+    Parameters
+    ----------
+    per_molecule : float, default 2.0
+        Seconds allowed per molecule.
+    startup : float, default 30.0
+        Seconds allowed per run, whatever its size.
+    maximum : float, optional
+        Upper bound on the timeout of any one run.
+
+    Examples
+    --------
+    >>> ScaledTimeout(per_molecule=0.5, startup=20).seconds(100)
+    70.0
+    """
+
+    per_molecule: float = 2.0
+    startup: float = 30.0
+    maximum: float = None
+
+    def seconds(self, molecules: int) -> float:
+        """Subprocess timeout for a run of ``molecules`` molecules."""
+        seconds = self.startup + self.per_molecule * molecules
+        if self.maximum is not None:
+            seconds = min(seconds, self.maximum)
+        return float(seconds)
+
+
+class Deadline:
+    """Give every run whatever is left of ``seconds`` from construction on.
+
+    Use one ``Deadline`` to bound a whole call, including the reruns of
+    batches that are split after timing out: each PaDEL run is allowed the
+    time remaining, and a run that would start after the deadline raises
+    ``TimeoutError`` instead.
+
+    Parameters
+    ----------
+    seconds : float
+        Seconds from now until the deadline.
+
+    Examples
+    --------
+    >>> rows = from_smiles(smiles, timeout=Deadline(600))  # doctest: +SKIP
+    """
+
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError(f"`seconds` must be positive: {seconds}")
+        self.expires = monotonic() + seconds
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.1f})"
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (negative once it has passed)."""
+        return self.expires - monotonic()
+
+    def seconds(self, molecules: int) -> float:
+        """Subprocess timeout for the next run: the time remaining.
+
+        Raises
+        ------
+        TimeoutError
+            If the deadline has already passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise TimeoutError(
+                f"Deadline passed before PaDEL-Descriptor could run {molecules}"
+                " molecule(s)"
+            )
+        return remaining
+
+
+def _is_policy(timeout) -> bool:
+    """Whether ``timeout`` is a policy (has a ``seconds(molecules)`` method)."""
+    return callable(getattr(timeout, "seconds", None))
+
+
+def _timeout_seconds(timeout, molecules: int):
+    """Resolve ``timeout`` (seconds, None or a policy) for a run of ``molecules``."""
+    if _is_policy(timeout):
+        return timeout.seconds(molecules)
+    return timeout
@@ -10,9 +10,20 @@
 from __future__ import annotations
 
 # stdlib. imports
-from os.path import abspath, dirname, join
+from collections.abc import Callable, Iterator
+from hashlib import sha256
+from os import getpid, makedirs, replace, stat
+from os.path import abspath, dirname, exists, join, realpath
+from queue import SimpleQueue
 from shutil import which
 from subprocess import PIPE, Popen, TimeoutExpired
+from tempfile import TemporaryDirectory, gettempdir
+from threading import Event, Thread, get_ident
+
+# PaDELPy imports
+from .instrument import _count, _exit_code, _stage, _timed_call
+from .jvm import JVMOptions, get_default_jvm
+from .progress import Progress, _Cancelled, _follow
 
 # PaDEL-Descriptor is packaged with PaDELPy
 _PADEL_PATH = join(
@@ -20,30 +31,182 @@ _PADEL_PATH = join(
 )
 
 __all__ = [
+    "PaDELTimeoutError",
+    "create_cds_archive",
+    "iter_progress",
     "padeldescriptor",
 ]
 
+# small, varied training input for class-data-sharing archives
+_CDS_TRAINING_SMILES = ["CCO", "c1ccccc1O", "CC(=O)Nc1ccc(O)cc1", "C1CCNCC1"]
+
+# same text as before the dedicated exception, for callers matching on it
+_TIMEOUT_MESSAGE = (
+    "PaDEL-Descriptor encountered an error:"
+    " PaDEL-Descriptor timed out during subprocess call"
+)
+
+
+class PaDELTimeoutError(RuntimeError):
+    """The PaDEL-Descriptor subprocess did not finish within its timeout.
+
+    Raised (and killed) instead of the subprocess' output, so callers can
+    tell a timeout from an error PaDEL reported on stderr.
+    """
+
 
-def _popen_timeout(command: list[str], timeout: int) -> tuple:
+def _popen_timeout(
+    command: list[str],
+    timeout: int,
+    progress: Callable[[Progress], None] = None,
+    cancel: Event = None,
+) -> tuple:
     """Calls PaDEL-Descriptor, with optional subprocess timeout
 
     Args:
         command (list[str]): argv list for subprocess.Popen
         timeout (int): if not None, times out after this many seconds
+        progress (callable): if not None, called with a `Progress` for each
+            molecule PaDEL reports while it runs
+        cancel (threading.Event): with `progress`, kills the process (raising
+            `_Cancelled`) once set
 
     Returns:
         tuple: (stdout of process, stderr of process)
+
+    Raises:
+        PaDELTimeoutError: the process was killed after `timeout` seconds
     """
 
-    p = Popen(command, stdout=PIPE, stderr=PIPE)
+    with _stage("spawn"):
+        p = Popen(command, stdout=PIPE, stderr=PIPE)
     try:
-        return p.communicate(timeout=timeout)
+        with _stage("padel"):
+            if progress is None:
+                output = p.communicate(timeout=timeout)
+            else:
+                output = _follow(p, timeout, progress, cancel)
     except TimeoutExpired:
-        p.kill()
-        p.communicate()
-        return (-1, b"PaDEL-Descriptor timed out during subprocess call")
+        if progress is None:
+            # _follow has already killed the process and drained its pipes
+            p.kill()
+            p.communicate()
+        _count("timeouts")
+        _exit_code(p.returncode)
+        raise PaDELTimeoutError(_TIMEOUT_MESSAGE) from None
+    _exit_code(p.returncode)
+    return output
 
 
+def _java_not_found(java: str) -> ReferenceError:
+    if java != "java":
+        return ReferenceError(
+            f"Java executable not found: {java!r} (required for"
+            " PaDEL-Descriptor). Check `JVMOptions.java`."
+        )
+    return ReferenceError(
+        "Java not found on PATH (required for PaDEL-Descriptor). "
+        "Install a Java JRE 8+ and ensure the `java` executable is available "
+        "in this environment (for example, `java -version` succeeds)."
+    )
+
+
+def _padel_command(
+    maxruntime: int = -1,
+    waitingjobs: int = -1,
+    threads: int = -1,
+    d_2d: bool = False,
+    d_3d: bool = False,
+    config: str = None,
+    convert3d: bool = False,
+    descriptortypes: str = None,
+    detectaromaticity: bool = False,
+    mol_dir: str = None,
+    d_file: str = None,
+    fingerprints: bool = False,
+    log: bool = False,
+    maxcpdperfile: int = 0,
+    removesalt: bool = False,
+    retain3d: bool = False,
+    retainorder: bool = True,
+    standardizenitro: bool = False,
+    standardizetautomers: bool = False,
+    tautomerlist: str = None,
+    usefilenameasmolname: bool = False,
+    headless: bool = True,
+    jvm: JVMOptions = None,
+) -> list[str]:
+    """Build the PaDEL-Descriptor argv for ``padeldescriptor`` options.
+
+    ``jvm`` defaults to :func:`~padelpy.jvm.get_default_jvm`. Raises
+    ``ReferenceError`` if its ``java`` executable is not found.
+    """
+    if jvm is None:
+        jvm = get_default_jvm()
+    if which(jvm.java) is None:
+        raise _java_not_found(jvm.java)
+    command: list[str] = [jvm.java, *jvm.args()]
+    if headless:
+        command.append("-Djava.awt.headless=true")
+    command.extend(["-jar", _PADEL_PATH])
+    command.extend(
+        [
+            "-maxruntime",
+            str(maxruntime),
+            "-waitingjobs",
+            str(waitingjobs),
+            "-threads",
+            str(threads),
+            "-maxcpdperfile",
+            str(maxcpdperfile),
+        ]
+    )
+    if d_2d is True:
+        command.append("-2d")
+    if d_3d is True:
+        command.append("-3d")
+    if config is not None:
+        command.extend(["-config", config])
+    if convert3d is True:
+        command.append("-convert3d")
+    if descriptortypes is not None:
+        command.extend(["-descriptortypes", descriptortypes])
+    if detectaromaticity is True:
+        command.append("-detectaromaticity")
+    if mol_dir is not None:
+        command.extend(["-dir", mol_dir])
+    if d_file is not None:
+        command.extend(["-file", d_file])
+    if fingerprints is True:
+        command.append("-fingerprints")
+    if log is True:
+        command.append("-log")
+    if removesalt is True:
+        command.append("-removesalt")
+    if retain3d is True:
+        command.append("-retain3d")
+    if retainorder is True:
+        command.append("-retainorder")
+    if standardizenitro is True:
+        command.append("-standardizenitro")
+    if standardizetautomers is True:
+        command.append("-standardizetautomers")
+    if tautomerlist is not None:
+        command.extend(["-tautomerlist", tautomerlist])
+    if usefilenameasmolname is True:
+        command.append("-usefilenameasmolname")
+    return command
+
+
+def _raise_for_stderr(err: bytes) -> None:
+    """Raise ``RuntimeError`` if PaDEL wrote anything to stderr."""
+    if err != b"":
+        raise RuntimeError(
+            "PaDEL-Descriptor encountered an error: {}".format(err.decode("utf-8"))
+        )
+
+
+@_timed_call
 def padeldescriptor(
     maxruntime: int = -1,
     waitingjobs: int = -1,
@@ -68,6 +231,8 @@ def padeldescriptor(
     usefilenameasmolname: bool = False,
     sp_timeout: int = None,
     headless: bool = True,
+    progress: Callable[[Progress], None] = None,
+    jvm: JVMOptions = None,
 ) -> None:
     """Run the bundled PaDEL-Descriptor CLI with the given options.
 
@@ -119,6 +284,14 @@ def padeldescriptor(
         Subprocess timeout in seconds; ``None`` waits indefinitely.
     headless : bool, default True
         If True, run Java headless (no PaDEL splash window).
+    progress : callable, optional
+        Called with a :class:`~padelpy.progress.Progress` each time PaDEL
+        finishes a molecule, from the calling thread while PaDEL runs. An
+        exception raised by the callback kills PaDEL and propagates.
+    jvm : JVMOptions, optional
+        Java executable, heap size, garbage collector, class-data-sharing
+        archive and extra flags (see :class:`~padelpy.jvm.JVMOptions`).
+        Defaults to the options set with :func:`~padelpy.jvm.set_default_jvm`.
 
     Returns
     -------
@@ -129,69 +302,176 @@ def padeldescriptor(
     ReferenceError
         If ``java`` is not found on ``PATH``.
     RuntimeError
-        If PaDEL reports an error on stderr or the subprocess times out.
+        If PaDEL reports an error on stderr (:class:`PaDELTimeoutError` if
+        the subprocess times out).
+    ValueError
+        If ``jvm`` holds an invalid heap size or garbage collector.
     """
 
-    if which("java") is None:
-        raise ReferenceError(
-            "Java not found on PATH (required for PaDEL-Descriptor). "
-            "Install a Java JRE 8+ and ensure the `java` executable is available "
-            "in this environment (for example, `java -version` succeeds)."
-        )
-    command: list[str] = ["java"]
-    if headless:
-        command.append("-Djava.awt.headless=true")
-    command.extend(["-jar", _PADEL_PATH])
-    command.extend(
-        [
-            "-maxruntime",
-            str(maxruntime),
-            "-waitingjobs",
-            str(waitingjobs),
-            "-threads",
-            str(threads),
-            "-maxcpdperfile",
-            str(maxcpdperfile),
-        ]
+    command = _padel_command(
+        maxruntime=maxruntime,
+        waitingjobs=waitingjobs,
+        threads=threads,
+        d_2d=d_2d,
+        d_3d=d_3d,
+        config=config,
+        convert3d=convert3d,
+        descriptortypes=descriptortypes,
+        detectaromaticity=detectaromaticity,
+        mol_dir=mol_dir,
+        d_file=d_file,
+        fingerprints=fingerprints,
+        log=log,
+        maxcpdperfile=maxcpdperfile,
+        removesalt=removesalt,
+        retain3d=retain3d,
+        retainorder=retainorder,
+        standardizenitro=standardizenitro,
+        standardizetautomers=standardizetautomers,
+        tautomerlist=tautomerlist,
+        usefilenameasmolname=usefilenameasmolname,
+        headless=headless,
+        jvm=jvm,
     )
-    if d_2d is True:
-        command.append("-2d")
-    if d_3d is True:
-        command.append("-3d")
-    if config is not None:
-        command.extend(["-config", config])
-    if convert3d is True:
-        command.append("-convert3d")
-    if descriptortypes is not None:
-        command.extend(["-descriptortypes", descriptortypes])
-    if detectaromaticity is True:
-        command.append("-detectaromaticity")
-    if mol_dir is not None:
-        command.extend(["-dir", mol_dir])
-    if d_file is not None:
-        command.extend(["-file", d_file])
-    if fingerprints is True:
-        command.append("-fingerprints")
-    if log is True:
-        command.append("-log")
-    if removesalt is True:
-        command.append("-removesalt")
-    if retain3d is True:
-        command.append("-retain3d")
-    if retainorder is True:
-        command.append("-retainorder")
-    if standardizenitro is True:
-        command.append("-standardizenitro")
-    if standardizetautomers is True:
-        command.append("-standardizetautomers")
-    if tautomerlist is not None:
-        command.extend(["-tautomerlist", tautomerlist])
-    if usefilenameasmolname is True:
-        command.append("-usefilenameasmolname")
+    _, err = _popen_timeout(command, sp_timeout, progress=progress)
+    _raise_for_stderr(err)
+    return
 
-    _, err = _popen_timeout(command, sp_timeout)
-    if err != b"":
+
+def iter_progress(sp_timeout: int = None, **options) -> Iterator[Progress]:
+    """Run PaDEL-Descriptor in a background thread, yielding its progress.
+
+    Takes the same keyword arguments as :func:`padeldescriptor` (except
+    ``progress``) and yields a :class:`~padelpy.progress.Progress` each time
+    PaDEL finishes a molecule. Closing the iterator early (for example by
+    breaking out of the loop) kills PaDEL.
+
+    Raises
+    ------
+    ReferenceError
+        If ``java`` is not found on ``PATH``.
+    RuntimeError
+        Once the updates are exhausted, if PaDEL reported an error on stderr
+        (:class:`PaDELTimeoutError` if the subprocess timed out).
+
+    Examples
+    --------
+    >>> for update in iter_progress(mol_dir="in.smi", d_2d=True):  # doctest: +SKIP
+    ...     print(f"{update.processed}/{update.total}, eta {update.eta}")
+    """
+    command = _padel_command(**options)
+    updates = SimpleQueue()
+    cancel = Event()
+    done = object()
+
+    def _run() -> None:
+        try:
+            _, err = _popen_timeout(command, sp_timeout, updates.put, cancel)
+            _raise_for_stderr(err)
+        except _Cancelled:
+            pass
+        except BaseException as exc:
+            updates.put(exc)
+        updates.put(done)
+
+    runner = Thread(target=_run, daemon=True)
+    runner.start()
+    try:
+        while (update := updates.get()) is not done:
+            if isinstance(update, BaseException):
+                raise update
+            yield update
+    finally:
+        cancel.set()
+        runner.join()
+
+
+def _default_cds_path(jvm: JVMOptions) -> str:
+    """Archive location keyed on the Java binary and the bundled JAR.
+
+    A class-data-sharing archive only works with the JVM build and class
+    path that created it, so either one changing selects a new archive.
+    """
+    java = realpath(which(jvm.java))
+    material = [java, _PADEL_PATH]
+    for path in (java, _PADEL_PATH):
+        info = stat(path)
+        material.extend([info.st_size, info.st_mtime_ns])
+    key = sha256(repr(material).encode("utf-8")).hexdigest()[:16]
+    return join(gettempdir(), "padelpy-cds", f"padel-{key}.jsa")
+
+
+def create_cds_archive(
+    path: str = None, jvm: JVMOptions = None, force: bool = False
+) -> str:
+    """Create a class-data-sharing archive that speeds up PaDEL's JVM start-up.
+
+    PaDEL-Descriptor is run once on a few small molecules (2-D and 3-D
+    descriptors and fingerprints) with ``-XX:ArchiveClassesAtExit``, which
+    records every class it loads from the bundled JARs. Passing the archive
+    as ``JVMOptions(cds_archive=...)`` lets later JVMs map those classes
+    instead of loading and verifying them again. Requires Java 13 or newer;
+    ``benchmarks/run.py --only cold_start`` compares start-up with and
+    without the archive.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to write the archive. By default a location under the system
+        temporary directory keyed on the Java executable and the bundled
+        JAR, so an archive is reused until either changes.
+    jvm : JVMOptions, optional
+        JVM used to create (and later use) the archive; its own
+        ``cds_archive`` is ignored. Defaults to
+        :func:`~padelpy.jvm.get_default_jvm`.
+    force : bool, default False
+        If True, recreate the archive even if ``path`` exists.
+
+    Returns
+    -------
+    str
+        Path of the archive.
+
+    Raises
+    ------
+    ReferenceError
+        If the Java executable is not found.
+    RuntimeError
+        If the JVM could not create the archive (for example Java < 13).
+    """
+    if jvm is None:
+        jvm = get_default_jvm()
+    jvm = jvm._replace(cds_archive=None)
+    if which(jvm.java) is None:
+        raise _java_not_found(jvm.java)
+    if path is None:
+        path = _default_cds_path(jvm)
+    if exists(path) and not force:
+        return path
+
+    makedirs(dirname(abspath(path)), exist_ok=True)
+    partial = f"{path}.{getpid()}.{get_ident()}.tmp.jsa"
+    training = jvm._replace(flags=(*jvm.flags, f"-XX:ArchiveClassesAtExit={partial}"))
+    with TemporaryDirectory(prefix="padelpy_") as tmpdir:
+        smi = join(tmpdir, "training.smi")
+        with open(smi, "w", encoding="utf-8") as smi_file:
+            smi_file.write("\n".join(_CDS_TRAINING_SMILES))
+        command = _padel_command(
+            d_2d=True,
+            d_3d=True,
+            convert3d=True,
+            fingerprints=True,
+            mol_dir=smi,
+            d_file=join(tmpdir, "training.csv"),
+            jvm=training,
+        )
+        out, err = _popen_timeout(command, None)
+    if not exists(partial):
         raise RuntimeError(
-            "PaDEL-Descriptor encountered an error: {}".format(err.decode("utf-8"))
+            "Java could not create a class-data-sharing archive (Java 13 or"
+            " newer is required): {}".format(
+                (err or out or b"").decode("utf-8", "replace").strip()
+            )
         )
-    return
+    replace(partial, path)
+    return path
@@ -0,0 +1,245 @@
+"""Unit tests for padelpy.aio with a fake PaDEL subprocess (no Java)."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import afrom_sdf, afrom_smiles, aio, apadeldescriptor
+from padelpy.aio import _acommunicate
+from padelpy.timeouts import ScaledTimeout
+from padelpy.wrapper import PaDELTimeoutError
+
+_SLEEP = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def _arg(command: list[str], flag: str) -> str:
+    return command[command.index(flag) + 1]
+
+
+def _fake_padel(rows: list[str], calls: list | None = None):
+    """``_acommunicate`` stand-in that writes ``Name,nC`` rows to ``-file``."""
+
+    async def _communicate(command, timeout):
+        if calls is not None:
+            calls.append(command)
+        Path(_arg(command, "-file")).write_text(
+            "\n".join(["Name,nC", *rows]) + "\n", encoding="utf-8"
+        )
+        return b"", b""
+
+    return _communicate
+
+
+def test_acommunicate_timeout_kills_process() -> None:
+    procs = []
+    create = asyncio.create_subprocess_exec
+
+    async def _spy(*args, **kwargs):
+        procs.append(await create(*args, **kwargs))
+        return procs[-1]
+
+    with patch("padelpy.aio.asyncio.create_subprocess_exec", _spy):
+        with pytest.raises(PaDELTimeoutError, match="timed out"):
+            asyncio.run(_acommunicate(_SLEEP, timeout=0.2))
+    assert procs[0].returncode is not None
+
+
+def test_cancellation_kills_process() -> None:
+    procs = []
+    create = asyncio.create_subprocess_exec
+
+    async def _spy(*args, **kwargs):
+        procs.append(await create(*args, **kwargs))
+        return procs[-1]
+
+    async def _main():
+        task = asyncio.create_task(_acommunicate(_SLEEP, timeout=None))
+        while not procs:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch("padelpy.aio.asyncio.create_subprocess_exec", _spy):
+        asyncio.run(_main())
+    assert procs[0].returncode is not None
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+@patch("padelpy.aio._acommunicate")
+def test_apadeldescriptor_raises_on_stderr(mock_comm, _mock_which) -> None:
+    async def _fail(command, timeout):
+        return b"", b"boom"
+
+    mock_comm.side_effect = _fail
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(apadeldescriptor(mol_dir="in.smi", d_file="out.csv", d_2d=True))
+    command, timeout = mock_comm.call_args.args
+    assert "-2d" in command and timeout is None
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_semaphore_limits_concurrent_processes(_mock_which) -> None:
+    running = peak = 0
+
+    async def _communicate(command, timeout):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return b"", b""
+
+    async def _main():
+        semaphore = asyncio.Semaphore(2)
+        await asyncio.gather(
+            *(apadeldescriptor(semaphore=semaphore, mol_dir="x") for _ in range(6))
+        )
+
+    with patch("padelpy.aio._acommunicate", _communicate):
+        asyncio.run(_main())
+    assert peak == 2
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_smiles_matches_sync_contract(_mock_which) -> None:
+    calls = []
+    fake = _fake_padel(["AUTOGEN_1,1", "AUTOGEN_2,2"], calls)
+    with patch("padelpy.aio._acommunicate", fake):
+        rows = asyncio.run(afrom_smiles(["C", "CC"], timeout=5))
+    assert rows == [{"nC": "1"}, {"nC": "2"}]
+    assert len(calls) == 1
+    smi = Path(_arg(calls[0], "-dir"))
+    assert not smi.exists()  # temporary input removed after the run
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_file_io_runs_off_the_event_loop(_mock_which) -> None:
+    threads = {}
+
+    def _spy(name, func):
+        def _call(*args):
+            threads[name] = threading.current_thread()
+            return func(*args)
+
+        return _call
+
+    patches = [
+        patch(f"padelpy.aio.{name}", _spy(name, getattr(aio, name)))
+        for name in ("_count_input_molecules", "_read_padel_csv_rows", "_write_smiles")
+    ]
+    with patch("padelpy.aio._acommunicate", _fake_padel(["AUTOGEN_1,1"])):
+        for spy in patches:
+            spy.start()
+        try:
+            policy = ScaledTimeout(per_molecule=1, startup=5)
+            assert asyncio.run(afrom_smiles("C", timeout=policy)) == {"nC": "1"}
+        finally:
+            for spy in patches:
+                spy.stop()
+    assert set(threads) == {
+        "_count_input_molecules",
+        "_read_padel_csv_rows",
+        "_write_smiles",
+    }
+    assert threading.main_thread() not in threads.values()
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_smiles_retries_then_raises(_mock_which) -> None:
+    calls = []
+
+    async def _fail(command, timeout):
+        calls.append(command)
+        return -1, b"Exception in thread main: java.lang.OutOfMemoryError"
+
+    with patch("padelpy.aio._acommunicate", _fail):
+        with pytest.raises(RuntimeError, match="OutOfMemoryError"):
+            asyncio.run(afrom_smiles("C"))
+    assert len(calls) == 3
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_smiles_resolves_policy_and_splits_timeouts(_mock_which) -> None:
+    timeouts = []
+
+    async def _time_out(command, timeout):
+        timeouts.append(timeout)
+        raise PaDELTimeoutError("PaDEL-Descriptor timed out during subprocess call")
+
+    policy = ScaledTimeout(per_molecule=2, startup=5)
+    with patch("padelpy.aio._acommunicate", _time_out):
+        with pytest.raises(PaDELTimeoutError):
+            asyncio.run(afrom_smiles(["C", "CC", "CCC"], timeout=policy))
+    # no retry: the batch of three is split and its first single molecule raises
+    assert timeouts == [11.0, 7.0]
+
+
+def _split_padel(calls: list):
+    """``_acommunicate`` stand-in that times out on any multi-molecule input."""
+
+    async def _communicate(command, timeout):
+        mol_path = Path(_arg(command, "-dir"))
+        text = mol_path.read_text(encoding="utf-8")
+        if mol_path.suffix == ".smi":
+            names = text.splitlines()
+        else:
+            names = [record.split("\n")[0] for record in text.split("$$$$\n")[:-1]]
+        calls.append(names)
+        if len(names) > 1:
+            raise PaDELTimeoutError("PaDEL-Descriptor timed out during subprocess call")
+        Path(_arg(command, "-file")).write_text(
+            f"Name,nC\n{names[0]},{len(names[0])}\n", encoding="utf-8"
+        )
+        return b"", b""
+
+    return _communicate
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_smiles_splits_timed_out_batch(_mock_which, tmp_path) -> None:
+    calls = []
+    out = tmp_path / "out.csv"
+    with patch("padelpy.aio._acommunicate", _split_padel(calls)):
+        rows = asyncio.run(afrom_smiles(["C", "CC", "CCC"], output_csv=str(out)))
+    assert rows == [{"nC": "1"}, {"nC": "2"}, {"nC": "3"}]
+    assert calls == [["C", "CC", "CCC"], ["C"], ["CC", "CCC"], ["CC"], ["CCC"]]
+    assert out.read_text(encoding="utf-8").splitlines()[1:] == ["C,1", "CC,2", "CCC,3"]
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_sdf_splits_timed_out_file(_mock_which, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text(
+        "".join(f"{name}\n\n  0  0\nM  END\n$$$$\n" for name in ("a", "bb")),
+        encoding="utf-8",
+    )
+    calls = []
+    with patch("padelpy.aio._acommunicate", _split_padel(calls)):
+        rows = asyncio.run(afrom_sdf(str(sdf)))
+    assert rows == [{"nC": "1"}, {"nC": "2"}]
+    assert calls == [["a", "bb"], ["a"], ["bb"]]
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_afrom_sdf_writes_output_csv(_mock_which, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("m\n\n  0  0\nM  END\n$$$$\n", encoding="utf-8")
+    out = tmp_path / "out.csv"
+    with patch("padelpy.aio._acommunicate", _fake_padel(["m,1"])):
+        rows = asyncio.run(afrom_sdf(str(sdf), output_csv=str(out)))
+    assert rows == [{"nC": "1"}]
+    assert out.read_text(encoding="utf-8").startswith("Name,nC")
+
+
+def test_async_input_validation() -> None:
+    with pytest.raises(RuntimeError, match="Unknown input format"):
+        asyncio.run(afrom_smiles(42))  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match=r"\.sdf"):
+        asyncio.run(afrom_sdf("mols.mdl"))
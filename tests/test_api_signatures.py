@@ -20,6 +20,14 @@ _EXPECTED_SIGNATURES: dict[str, list[tuple[str, object]]] = {
         ("timeout", 60),
         ("maxruntime", -1),
         ("threads", -1),
+        ("coalescer", None),
+        ("cache", None),
+        ("output", "dict"),
+        ("dtype", "float64"),
+        ("on_error", "raise"),
+        ("mode", None),
+        ("dedup", False),
+        ("jvm", None),
     ],
     "from_mdl": [
         ("mdl_file", _EMPTY),
@@ -29,6 +37,13 @@ _EXPECTED_SIGNATURES: dict[str, list[tuple[str, object]]] = {
         ("timeout", 60),
         ("maxruntime", -1),
         ("threads", -1),
+        ("coalescer", None),
+        ("cache", None),
+        ("output", "dict"),
+        ("dtype", "float64"),
+        ("mode", None),
+        ("dedup", False),
+        ("jvm", None),
     ],
     "from_sdf": [
         ("sdf_file", _EMPTY),
@@ -38,6 +53,13 @@ _EXPECTED_SIGNATURES: dict[str, list[tuple[str, object]]] = {
         ("timeout", 60),
         ("maxruntime", -1),
         ("threads", -1),
+        ("coalescer", None),
+        ("cache", None),
+        ("output", "dict"),
+        ("dtype", "float64"),
+        ("mode", None),
+        ("dedup", False),
+        ("jvm", None),
     ],
     "padeldescriptor": [
         ("maxruntime", -1),
@@ -63,6 +85,8 @@ _EXPECTED_SIGNATURES: dict[str, list[tuple[str, object]]] = {
         ("usefilenameasmolname", False),
         ("sp_timeout", None),
         ("headless", True),
+        ("progress", None),
+        ("jvm", None),
     ],
 }
 
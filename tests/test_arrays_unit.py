@@ -0,0 +1,83 @@
+"""Unit tests for array output (padelpy.arrays) with mocked padeldescriptor."""
+
+from __future__ import annotations
+
+import builtins
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf, from_smiles
+from padelpy.arrays import DescriptorArray, _rows_to_array
+
+np = pytest.importorskip("numpy")
+
+
+def _padel_writes(text: str):
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text(text, encoding="utf-8")
+
+    return _side_effect
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_array_output(mock_padel) -> None:
+    mock_padel.side_effect = _padel_writes(
+        "Name,MW,nC,Lipinski\nAUTOGEN_1,44.06,3,\nAUTOGEN_2,58.08,4,Infinity\n"
+    )
+    result = from_smiles(["CCC", "CCCC"], output="array")
+    assert isinstance(result, DescriptorArray)
+    assert result.columns == ["MW", "nC", "Lipinski"]
+    assert result.values.dtype == np.float64
+    assert result.values.shape == (2, 3)
+    np.testing.assert_array_equal(result.values[:, 1], [3.0, 4.0])
+    assert np.isnan(result.values[0, 2])
+    assert np.isinf(result.values[1, 2])
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_single_array_is_two_dimensional(mock_padel) -> None:
+    mock_padel.side_effect = _padel_writes("Name,MW\nAUTOGEN_1,44.06\n")
+    columns, values = from_smiles("CCC", output="array", dtype="float32")
+    assert columns == ["MW"]
+    assert values.shape == (1, 1)
+    assert values.dtype == np.float32
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_array_output_non_numeric_cells_are_nan(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mol.sdf"
+    sdf.write_text("mol\n\n  0  0\nM  END\n$$$$\n")
+    mock_padel.side_effect = _padel_writes("Name,MW,note\nmol,180.04, n/a \n")
+    result = from_sdf(str(sdf), output="array")
+    assert result.values[0, 0] == pytest.approx(180.04)
+    assert np.isnan(result.values[0, 1])
+
+
+def test_rows_to_array_empty_rows() -> None:
+    result = _rows_to_array([])
+    assert result.columns == []
+    assert result.values.shape == (0, 0)
+
+
+def test_invalid_output_raises_value_error_before_padel() -> None:
+    with patch("padelpy.functions.padeldescriptor") as mock_padel:
+        with pytest.raises(ValueError, match="output"):
+            from_smiles("CCC", output="table")
+        with pytest.raises(ValueError, match="dtype"):
+            from_smiles("CCC", output="array", dtype="int32")
+    mock_padel.assert_not_called()
+
+
+def test_array_output_without_numpy_raises_import_error(monkeypatch) -> None:
+    real_import = builtins.__import__
+
+    def _no_numpy(name, *args, **kwargs):
+        if name == "numpy":
+            raise ImportError("No module named 'numpy'")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", _no_numpy)
+    with pytest.raises(ImportError, match=r"padelpy\[numpy\]"):
+        from_smiles("CCC", output="array")
@@ -0,0 +1,247 @@
+"""Unit tests for padelpy.backends with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Event, Thread
+from time import sleep
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf_sharded, from_smiles_sharded
+from padelpy.backends import (
+    Backend,
+    DirectoryBackend,
+    LocalBackend,
+    PaDELTask,
+    run_task,
+    serve_directory,
+)
+from padelpy.jvm import JVMOptions
+from padelpy.timeouts import Deadline, ScaledTimeout
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class _InlineBackend(Backend):
+    """Runs each task as it is submitted, recording it."""
+
+    def __init__(self) -> None:
+        self.tasks = []
+
+    def submit(self, task: PaDELTask) -> Future:
+        self.tasks.append(task)
+        future = Future()
+        future.set_result(run_task(task))
+        return future
+
+
+@pytest.fixture()
+def worker(tmp_path):
+    """A serve_directory worker thread on a spool under ``tmp_path``."""
+    spool = str(tmp_path / "spool")
+    stop = Event()
+    thread = Thread(target=serve_directory, args=(spool, stop, 0.01), daemon=True)
+    thread.start()
+    yield spool
+    stop.set()
+    thread.join()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sharded_on_caller_executor(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    smiles = ["C" * n for n in range(1, 8)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result = from_smiles_sharded(smiles, shard_size=3, executor=pool)
+        # the caller's executor is still usable afterwards
+        assert pool.submit(len, "ab").result() == 2
+    assert [row["nC"] for row in result.rows] == [str(n) for n in range(1, 8)]
+    assert [(s.start, s.stop) for s in result.shards] == [(0, 3), (3, 6), (6, 7)]
+    assert mock_padel.call_count == 3
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_custom_and_local_backends(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    backend = _InlineBackend()
+    result = from_smiles_sharded(["C", "CC", "CCC"], shard_size=2, executor=backend)
+    assert [row["nC"] for row in result.rows] == ["1", "2", "3"]
+    assert len(backend.tasks) == 2
+    assert backend.tasks[0].options["threads"] == 1
+
+    with LocalBackend(workers=2) as local:
+        result = from_smiles_sharded(["C", "CC"], shard_size=1, executor=local)
+    assert [row["nC"] for row in result.rows] == ["1", "2"]
+
+    with pytest.raises(TypeError, match="executor"):
+        from_smiles_sharded(["C"], executor=object())
+
+    class _NoSubmit(Backend):
+        pass
+
+    with pytest.raises(TypeError, match="submit"):
+        _NoSubmit()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_ships_files_to_worker(mock_padel, worker, tmp_path) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        result = from_smiles_sharded(
+            ["C", "CC", "CCC"],
+            shard_size=2,
+            descriptors=["nC"],
+            executor=backend,
+        )
+    assert [row["nC"] for row in result.rows] == ["1", "2", "3"]
+    # the worker only saw copies inside the spool, including descriptortypes
+    for call in mock_padel.call_args_list:
+        assert call.kwargs["mol_dir"].startswith(worker)
+        assert call.kwargs["descriptortypes"].startswith(worker)
+    assert all(not any(Path(worker, d).iterdir()) for d in ("pending", "done"))
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_ships_jvm_options(mock_padel, worker) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    jvm = JVMOptions(max_heap="1g", flags=("-Xss4m",))
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        from_smiles_sharded(["C", "CC"], shard_size=1, executor=backend, jvm=jvm)
+    assert [call.kwargs["jvm"] for call in mock_padel.call_args_list] == [jvm, jvm]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_resolves_scaled_timeout(mock_padel, worker) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    policy = ScaledTimeout(per_molecule=2, startup=5)
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        from_smiles_sharded(
+            ["C", "CC", "CCC"], shard_size=2, timeout=policy, executor=backend
+        )
+    # seconds for each shard's size, not the policy's fields
+    timeouts = sorted(call.kwargs["sp_timeout"] for call in mock_padel.call_args_list)
+    assert timeouts == [7.0, 9.0]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_resolves_deadline(mock_padel, worker, tmp_path) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    deadline = Deadline(60)
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        from_smiles_sharded(["C", "CC"], timeout=deadline, executor=backend)
+        assert 0 < mock_padel.call_args.kwargs["sp_timeout"] <= 60
+
+        smi = tmp_path / "late.smi"
+        smi.write_text("CCC", encoding="utf-8")
+        task = PaDELTask(str(smi), str(tmp_path / "late.csv"), {"sp_timeout": deadline})
+        with patch("padelpy.timeouts.monotonic", return_value=deadline.expires):
+            with pytest.raises(TimeoutError, match="Deadline passed"):
+                backend.submit(task)
+    assert not any(Path(worker, "incoming").iterdir())
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_sdf_shards(mock_padel, worker, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("".join(f"m{idx}\n\n  0  0\nM  END\n$$$$\n" for idx in range(5)))
+
+    def _names(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        names = [block.split("\n")[0] for block in text.split("$$$$\n")[:-1]]
+        rows = ["Name,n"] + [f"{name},{name[1:]}" for name in names]
+        Path(kwargs["d_file"]).write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    mock_padel.side_effect = _names
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        result = from_sdf_sharded(str(sdf), shard_size=2, executor=backend)
+    assert [row["n"] for row in result.rows] == ["0", "1", "2", "3", "4"]
+    assert mock_padel.call_args.kwargs["mol_dir"].endswith(".sdf")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_reports_worker_errors(mock_padel, worker) -> None:
+    mock_padel.side_effect = RuntimeError("JVM crashed")
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        with pytest.raises(RuntimeError, match="JVM crashed"):
+            from_smiles_sharded(["CCC"], executor=backend)
+
+
+def test_directory_backend_times_out_without_worker(tmp_path) -> None:
+    smi = tmp_path / "in.smi"
+    smi.write_text("CCC", encoding="utf-8")
+    spool = tmp_path / "spool"
+    backend = DirectoryBackend(str(spool), poll_interval=0.01, timeout=0.05)
+    future = backend.submit(PaDELTask(str(smi), str(tmp_path / "out.csv"), {}))
+    with pytest.raises(TimeoutError, match="No worker"):
+        future.result(timeout=5)
+    backend.shutdown()
+    assert not any((spool / "pending").iterdir())
+    with pytest.raises(RuntimeError, match="shut down"):
+        backend.submit(PaDELTask(str(smi), str(tmp_path / "out.csv"), {}))
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_directory_backend_survives_unwritable_output(
+    mock_padel, worker, tmp_path
+) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    smi = tmp_path / "in.smi"
+    smi.write_text("CCC", encoding="utf-8")
+    with DirectoryBackend(worker, poll_interval=0.01) as backend:
+        lost = backend.submit(
+            PaDELTask(str(smi), str(tmp_path / "missing" / "out.csv"), {})
+        )
+        with pytest.raises(FileNotFoundError):
+            lost.result(timeout=5)
+        # the watcher keeps running for later tasks
+        ok = backend.submit(PaDELTask(str(smi), str(tmp_path / "out.csv"), {}))
+        assert ok.result(timeout=5) >= 0
+    assert not any((Path(worker) / "done").iterdir())
+
+
+def test_directory_backend_fails_task_with_corrupt_status(tmp_path) -> None:
+    smi = tmp_path / "in.smi"
+    smi.write_text("CCC", encoding="utf-8")
+    spool = tmp_path / "spool"
+    backend = DirectoryBackend(str(spool), poll_interval=0.01)
+    future = backend.submit(PaDELTask(str(smi), str(tmp_path / "out.csv"), {}))
+    (task_id,) = [path.name for path in (spool / "pending").iterdir()]
+    (spool / "pending" / task_id).rename(spool / "done" / task_id)
+    (spool / "done" / task_id / "status.json").write_text("{", encoding="utf-8")
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    backend.shutdown()
+    assert not any((spool / "done").iterdir())
+
+
+def test_directory_backend_times_out_claimed_task(tmp_path) -> None:
+    smi = tmp_path / "in.smi"
+    smi.write_text("CCC", encoding="utf-8")
+    spool = tmp_path / "spool"
+    backend = DirectoryBackend(str(spool), poll_interval=0.01, timeout=0.05)
+    future = backend.submit(PaDELTask(str(smi), str(tmp_path / "out.csv"), {}))
+    # a worker claims the task, then dies without leaving a result
+    (task_id,) = [path.name for path in (spool / "pending").iterdir()]
+    (spool / "pending" / task_id).rename(spool / "running" / task_id)
+    with pytest.raises(TimeoutError, match="No worker"):
+        future.result(timeout=5)
+
+    # a result that turns up afterwards is discarded
+    (spool / "running" / task_id).rename(spool / "done" / task_id)
+    (spool / "done" / task_id / "status.json").write_text(
+        '{"ok": true, "seconds": 1.0}', encoding="utf-8"
+    )
+    for _ in range(500):
+        if not (spool / "done" / task_id).exists():
+            break
+        sleep(0.01)
+    assert not (spool / "done" / task_id).exists()
+    assert not (tmp_path / "out.csv").exists()
+    backend.shutdown()
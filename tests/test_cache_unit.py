@@ -0,0 +1,173 @@
+"""Unit tests for padelpy.cache with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from multiprocessing import get_context
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import DescriptorCache, from_sdf, from_smiles
+from padelpy.cache import _content_hash, _stable_options
+from padelpy.checkpoint import _job_identity
+from padelpy.scheduler import _mode_key
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _fill_cache(path: str, offset: int) -> None:
+    cache = DescriptorCache(path)
+    cache.put_many({f"key{offset}-{idx}": {"nC": str(idx)} for idx in range(50)})
+
+
+@pytest.fixture
+def cache(tmp_path) -> DescriptorCache:
+    return DescriptorCache(str(tmp_path / "cache.sqlite3"))
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_cache_sends_only_misses(mock_padel, cache) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    first = from_smiles(["CCC", "CCCC"], cache=cache)
+    second = from_smiles(["CCCC", "CCCCC", "CCC"], cache=cache)
+    assert [row["nC"] for row in first] == ["3", "4"]
+    assert [row["nC"] for row in second] == ["4", "5", "3"]
+    assert mock_padel.call_count == 2
+    last_input = Path(mock_padel.call_args.kwargs["mol_dir"])
+    assert not last_input.exists()  # temp input cleaned up
+    assert cache.hits == 2
+    assert cache.misses == 3
+    assert cache.stats()["entries"] == 3
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_all_hits_skip_padel_and_write_csv(
+    mock_padel, cache, tmp_path
+) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    from_smiles("CCC", cache=cache)
+    out = tmp_path / "out.csv"
+    row = from_smiles("CCC", cache=cache, output_csv=str(out))
+    assert row == {"nC": "3"}
+    assert mock_padel.call_count == 1
+    assert out.read_text(encoding="utf-8").splitlines() == ["Name,nC", "AUTOGEN_CCC,3"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_cache_key_depends_on_output_options_only(mock_padel, cache) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    from_smiles("CCC", cache=cache, threads=1, timeout=10)
+    from_smiles("CCC", cache=cache, threads=4, timeout=99)
+    assert mock_padel.call_count == 1
+    from_smiles("CCC", cache=cache, fingerprints=True)
+    assert mock_padel.call_count == 2
+
+
+def test_cache_key_tracks_descriptor_types_content(cache, tmp_path) -> None:
+    types = tmp_path / "types.xml"
+    types.write_text("<Root/>", encoding="utf-8")
+    before = cache.key("CCC", {"descriptortypes": str(types)})
+    types.write_text("<Root></Root>", encoding="utf-8")
+    assert cache.key("CCC", {"descriptortypes": str(types)}) != before
+
+
+def test_cache_keys_hash_options_once_per_batch(cache) -> None:
+    options = {"d_2d": True, "threads": 4}
+    with patch("padelpy.cache._stable_options", wraps=_stable_options) as stable:
+        keys = cache.keys(["C", "CC", "C"], options)
+    assert stable.call_count == 1
+    assert keys[0] == keys[2] != keys[1]
+    assert keys[1] == cache.key("CC", options)
+    assert cache.key("CC", {"d_2d": False}) != keys[1]
+
+
+def test_stable_options_are_shared_by_cache_checkpoint_and_scheduler(
+    tmp_path,
+) -> None:
+    types = tmp_path / "types.xml"
+    types.write_text("<Root/>", encoding="utf-8")
+    options = {"d_2d": True, "descriptortypes": str(types), "threads": 4}
+    stable = _stable_options({**options, "mol_dir": "in.smi", "sp_timeout": 9})
+    assert list(stable) == ["d_2d", "descriptortypes"]
+    assert stable["descriptortypes"] == _content_hash(str(types))
+    identity = _job_identity(str(types), options, shard_size=10)
+    assert identity["options"] == stable
+    assert _mode_key(options) == _mode_key({**options, "threads": 1})
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_empty_rows_are_not_cached(mock_padel, cache) -> None:
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text("Name,nC\nAUTOGEN_X,\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    from_smiles(["X"], cache=cache)
+    assert cache.stats()["entries"] == 0
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_cache_runs_missing_records_only(mock_padel, cache, tmp_path) -> None:
+    record_a = "mol_a\n\n  0  0\nM  END\n"
+    record_b = "mol_b\n\n  0  0\nM  END\n"
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text(f"{record_a}$$$$\n{record_b}$$$$\n", encoding="utf-8")
+    seen = []
+
+    def _side_effect(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        names = [block.split("\n")[0] for block in text.split("$$$$\n") if block]
+        seen.append(names)
+        lines = ["Name,nC"] + [f"{name},{len(name)}" for name in names]
+        Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    single = tmp_path / "single.sdf"
+    single.write_text(f"{record_b}$$$$\n", encoding="utf-8")
+    from_sdf(str(single), cache=cache)
+    rows = from_sdf(str(sdf), cache=cache)
+    assert seen == [["mol_b"], ["mol_a"]]
+    assert rows == [{"nC": "5"}, {"nC": "5"}]
+
+
+def test_eviction_by_entry_count_is_lru(tmp_path) -> None:
+    cache = DescriptorCache(str(tmp_path / "c.sqlite3"), max_entries=2)
+    cache.put_many({"a": {"nC": "1"}})
+    cache.put_many({"b": {"nC": "2"}})
+    cache.get_many(["a"])  # refresh "a"
+    cache.put_many({"c": {"nC": "3"}})
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_eviction_by_bytes_and_age(tmp_path) -> None:
+    cache = DescriptorCache(str(tmp_path / "c.sqlite3"), max_bytes=40)
+    cache.put_many({"a": {"nC": "1"}, "b": {"nC": "2"}, "c": {"nC": "3"}})
+    assert cache.stats()["bytes"] <= 40
+    aged = DescriptorCache(cache.path, max_age=-1)
+    assert aged.evict() > 0
+    assert aged.stats()["entries"] == 0
+
+
+def test_cache_directory_path_and_clear(tmp_path) -> None:
+    cache = DescriptorCache(str(tmp_path))
+    assert cache.path.endswith("padelpy-cache.sqlite3")
+    cache.put_many({"a": {"nC": "1"}})
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_shared_between_processes(tmp_path) -> None:
+    path = str(tmp_path / "shared.sqlite3")
+    DescriptorCache(path)
+    ctx = get_context("spawn")
+    procs = [ctx.Process(target=_fill_cache, args=(path, n)) for n in range(3)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(timeout=60)
+        assert proc.exitcode == 0
+    assert DescriptorCache(path).stats()["entries"] == 150
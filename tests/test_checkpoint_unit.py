@@ -0,0 +1,144 @@
+"""Unit tests for padelpy.checkpoint with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf_resumable
+from padelpy.checkpoint import _ShardStore
+from padelpy.wrapper import PaDELTimeoutError
+
+
+def _write_sdf(path: Path, titles: list[str]) -> None:
+    records = [f"{title}\n\n\n  0  0\nM  END\n$$$$\n" for title in titles]
+    path.write_text("".join(records), encoding="utf-8")
+
+
+def _padel_names_rows(
+    fail_on: frozenset[str] = frozenset(), slow: frozenset[str] = frozenset()
+):
+    """Write one row per record title; raise for batches containing ``fail_on``.
+
+    Batches of several records containing a ``slow`` title time out.
+    """
+    batches = []
+
+    def _side_effect(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        titles = [record.split("\n")[0] for record in text.split("$$$$\n") if record]
+        batches.append(titles)
+        if fail_on & set(titles):
+            raise RuntimeError("PaDEL-Descriptor encountered an error: killed")
+        if slow & set(titles) and len(titles) > 1:
+            raise PaDELTimeoutError("PaDEL-Descriptor timed out")
+        lines = ["Name,nC"] + [f"{title},{title[1:]}" for title in titles]
+        Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    return _side_effect, batches
+
+
+@pytest.fixture
+def sdf(tmp_path) -> Path:
+    path = tmp_path / "library.sdf"
+    _write_sdf(path, [f"m{i}" for i in range(7)])
+    return path
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_resume_skips_committed_shards(mock_padel, sdf, tmp_path) -> None:
+    checkpoints = tmp_path / "checkpoints"
+    mock_padel.side_effect, _ = _padel_names_rows(fail_on=frozenset({"m4"}))
+    with pytest.raises(RuntimeError):
+        from_sdf_resumable(str(sdf), str(checkpoints), shard_size=2)
+
+    (job_dir,) = checkpoints.iterdir()
+    manifest = json.loads((job_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert [shard["molecules"] for shard in manifest["shards"]] == [2, 2]
+    assert manifest["complete"] is False
+    assert not list(job_dir.glob("*.tmp"))
+
+    mock_padel.side_effect, batches = _padel_names_rows()
+    rows = from_sdf_resumable(str(sdf), str(checkpoints), shard_size=2)
+    assert batches == [["m4", "m5"], ["m6"]]
+    assert [row["nC"] for row in rows] == [str(i) for i in range(7)]
+    assert "Name" not in rows[0]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_timed_out_shard_is_split(mock_padel, sdf, tmp_path) -> None:
+    mock_padel.side_effect, batches = _padel_names_rows(slow=frozenset({"m3"}))
+    rows = from_sdf_resumable(str(sdf), str(tmp_path), shard_size=4)
+    assert batches == [
+        ["m0", "m1", "m2", "m3"],
+        ["m0", "m1"],
+        ["m2", "m3"],
+        ["m2"],
+        ["m3"],
+        ["m4", "m5", "m6"],
+    ]
+    assert [row["nC"] for row in rows] == [str(i) for i in range(7)]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_complete_job_reads_shards_only(mock_padel, sdf, tmp_path) -> None:
+    mock_padel.side_effect, batches = _padel_names_rows()
+    first = from_sdf_resumable(str(sdf), str(tmp_path / "ck"), shard_size=3)
+    assert len(batches) == 3
+
+    out = tmp_path / "out.csv"
+    again = from_sdf_resumable(
+        str(sdf), str(tmp_path / "ck"), shard_size=3, output_csv=str(out)
+    )
+    assert len(batches) == 3
+    assert again == first
+    assert out.read_text(encoding="utf-8").splitlines()[:2] == ["Name,nC", "m0,0"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_explicit_job_id_must_match_input(mock_padel, sdf, tmp_path) -> None:
+    mock_padel.side_effect, _ = _padel_names_rows()
+    from_sdf_resumable(str(sdf), str(tmp_path), job_id="screen", shard_size=4)
+    assert (tmp_path / "screen" / "manifest.json").exists()
+    with pytest.raises(ValueError, match="different input file"):
+        from_sdf_resumable(str(sdf), str(tmp_path), job_id="screen", shard_size=5)
+
+    _write_sdf(sdf, ["m0"])
+    with pytest.raises(ValueError, match="different input file"):
+        from_sdf_resumable(str(sdf), str(tmp_path), job_id="screen", shard_size=4)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_default_job_id_ignores_volatile_options(mock_padel, sdf, tmp_path) -> None:
+    mock_padel.side_effect, batches = _padel_names_rows()
+    from_sdf_resumable(str(sdf), str(tmp_path), shard_size=7, threads=1)
+    from_sdf_resumable(str(sdf), str(tmp_path), shard_size=7, threads=4, timeout=5)
+    assert len(batches) == 1
+    from_sdf_resumable(str(sdf), str(tmp_path), shard_size=7, mode="2d")
+    assert len(batches) == 2
+
+
+def test_shard_store_commits_shards_and_checks_identity(tmp_path) -> None:
+    store = _ShardStore(str(tmp_path / "run"), {"inputs": ["a"]}, "Run", {"n": 0})
+    assert json.loads((tmp_path / "run" / "manifest.json").read_text())["n"] == 0
+    assert not store.done(0)
+    store.save(0, [{"Name": "m0", "nC": "0"}])
+    assert store.done(0) and not Path(store.partial_path(0)).exists()
+    store.manifest["n"] = 1
+    store.save_manifest()
+
+    again = _ShardStore(str(tmp_path / "run"), {"inputs": ["a"]}, "Run", {"n": 0})
+    assert again.manifest["n"] == 1
+    assert again.rows(0) == [{"Name": "m0", "nC": "0"}]
+    with pytest.raises(ValueError, match="Run was started with a different input"):
+        _ShardStore(str(tmp_path / "run"), {"inputs": ["b"]}, "Run")
+
+
+def test_input_validation(sdf, tmp_path) -> None:
+    with pytest.raises(ValueError, match="extension"):
+        from_sdf_resumable(str(tmp_path / "mols.txt"), str(tmp_path))
+    with pytest.raises(ValueError, match="shard_size"):
+        from_sdf_resumable(str(sdf), str(tmp_path), shard_size=0)
@@ -0,0 +1,220 @@
+"""Unit tests for the padelpy command line with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy.cli import main
+from padelpy.wrapper import PaDELTimeoutError
+
+
+def _echo_rows(**kwargs) -> None:
+    """PaDEL mock: one row per SMILES line or SDF record.
+
+    As PaDEL does, SMILES rows are named ``AUTOGEN_input_<k>`` afresh in each
+    run and SDF rows after the record's title.
+    """
+    text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+    if kwargs["mol_dir"].endswith(".smi"):
+        molecules = text.split("\n")
+        names = [f"AUTOGEN_input_{k}" for k in range(1, len(molecules) + 1)]
+    else:
+        molecules = [block.split("\n")[0] for block in text.split("$$$$\n")[:-1]]
+        names = molecules
+    lines = ["Name,nC,MW"] + [
+        f"{name},{len(mol)},{len(mol) * 1.5}"
+        for name, mol in zip(names, molecules, strict=True)
+    ]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _read_csv(path: Path) -> list:
+    with open(path, encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+@pytest.fixture()
+def inputs(tmp_path) -> Path:
+    (tmp_path / "a.smi").write_text("C\nCC\n\nCCC\n", encoding="utf-8")
+    (tmp_path / "b.smi").write_text("CCCC\nCCCCC\n", encoding="utf-8")
+    records = "".join(f"m{idx}\n\n  0  0\nM  END\n$$$$\n" for idx in range(3))
+    (tmp_path / "c.sdf").write_text(records, encoding="utf-8")
+    return tmp_path
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_csv_from_globs_and_files_in_input_order(
+    mock_padel, inputs, capsys, monkeypatch
+) -> None:
+    mock_padel.side_effect = _echo_rows
+    monkeypatch.setattr(sys, "stdin", io.StringIO("CCCCCC\n"))
+    out = inputs / "out.csv"
+    code = main(
+        [str(inputs / "*.smi"), str(inputs / "c.sdf"), "-", "-o", str(out)]
+        + ["--shard-size", "2", "--workers", "3", "--descriptors", "nC"]
+    )
+    assert code == 0
+    rows = _read_csv(out)
+    assert [row["Name"] for row in rows] == [
+        "C",
+        "CC",
+        "CCC",
+        "CCCC",
+        "CCCCC",
+        "m0",
+        "m1",
+        "m2",
+        "CCCCCC",
+    ]
+    sources = [str(inputs / "a.smi")] * 3 + [str(inputs / "b.smi")] * 2
+    sources += [str(inputs / "c.sdf")] * 3 + ["-"]
+    assert [row["Source"] for row in rows] == sources
+    assert [row["Index"] for row in rows] == list("012010120")
+    assert list(rows[0]) == ["Name", "Source", "Index", "nC", "MW"]
+    # 2 + 1 (a.smi), 1 (b.smi), 2 + 1 (c.sdf), 1 (stdin): shards never mix inputs
+    assert mock_padel.call_count == 6
+    assert {call.kwargs["threads"] for call in mock_padel.call_args_list} == {1}
+    assert mock_padel.call_args.kwargs["descriptortypes"] is not None
+    summary = capsys.readouterr().err
+    assert "wrote 9 rows" in summary and "9 molecules calculated" in summary
+    assert "3 workers" in summary
+    assert not Path(f"{out}.partial").exists()
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".npz"])
+@patch("padelpy.functions.padeldescriptor")
+def test_parquet_and_npz_outputs(mock_padel, inputs, suffix) -> None:
+    np = pytest.importorskip("numpy")
+    mock_padel.side_effect = _echo_rows
+    out = inputs / f"out{suffix}"
+    argv = [str(inputs / "a.smi"), "-o", str(out), "--shard-size", "2", "-q"]
+    assert main(argv + ["--dtype", "float32"]) == 0
+    if suffix == ".npz":
+        archive = np.load(out)
+        assert archive["names"].tolist() == ["C", "CC", "CCC"]
+        assert archive["sources"].tolist() == [str(inputs / "a.smi")] * 3
+        assert archive["indices"].tolist() == [0, 1, 2]
+        assert archive["columns"].tolist() == ["nC", "MW"]
+        assert archive["values"].dtype == np.float32
+        assert archive["values"][:, 0].tolist() == [1, 2, 3]
+    else:
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pq.read_table(out)
+        assert table.column_names == ["Name", "Source", "Index", "nC", "MW"]
+        assert table.column("Name").to_pylist() == ["C", "CC", "CCC"]
+        assert table.column("Index").to_pylist() == [0, 1, 2]
+        assert str(table.schema.field("MW").type) == "float"
+        assert table.column("MW").to_pylist() == [1.5, 3.0, 4.5]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_npz_output_is_assembled_from_spooled_shards(
+    mock_padel, inputs, monkeypatch
+) -> None:
+    np = pytest.importorskip("numpy")
+    mock_padel.side_effect = _echo_rows
+    monkeypatch.setattr("padelpy.cli._NPZ_CHUNK", 2)
+    out = inputs / "out.npz"
+    argv = [str(inputs / "a.smi"), str(inputs / "b.smi"), "-o", str(out), "-q"]
+    assert main(argv + ["--shard-size", "2"]) == 0
+    archive = np.load(out)
+    assert archive["names"].tolist() == ["C", "CC", "CCC", "CCCC", "CCCCC"]
+    assert archive["names"].dtype == np.dtype("<U5")
+    assert archive["indices"].tolist() == [0, 1, 2, 0, 1]
+    assert archive["values"].tolist() == [[n, n * 1.5] for n in range(1, 6)]
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    assert main(["-", "-o", str(out), "-q"]) == 0
+    archive = np.load(out)
+    assert archive["names"].shape == (0,)
+    assert archive["values"].shape == (0, 0)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_resume_skips_finished_shards(mock_padel, inputs, capsys) -> None:
+    smi = inputs / "many.smi"
+    smi.write_text("\n".join("C" * n for n in range(1, 7)), encoding="utf-8")
+    out, state = inputs / "out.csv", inputs / "state"
+
+    def _fails_on_last_shard(**kwargs):
+        if "CCCCC" in Path(kwargs["mol_dir"]).read_text(encoding="utf-8"):
+            raise RuntimeError("JVM crashed")
+        _echo_rows(**kwargs)
+
+    mock_padel.side_effect = _fails_on_last_shard
+    argv = [str(smi), "-o", str(out), "--shard-size", "2", "--resume", str(state)]
+    assert main(argv + ["--workers", "1"]) == 1
+    assert "JVM crashed" in capsys.readouterr().err
+    assert not out.exists() and not Path(f"{out}.partial").exists()
+
+    mock_padel.reset_mock(side_effect=True)
+    mock_padel.side_effect = _echo_rows
+    assert main(argv) == 0
+    assert mock_padel.call_count == 1  # only the shard that failed
+    assert [row["nC"] for row in _read_csv(out)] == ["1", "2", "3", "4", "5", "6"]
+    assert "2 shards resumed" in capsys.readouterr().err
+
+    # other options must not reuse the finished shards
+    assert main(argv + ["--mode", "2d"]) == 1
+    assert "different input file" in capsys.readouterr().err
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_cache_and_timeout_split(mock_padel, inputs, capsys) -> None:
+    def _times_out_on_pairs(**kwargs):
+        if len(Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")) > 1:
+            raise PaDELTimeoutError("PaDEL-Descriptor timed out during subprocess call")
+        _echo_rows(**kwargs)
+
+    mock_padel.side_effect = _times_out_on_pairs
+    out, cache = inputs / "out.csv", inputs / "cache.sqlite3"
+    argv = [str(inputs / "b.smi"), "-o", str(out), "--cache", str(cache)]
+    assert main(argv + ["--timeout", "5", "--timeout-per-molecule", "1"]) == 0
+    # the pair timed out with 5 + 2 s, each half ran with 5 + 1 s
+    timeouts = [call.kwargs["sp_timeout"] for call in mock_padel.call_args_list]
+    assert timeouts == [7.0, 6.0, 6.0]
+    assert [row["Name"] for row in _read_csv(out)] == ["CCCC", "CCCCC"]
+    assert "cache: 0 hits, 2 misses" in capsys.readouterr().err
+
+    mock_padel.reset_mock()
+    assert main(argv) == 0
+    mock_padel.assert_not_called()
+    assert [row["Name"] for row in _read_csv(out)] == ["CCCC", "CCCCC"]
+    assert "cache: 2 hits, 0 misses" in capsys.readouterr().err
+
+
+def test_usage_errors(inputs, capsys) -> None:
+    out = str(inputs / "out.csv")
+    for argv, message in [
+        ([str(inputs / "missing.smi"), "-o", out], "not found"),
+        ([str(inputs / "*.mol2"), "-o", out], "No input files match"),
+        ([str(inputs / "a.smi"), "-o", str(inputs / "out.xlsx")], "output format"),
+        (["-", "-o", out, "--resume", str(inputs)], "standard input"),
+        ([str(inputs / "a.smi"), "-o", out, "--workers", "0"], "at least 1"),
+    ]:
+        with pytest.raises(SystemExit) as exc_info:
+            main(argv)
+        assert exc_info.value.code == 2
+        assert message in capsys.readouterr().err
+
+    (inputs / "notes.csv").write_text("x\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        main([str(inputs / "notes.csv"), "-o", out])
+    assert "Unsupported input file" in capsys.readouterr().err
+
+
+def test_module_entry_point_prints_version() -> None:
+    result = subprocess.run(
+        [sys.executable, "-m", "padelpy", "--version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.startswith("padelpy ")
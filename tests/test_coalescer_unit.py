@@ -0,0 +1,129 @@
+"""Unit tests for padelpy.coalescer with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import BatchCoalescer, from_sdf, from_smiles
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    """Write one CSV row per input SMILES, with nC = SMILES length."""
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_routes_from_smiles(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    with BatchCoalescer(workers=1) as coalescer:
+        rows = from_smiles(["CCC", "CCCC"], coalescer=coalescer)
+        single = from_smiles("CC", coalescer=coalescer)
+    assert [row["nC"] for row in rows] == ["3", "4"]
+    assert single == {"nC": "2"}
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_coalesces_queued_jobs_into_one_invocation(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    coalescer = BatchCoalescer(workers=1, linger=0.5)
+    options = {"threads": 1}
+    futures = [coalescer.submit_smiles([smi], options) for smi in ("C", "CC", "CCC")]
+    results = [future.result() for future in futures]
+    coalescer.close()
+    assert mock_padel.call_count == 1
+    assert [rows[0]["nC"] for rows in results] == ["1", "2", "3"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_does_not_coalesce_different_options(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    with BatchCoalescer(workers=1, linger=0.2) as coalescer:
+        first = coalescer.submit_smiles(["C"], {"threads": 1})
+        second = coalescer.submit_smiles(["CC"], {"threads": 2})
+        assert first.result()[0]["nC"] == "1"
+        assert second.result()[0]["nC"] == "2"
+    assert mock_padel.call_count == 2
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_isolates_failing_job_in_coalesced_batch(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        if "BAD" in Path(kwargs["mol_dir"]).read_text(encoding="utf-8"):
+            raise RuntimeError("PaDEL-Descriptor encountered an error: bad")
+        _echo_smiles_rows(**kwargs)
+
+    mock_padel.side_effect = _side_effect
+    with BatchCoalescer(workers=1, linger=0.5) as coalescer:
+        good = coalescer.submit_smiles(["CCC"], {})
+        bad = coalescer.submit_smiles(["BAD"], {})
+        assert good.result()[0]["nC"] == "3"
+        with pytest.raises(RuntimeError, match="bad"):
+            bad.result()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_routes_from_sdf_and_writes_output_csv(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mol.sdf"
+    sdf.write_text("mol\n\n  0  0\nM  END\n$$$$\n")
+    out = tmp_path / "out.csv"
+
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text("Name,nC\nmol,9\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    with BatchCoalescer(workers=1) as coalescer:
+        rows = from_sdf(str(sdf), output_csv=str(out), coalescer=coalescer)
+    assert rows == [{"nC": "9"}]
+    assert out.read_text(encoding="utf-8").splitlines() == ["Name,nC", "mol,9"]
+
+
+class _WorkerKilled(BaseException):
+    """Escapes the per-job ``except Exception`` handlers, as an interrupt would."""
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_respawns_worker_killed_by_base_exception(mock_padel) -> None:
+    mock_padel.side_effect = _WorkerKilled()
+    coalescer = BatchCoalescer(workers=1, linger=0)
+    with pytest.raises(_WorkerKilled):
+        coalescer.submit_smiles(["C"], {}).result(timeout=5)
+    coalescer._threads[0].join(timeout=5)
+    assert not coalescer._threads[0].is_alive()
+
+    # the next submit runs the health check, so the job is not stranded
+    mock_padel.side_effect = _echo_smiles_rows
+    assert coalescer.submit_smiles(["CC"], {}).result(timeout=5)[0]["nC"] == "2"
+    assert coalescer.respawned == 1
+    assert coalescer.health_check() == 1
+    coalescer.close()
+    assert coalescer.health_check() == 0
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_coalescer_honours_attempts(mock_padel) -> None:
+    mock_padel.side_effect = RuntimeError("PaDEL-Descriptor encountered an error")
+    with BatchCoalescer(workers=1) as coalescer:
+        with pytest.raises(RuntimeError):
+            coalescer.submit_smiles(["C"], {}, attempts=1).result()
+        assert mock_padel.call_count == 1
+        # on_error="collect" runs each batch once, through the coalescer too
+        result = from_smiles(["C", "CC"], coalescer=coalescer, on_error="collect")
+    assert result.status == ["parse_failure", "parse_failure"]
+    assert mock_padel.call_count == 1 + 3  # the pair, then each molecule once
+
+
+def test_coalescer_rejects_jobs_after_close() -> None:
+    coalescer = BatchCoalescer(workers=1)
+    coalescer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        coalescer.submit_smiles(["CCC"], {})
+
+
+def test_coalescer_invalid_worker_count_raises_value_error() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        BatchCoalescer(workers=0)
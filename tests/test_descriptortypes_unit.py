@@ -0,0 +1,130 @@
+"""Unit tests for padelpy.descriptortypes (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+import pytest
+
+from padelpy import from_smiles
+from padelpy.descriptortypes import (
+    _DESCRIPTORS_XML,
+    column_classes,
+    descriptor_classes,
+    descriptor_columns,
+    fingerprint_classes,
+    write_descriptortypes,
+)
+
+
+def _enabled(path: str) -> dict[str, set[str]]:
+    root = ElementTree.parse(path).getroot()
+    return {
+        group.get("name"): {
+            d.get("name") for d in group.iter("Descriptor") if d.get("value") == "true"
+        }
+        for group in root.iter("Group")
+    }
+
+
+def test_column_mapping_covers_all_padel_columns() -> None:
+    columns = [c for name in descriptor_classes() for c in descriptor_columns(name)]
+    assert len(columns) == 1875
+    assert len(set(columns)) == len(columns)
+    assert descriptor_columns("ALOGP") == ["ALogP", "ALogP2", "AMR"]
+    assert "CPSA" in descriptor_classes("3D")
+    assert "CPSA" not in descriptor_classes("2D")
+
+
+def test_column_classes_resolves_columns_and_classes() -> None:
+    assert column_classes(["AMR", "nAcid", "ALOGP", "ALogP2"]) == [
+        "AcidicGroupCount",
+        "ALOGP",
+    ]
+    # renamed Java classes map onto descriptors.xml names
+    assert column_classes(["MW"]) == ["Weight"]
+    with pytest.raises(ValueError, match="Unknown descriptor class or column"):
+        column_classes(["NotAColumn"])
+    with pytest.raises(ValueError, match="Unknown descriptor class"):
+        descriptor_columns("PubchemFingerprinter")
+
+
+def test_write_descriptortypes_prunes_2d_3d_only(tmp_path) -> None:
+    path = write_descriptortypes(["AMR", "RDF"], str(tmp_path / "types.xml"))
+    enabled = _enabled(path)
+    assert enabled["2D"] == {"ALOGP"}
+    assert enabled["3D"] == {"RDF"}
+    assert enabled["Fingerprint"] == {"PubchemFingerprinter"}
+
+
+def test_default_path_is_content_addressed() -> None:
+    first = write_descriptortypes(["nAcid"])
+    assert write_descriptortypes(["AcidicGroupCount"]) == first
+    assert write_descriptortypes(["ALOGP"]) != first
+    assert Path(first).is_file()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_descriptor_subset_passes_types_file(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text(
+            "Name,ALogP,ALogP2,AMR\nAUTOGEN_1,1,1,1\n", encoding="utf-8"
+        )
+
+    mock_padel.side_effect = _side_effect
+    row = from_smiles("CCC", descriptors=["AMR"])
+    assert row == {"ALogP": "1", "ALogP2": "1", "AMR": "1"}
+    kwargs = mock_padel.call_args.kwargs
+    assert kwargs["d_2d"] is True
+    assert kwargs["d_3d"] is False
+    assert _enabled(kwargs["descriptortypes"])["2D"] == {"ALOGP"}
+
+
+def test_from_smiles_rejects_unknown_or_empty_subset() -> None:
+    with pytest.raises(ValueError, match="Unknown descriptor"):
+        from_smiles("CCC", descriptors=["bogus"])
+    with pytest.raises(ValueError, match="selects no descriptor classes"):
+        from_smiles("CCC", descriptors=[])
+
+
+def test_fingerprint_subset_types_file(tmp_path) -> None:
+    assert fingerprint_classes()[0] == "Fingerprinter"
+    assert "KlekotaRothFingerprintCount" in fingerprint_classes()
+    path = write_descriptortypes(
+        path=str(tmp_path / "types.xml"),
+        fingerprints=["SubstructureFingerprintCount", "MACCSFingerprinter"],
+    )
+    enabled = _enabled(path)
+    assert enabled["Fingerprint"] == {
+        "MACCSFingerprinter",
+        "SubstructureFingerprintCount",
+    }
+    # descriptor settings are kept as bundled
+    assert enabled["2D"] == _enabled(_DESCRIPTORS_XML)["2D"]
+    with pytest.raises(ValueError, match="Unknown fingerprint class"):
+        write_descriptortypes(fingerprints=["ALOGP"])
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_fingerprint_subset(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text(
+            "Name,ALogP,ALogP2,AMR,MACCSFP1\nAUTOGEN_1,1,1,1,0\n", encoding="utf-8"
+        )
+
+    mock_padel.side_effect = _side_effect
+    from_smiles("CCC", descriptors=["AMR"], fingerprints=["MACCSFingerprinter"])
+    kwargs = mock_padel.call_args.kwargs
+    assert kwargs["fingerprints"] is True
+    enabled = _enabled(kwargs["descriptortypes"])
+    assert enabled["2D"] == {"ALOGP"}
+    assert enabled["Fingerprint"] == {"MACCSFingerprinter"}
+
+    from_smiles("CCC", mode="fingerprints", fingerprints=["MACCSFingerprinter"])
+    kwargs = mock_padel.call_args.kwargs
+    assert kwargs["d_2d"] is False
+    assert _enabled(kwargs["descriptortypes"])["Fingerprint"] == {"MACCSFingerprinter"}
+    with pytest.raises(ValueError, match="selects no fingerprint classes"):
+        from_smiles("CCC", fingerprints=[])
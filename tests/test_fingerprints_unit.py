@@ -0,0 +1,245 @@
+"""Unit tests for padelpy.fingerprints with mocked padeldescriptor."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf, from_smiles
+from padelpy.arrays import DescriptorArray
+from padelpy.fingerprints import (
+    CountFingerprints,
+    Neighbors,
+    PackedFingerprints,
+    pack_fingerprints,
+    read_csv_counts,
+    sparse_counts,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _padel_writes(text: str):
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text(text, encoding="utf-8")
+
+    return _side_effect
+
+
+def _reference(queries, library, metric: str):
+    """Similarities from the unpacked bits, for comparison."""
+    q, lib = queries.astype(float), library.astype(float)
+    common = q @ lib.T
+    a, b = q.sum(axis=1)[:, None], lib.sum(axis=1)[None, :]
+    if metric == "dice":
+        common, total = 2 * common, a + b
+    else:
+        total = a + b - common
+    return np.divide(common, total, out=np.zeros_like(common), where=total > 0)
+
+
+@pytest.fixture()
+def bits():
+    rng = np.random.default_rng(7)
+    bits = (rng.random((40, 150)) < 0.2).astype(np.uint8)
+    bits[3] = 0  # an empty fingerprint
+    bits[9] = bits[4]  # an exact duplicate
+    return bits
+
+
+def test_pack_round_trip(bits) -> None:
+    packed = PackedFingerprints.from_bits(bits)
+    assert packed.words.dtype == np.uint64
+    assert packed.words.shape == (40, 3)
+    assert packed.n_bits == 150
+    assert packed.columns[:2] == ["bit0", "bit1"]
+    np.testing.assert_array_equal(packed.to_bits(), bits)
+    np.testing.assert_array_equal(packed.counts, bits.sum(axis=1))
+    np.testing.assert_array_equal(packed[-1].to_bits(), bits[-1:])
+    np.testing.assert_array_equal(packed[5:8].to_bits(), bits[5:8])
+    with pytest.raises(IndexError):
+        packed[40]
+
+
+def test_from_bits_validation() -> None:
+    with pytest.raises(ValueError, match="0 or 1"):
+        PackedFingerprints.from_bits([[0, 2]])
+    with pytest.raises(ValueError, match="0 or 1"):
+        PackedFingerprints.from_bits([[0.0, float("nan")]])
+    with pytest.raises(ValueError, match="2-D"):
+        PackedFingerprints.from_bits([0, 1])
+    with pytest.raises(ValueError, match="column names"):
+        PackedFingerprints.from_bits([[0, 1]], columns=["a"])
+
+
+@pytest.mark.parametrize("metric", ["tanimoto", "dice"])
+@pytest.mark.parametrize("block_size", [None, 1, 7])
+def test_similarity_matrix_matches_reference(bits, metric, block_size) -> None:
+    library = PackedFingerprints.from_bits(bits)
+    queries = library[:13]
+    with patch("padelpy.fingerprints._PAIRS_PER_BLOCK", 16):
+        result = library.similarity_matrix(queries, metric, block_size=block_size)
+    np.testing.assert_allclose(result, _reference(bits[:13], bits, metric))
+    assert result[3, 3] == 0.0  # empty vs empty
+    assert result[4, 9] == 1.0
+
+
+def test_similarity_one_vs_many(bits) -> None:
+    library = PackedFingerprints.from_bits(bits)
+    scores = library.similarity(library[4], metric="dice")
+    np.testing.assert_allclose(scores, _reference(bits[4:5], bits, "dice")[0])
+    with pytest.raises(ValueError, match="one fingerprint"):
+        library.similarity(library[:2])
+    with pytest.raises(ValueError, match="metric"):
+        library.similarity(library[0], metric="cosine")
+    other = PackedFingerprints.from_bits(bits, [f"x{idx}" for idx in range(150)])
+    with pytest.raises(ValueError, match="columns"):
+        library.similarity(other[0])
+
+
+def test_top_k_orders_by_score_then_row(bits) -> None:
+    library = PackedFingerprints.from_bits(bits)
+    result = library.top_k(library[[4, 0]], k=3, block_size=1)
+    assert isinstance(result, Neighbors)
+    assert result.indices.shape == (2, 3)
+    # row 4 and its duplicate row 9 tie at 1.0; the lower row comes first
+    assert result.indices[0, :2].tolist() == [4, 9]
+    np.testing.assert_array_equal(result.scores[0, :2], [1.0, 1.0])
+    reference = _reference(bits[[4, 0]], bits, "tanimoto")
+    for row in range(2):
+        expected = sorted(range(40), key=lambda col: (-reference[row, col], col))
+        assert result.indices[row].tolist() == expected[:3]
+    assert library.top_k(library[0], k=100).indices.shape == (1, 40)
+    with pytest.raises(ValueError, match="k"):
+        library.top_k(library[0], k=0)
+
+
+def test_pack_fingerprints_from_rows_and_array() -> None:
+    rows = [
+        {"MW": "44.1", "PubchemFP0": "1", "PubchemFP1": "0", "KRFPC1": "3"},
+        {"MW": "58.1", "PubchemFP0": "0", "PubchemFP1": "1", "KRFPC1": "0"},
+    ]
+    packed = pack_fingerprints(rows)
+    assert packed.columns == ["PubchemFP0", "PubchemFP1"]
+    np.testing.assert_array_equal(packed.to_bits(), [[1, 0], [0, 1]])
+    assert len(pack_fingerprints(rows[0])) == 1
+
+    array = DescriptorArray(["MW", "PubchemFP0"], np.array([[44.1, 1.0]]))
+    assert pack_fingerprints(array).to_bits().tolist() == [[1]]
+
+    with pytest.raises(ValueError, match="No binary fingerprint columns"):
+        pack_fingerprints([{"MW": "44.1"}])
+    with pytest.raises(ValueError, match="0 or 1"):
+        pack_fingerprints([{"PubchemFP0": ""}])
+
+
+_CSV = "Name,MW,PubchemFP0,PubchemFP1,PubchemFP2\nA,44.1,1,0,1\nB,58.1,0,0,1\n"
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_bits_output(mock_padel) -> None:
+    mock_padel.side_effect = _padel_writes(_CSV)
+    result = from_smiles(["CCC", "CCCC"], output="bits", fingerprints=True)
+    assert isinstance(result, PackedFingerprints)
+    assert result.columns == ["PubchemFP0", "PubchemFP1", "PubchemFP2"]
+    np.testing.assert_array_equal(result.to_bits(), [[1, 0, 1], [0, 0, 1]])
+
+    # the row path (dedup) packs the same bits
+    result = from_smiles(
+        ["CCC", "CCCC"], output="bits", mode="fingerprints", dedup=True
+    )
+    np.testing.assert_array_equal(result.to_bits(), [[1, 0, 1], [0, 0, 1]])
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_bits_failed_molecule_raises(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("a\n\n  0  0\nM  END\n$$$$\nb\n\n  0  0\nM  END\n$$$$\n")
+    mock_padel.side_effect = _padel_writes("Name,PubchemFP0\na,1\nb,\n")
+    with pytest.raises(RuntimeError, match="failed"):
+        from_sdf(str(sdf), output="bits", fingerprints=True)
+
+
+def test_bits_output_requires_fingerprints() -> None:
+    with patch("padelpy.functions.padeldescriptor") as mock_padel:
+        with pytest.raises(ValueError, match="fingerprints"):
+            from_smiles("CCC", output="bits")
+    mock_padel.assert_not_called()
+
+
+_COUNTS_CSV = (
+    "Name,MW,PubchemFP0,KRFPC1,KRFPC2,KRFPC3,APC2D1\n"
+    "A,44.1,1,0,2,0,0\n"
+    "B,58.1,0,0,0,0,5\n"
+    "C,60.1,1,0.0,0,0,0\n"
+)
+
+
+def test_read_csv_counts_builds_csr_in_blocks(tmp_path) -> None:
+    pytest.importorskip("scipy")
+    csv_path = tmp_path / "out.csv"
+    csv_path.write_text(_COUNTS_CSV, encoding="utf-8")
+    # non-zero cells are converted a few at a time
+    with patch("padelpy.fingerprints._CELLS_PER_CHUNK", 1):
+        names, result = read_csv_counts(str(csv_path), dtype="float32")
+    assert names == ["A", "B", "C"]
+    assert isinstance(result, CountFingerprints)
+    assert result.columns == ["KRFPC1", "KRFPC2", "KRFPC3", "APC2D1"]
+    assert result.values.format == "csr"
+    assert result.values.dtype == np.float32
+    assert result.values.nnz == 2  # "0.0" is not stored
+    np.testing.assert_array_equal(
+        result.values.toarray(), [[0, 2, 0, 0], [0, 0, 0, 5], [0, 0, 0, 0]]
+    )
+
+
+def test_sparse_counts_from_rows_and_array() -> None:
+    pytest.importorskip("scipy")
+    rows = [
+        {"MW": "44.1", "SubFPC1": "0", "SubFPC2": "3"},
+        {"MW": "58.1", "SubFPC1": "1", "SubFPC2": "0"},
+    ]
+    with patch("padelpy.fingerprints._CELLS_PER_CHUNK", 1):
+        result = sparse_counts(rows)
+    assert result.columns == ["SubFPC1", "SubFPC2"]
+    np.testing.assert_array_equal(result.values.toarray(), [[0, 3], [1, 0]])
+
+    array = DescriptorArray(["SubFPC1", "MW"], np.array([[2.0, 44.1]]))
+    assert sparse_counts(array).values.toarray().tolist() == [[2.0]]
+
+    with pytest.raises(ValueError, match="No count fingerprint columns"):
+        sparse_counts([{"PubchemFP0": "1"}])
+    with pytest.raises(ValueError, match="must be numbers"):
+        sparse_counts([{"SubFPC1": ""}])
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_sparse_output(mock_padel) -> None:
+    pytest.importorskip("scipy")
+    mock_padel.side_effect = _padel_writes(_COUNTS_CSV)
+    result = from_smiles(
+        ["CC", "CCC", "CCCC"],
+        output="sparse",
+        fingerprints=["KlekotaRothFingerprintCount", "AtomPairs2DFingerprintCount"],
+    )
+    assert result.columns == ["KRFPC1", "KRFPC2", "KRFPC3", "APC2D1"]
+    assert result.values.nnz == 2
+    assert mock_padel.call_args.kwargs["fingerprints"] is True
+
+    # the row path (cache, pool or dedup) gives the same matrix
+    rows_result = from_smiles(
+        ["CC", "CCC", "CCCC"], output="sparse", fingerprints=True, dedup=True
+    )
+    assert (rows_result.values != result.values).nnz == 0
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sparse_output_without_count_columns_raises(mock_padel) -> None:
+    pytest.importorskip("scipy")
+    mock_padel.side_effect = _padel_writes(_CSV)
+    with pytest.raises(ValueError, match="KlekotaRothFingerprintCount"):
+        from_smiles(["CCC", "CCCC"], output="sparse", fingerprints=True)
+    with pytest.raises(ValueError, match="fingerprints"):
+        from_smiles("CCC", output="sparse")
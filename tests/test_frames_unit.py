@@ -0,0 +1,146 @@
+"""Unit tests for padelpy.frames and iter_dataframes (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf, from_smiles, iter_dataframes
+from padelpy.frames import read_csv_dataframe
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+_CSV = (
+    "Name,nC,MW,XLogP,PubchemFP0,PubchemFP1,KRFPC1\n"
+    "A,2,30.07,1.0,1,0,300\n"
+    "B,3,44.1,,0,0,-2\n"
+    "C,4,58.12,2.5,1,1,0\n"
+)
+
+
+def _padel_writes(text: str):
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text(text, encoding="utf-8")
+
+    return _side_effect
+
+
+def _echo_smiles_csv(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC,MW"] + [
+        f"AUTOGEN_{smi},{len(smi)},{len(smi) * 12.011}" for smi in smiles
+    ]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("engine", ["numpy", "auto"])
+def test_read_csv_dataframe_dtypes(tmp_path, engine) -> None:
+    csv_path = tmp_path / "out.csv"
+    csv_path.write_text(_CSV, encoding="utf-8")
+    frame = read_csv_dataframe(str(csv_path), dtype="float32", engine=engine)
+    assert frame.index.tolist() == ["A", "B", "C"]
+    assert frame.index.name == "Name"
+    assert frame.dtypes.astype(str).to_dict() == {
+        "nC": "uint8",
+        "MW": "float32",
+        "XLogP": "float32",  # a missing value keeps the float dtype
+        "PubchemFP0": "uint8",
+        "PubchemFP1": "uint8",
+        "KRFPC1": "int16",
+    }
+    assert np.isnan(frame.loc["B", "XLogP"])
+    assert frame["KRFPC1"].tolist() == [300, -2, 0]
+
+    frame = read_csv_dataframe(
+        str(csv_path), columns=["PubchemFP1", "nC"], bits="bool", integers=False
+    )
+    assert frame.columns.tolist() == ["PubchemFP1", "nC"]
+    assert frame.dtypes.astype(str).tolist() == ["bool", "float64"]
+    with pytest.raises(ValueError, match="bits"):
+        read_csv_dataframe(str(csv_path), bits="int8")
+    with pytest.raises(ValueError, match="floating-point"):
+        read_csv_dataframe(str(csv_path), dtype="int32")
+
+
+def test_read_csv_dataframe_merges_chunks(tmp_path) -> None:
+    csv_path = tmp_path / "out.csv"
+    csv_path.write_text(_CSV, encoding="utf-8")
+    # one row per parse block: dtypes widen to hold every block
+    with patch("padelpy.frames._CELLS_PER_CHUNK", 1):
+        frame = read_csv_dataframe(str(csv_path), engine="numpy")
+    assert frame["KRFPC1"].dtype == np.int16
+    assert frame["XLogP"].dtype == np.float64
+    assert frame["PubchemFP1"].dtype == np.uint8
+    assert frame.loc["C", "MW"] == pytest.approx(58.12)
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("Name,nC\n", encoding="utf-8")
+    assert read_csv_dataframe(str(empty)).shape == (0, 1)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_dataframe_output(mock_padel) -> None:
+    mock_padel.side_effect = _padel_writes(_CSV)
+    frame = from_smiles(["CC", "CCC", "CCCC"], output="dataframe", dtype="float32")
+    assert isinstance(frame, pd.DataFrame)
+    assert frame.index.tolist() == [0, 1, 2]
+    assert "Name" not in frame.columns
+    assert frame["nC"].dtype == np.uint8 and frame["MW"].dtype == np.float32
+
+    # the row path (cache, pool or dedup) gives the same frame
+    rows_frame = from_smiles(
+        ["CC", "CCC", "CCCC"], output="dataframe", dtype="float32", dedup=True
+    )
+    pd.testing.assert_frame_equal(rows_frame, frame)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_dataframe_output(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("a\n\n  0  0\nM  END\n$$$$\n")
+    mock_padel.side_effect = _padel_writes("Name,nC\na,1\n")
+    frame = from_sdf(str(sdf), output="dataframe")
+    assert frame["nC"].tolist() == [1]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_dataframes_smiles_chunks(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_csv
+    smiles = (f"{'C' * n}\n" for n in range(1, 6))
+    frames = list(iter_dataframes(smiles, chunksize=2, dtype="float32"))
+    assert [frame.index.tolist() for frame in frames] == [[0, 1], [2, 3], [4]]
+    combined = pd.concat(frames)
+    assert combined["nC"].tolist() == [1, 2, 3, 4, 5]
+    assert combined["MW"].dtype == np.float32
+    assert mock_padel.call_count == 3
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_dataframes_sdf_and_errors(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("".join(f"m{idx}\n\n  0  0\nM  END\n$$$$\n" for idx in range(3)))
+
+    def _one_row_per_record(**kwargs):
+        count = Path(kwargs["mol_dir"]).read_text().count("$$$$")
+        rows = ["Name,nC"] + [f"m,{idx}" for idx in range(count)]
+        Path(kwargs["d_file"]).write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    mock_padel.side_effect = _one_row_per_record
+    frames = list(iter_dataframes(str(sdf), chunksize=2))
+    assert [frame.index.tolist() for frame in frames] == [[0, 1], [2]]
+    assert mock_padel.call_args.kwargs["mol_dir"].endswith(".sdf")
+
+    mock_padel.side_effect = _padel_writes("Name,nC\nm,1\n")
+    with pytest.raises(RuntimeError, match="failed"):
+        # two molecules in the first chunk but one row
+        list(iter_dataframes(str(sdf), chunksize=2))
+
+    with pytest.raises(ValueError, match="position 2"):
+        list(iter_dataframes(["C", "CC", "  "]))  # blank SMILES are not skipped
+    with pytest.raises(ValueError, match="sdf"):
+        iter_dataframes("CCC")
+    with pytest.raises(ValueError, match="chunksize"):
+        iter_dataframes(["CCC"], chunksize=0)
@@ -9,6 +9,7 @@ from unittest.mock import patch
 import pytest
 
 from padelpy import from_mdl, from_sdf, from_smiles
+from padelpy.instrument import instrument
 
 
 def _write_csv(path: str, rows: list[dict[str, str]]) -> None:
@@ -243,3 +244,98 @@ def test_from_sdf_removes_name_column(mock_padel, tmp_path) -> None:
     assert isinstance(rows, list)
     assert "Name" not in rows[0]
     assert rows[0]["nC"] == "9"
+
+
+def _flags(mock_padel) -> tuple:
+    kwargs = mock_padel.call_args.kwargs
+    return tuple(kwargs[name] for name in ("d_2d", "d_3d", "fingerprints", "convert3d"))
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        (None, (True, True, False, True)),
+        ("3d", (True, True, False, True)),
+        ("2d", (True, False, False, False)),
+        ("fingerprints", (False, False, True, False)),
+    ],
+)
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_mode_selects_minimal_flags(mock_padel, mode, expected) -> None:
+    mock_padel.side_effect = _padel_writes_rows([{"Name": "AUTOGEN_1", "nC": "3"}])
+    from_smiles("CCC", mode=mode)
+    assert _flags(mock_padel) == expected
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_existing3d_keeps_coordinates(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mol.sdf"
+    sdf.write_text("mol\n\n  0  0\nM  END\n$$$$\n")
+    mock_padel.side_effect = _padel_writes_rows([{"Name": "mol", "nC": "9"}])
+    from_sdf(str(sdf), mode="existing3d")
+    assert _flags(mock_padel) == (True, True, False, False)
+    assert mock_padel.call_args.kwargs["retain3d"] is True
+
+
+def test_mode_validation() -> None:
+    with pytest.raises(ValueError, match="`mode` must be one of"):
+        from_smiles("CCC", mode="4d")
+    with pytest.raises(ValueError, match="SMILES have no coordinates"):
+        from_smiles("CCC", mode="existing3d")
+    with pytest.raises(ValueError, match="3D descriptor classes"):
+        from_smiles("CCC", descriptors=["RDF"], mode="2d")
+
+
+def _padel_echoes_input():
+    """Write one row per input line (SMILES or SDF record title), recording batches."""
+    batches = []
+
+    def _side_effect(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        if kwargs["mol_dir"].endswith(".smi"):
+            molecules = text.split("\n")
+        else:
+            molecules = [rec.split("\n")[0] for rec in text.split("$$$$\n") if rec]
+        batches.append(molecules)
+        _write_csv(
+            kwargs["d_file"],
+            [{"Name": mol, "MW": "1.0", "nC": str(len(mol))} for mol in molecules],
+        )
+
+    return _side_effect, batches
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_dedup_fans_out_in_order(mock_padel, chdir_tmp) -> None:
+    mock_padel.side_effect, batches = _padel_echoes_input()
+    with instrument() as report:
+        rows = from_smiles(["CCC", "C", "CCC", "CC", "C"], dedup=True)
+    assert batches == [["CCC", "C", "CC"]]
+    assert [row["nC"] for row in rows] == ["3", "1", "3", "2", "1"]
+    assert rows[0] is not rows[2]
+    assert report.counts["duplicates"] == 2
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_dedup_writes_every_row_to_csv(mock_padel, chdir_tmp) -> None:
+    mock_padel.side_effect, _ = _padel_echoes_input()
+    out = chdir_tmp / "out.csv"
+    from_smiles(["C", "C"], output_csv=str(out), dedup=True)
+    assert out.read_text(encoding="utf-8").splitlines()[1:] == ["C,1.0,1", "C,1.0,1"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_dedup_ignores_titles_and_data_fields(mock_padel, tmp_path) -> None:
+    table = "  1  0  0  0  0  0  0  0  0  0999 V2000\nM  END\n"
+    other = "  2  1  0  0  0  0  0  0  0  0999 V2000\nM  END\n"
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text(
+        f"a\n  prog 1\n\n{table}> <ID>\n1\n\n$$$$\n"
+        f"bb\n  prog 2\n\n{table}> <ID>\n2\n\n$$$$\n"
+        f"ccc\n  prog 3\n\n{other}$$$$\n",
+        encoding="utf-8",
+    )
+    mock_padel.side_effect, batches = _padel_echoes_input()
+    rows = from_sdf(str(sdf), dedup=True)
+    assert batches == [["a", "ccc"]]
+    assert [row["nC"] for row in rows] == ["1", "1", "3"]
@@ -0,0 +1,121 @@
+"""Unit tests for padelpy.ingest (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from padelpy.ingest import iter_csv_arrays, read_csv_array, read_csv_rows  # noqa: E402
+
+
+def _engines() -> list[str]:
+    engines = ["numpy"]
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return engines
+    return [*engines, "pyarrow"]
+
+
+@pytest.fixture
+def padel_csv(tmp_path) -> Path:
+    path = tmp_path / "descriptors.csv"
+    path.write_text(
+        "Name,nC,MW,XLogP\n"
+        "AUTOGEN_1,3,44.06,1.5\n"
+        "AUTOGEN_2,,58.08,Infinity\n"
+        "AUTOGEN_3,4,,-1e2\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_read_csv_array_values(padel_csv, engine) -> None:
+    names, array = read_csv_array(str(padel_csv), engine=engine)
+    assert names == ["AUTOGEN_1", "AUTOGEN_2", "AUTOGEN_3"]
+    assert array.columns == ["nC", "MW", "XLogP"]
+    expected = np.array([[3, 44.06, 1.5], [np.nan, 58.08, np.inf], [4, np.nan, -100.0]])
+    np.testing.assert_array_equal(array.values, expected)
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_non_numeric_cells_become_nan(tmp_path, engine) -> None:
+    path = tmp_path / "d.csv"
+    path.write_text("Name,a,b\nm1, 1 ,abc\nm2,2,3\n", encoding="utf-8")
+    _, array = read_csv_array(str(path), engine=engine, dtype="float32")
+    assert array.values.dtype == np.float32
+    np.testing.assert_array_equal(array.values, [[1, np.nan], [2, 3]])
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_column_projection_keeps_requested_order(padel_csv, engine) -> None:
+    _, array = read_csv_array(str(padel_csv), columns=["XLogP", "nC"], engine=engine)
+    assert array.columns == ["XLogP", "nC"]
+    assert array.values[0].tolist() == [1.5, 3.0]
+    with pytest.raises(ValueError, match="not found"):
+        read_csv_array(str(padel_csv), columns=["nope"], engine=engine)
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_iter_csv_arrays_chunks(padel_csv, engine) -> None:
+    chunks = list(iter_csv_arrays(str(padel_csv), chunksize=2, engine=engine))
+    assert [len(names) for names, _ in chunks] == [2, 1]
+    stacked = np.vstack([array.values for _, array in chunks])
+    _, whole = read_csv_array(str(padel_csv), engine=engine)
+    np.testing.assert_array_equal(stacked, whole.values)
+
+
+def test_pyarrow_falls_back_mid_stream(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "big.csv"
+    # > 1 MB, so pyarrow yields several blocks before reaching the bad cell
+    rows = [f"m{i},{i},{i * 0.5}" for i in range(150000)]
+    rows[-1] = "mlast,abc,1"  # only parseable by the NumPy engine
+    path.write_text("Name,a,b\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    chunks = list(iter_csv_arrays(str(path), chunksize=10000, engine="pyarrow"))
+    names = [name for chunk_names, _ in chunks for name in chunk_names]
+    assert len(names) == 150000
+    assert [len(chunk_names) for chunk_names, _ in chunks] == [10000] * 15
+    assert names[-1] == "mlast"
+    values = np.vstack([array.values for _, array in chunks])
+    assert values[0].tolist() == [0.0, 0.0]
+    assert np.isnan(values[-1, 0])
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_header_only_csv(tmp_path, engine) -> None:
+    path = tmp_path / "empty.csv"
+    path.write_text("Name,a,b\n", encoding="utf-8")
+    names, array = read_csv_array(str(path), engine=engine)
+    assert names == []
+    assert array.values.shape == (0, 2)
+
+
+@pytest.mark.parametrize("engine", _engines())
+def test_invalid_utf8_raises_runtime_error(tmp_path, engine) -> None:
+    path = tmp_path / "bad.csv"
+    path.write_bytes(b"Name,a\n\xff\xfe,1\n")
+    with pytest.raises(RuntimeError, match="not valid UTF-8"):
+        read_csv_array(str(path), engine=engine)
+
+
+def test_read_csv_rows_projects_and_keeps_name(padel_csv) -> None:
+    rows = read_csv_rows(str(padel_csv), columns=["MW"])
+    assert rows[1] == {"Name": "AUTOGEN_2", "MW": "58.08"}
+    assert read_csv_rows(str(padel_csv))[0] == {
+        "Name": "AUTOGEN_1",
+        "nC": "3",
+        "MW": "44.06",
+        "XLogP": "1.5",
+    }
+
+
+def test_engine_and_chunksize_validation(padel_csv) -> None:
+    with pytest.raises(ValueError, match="engine"):
+        read_csv_array(str(padel_csv), engine="polars")
+    with pytest.raises(ValueError, match="chunksize"):
+        iter_csv_arrays(str(padel_csv), chunksize=0)
@@ -0,0 +1,143 @@
+"""Unit tests for padelpy.instrument with mocked PaDEL (no Java)."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import afrom_smiles, from_smiles, padeldescriptor
+from padelpy import instrument as instrument_module
+from padelpy.instrument import Event, add_hook, instrument, remove_hook
+from padelpy.wrapper import PaDELTimeoutError, _popen_timeout
+
+
+def _write_rows(**kwargs) -> None:
+    n = len(Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n"))
+    lines = ["Name,nC"] + [f"AUTOGEN_{i},{i}" for i in range(n)]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_report_collects_stages_counts_and_calls(mock_padel) -> None:
+    mock_padel.side_effect = _write_rows
+    with instrument() as report:
+        from_smiles(["C", "CC", "CCC"])
+    assert set(report.stages) == {"write_input", "parse"}
+    assert report.counts == {"molecules": 3, "rows": 3}
+    assert list(report.calls) == ["from_smiles"]
+    assert report.calls["from_smiles"] >= report.stages["parse"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_retries_are_counted(mock_padel) -> None:
+    attempts = []
+
+    def _flaky(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise RuntimeError("PaDEL-Descriptor encountered an error: flaky")
+        _write_rows(**kwargs)
+
+    mock_padel.side_effect = _flaky
+    with instrument() as report:
+        from_smiles("CCC")
+    assert report.counts["retries"] == 2
+
+
+def test_popen_timeout_reports_spawn_padel_and_exit_code() -> None:
+    with instrument() as report:
+        _popen_timeout([sys.executable, "-c", "pass"], timeout=30)
+    assert {"spawn", "padel"} <= set(report.stages)
+    assert report.exit_codes == [0]
+
+
+def test_popen_timeout_reports_timeouts() -> None:
+    argv = [sys.executable, "-c", "import time; time.sleep(30)"]
+    with instrument() as report:
+        with pytest.raises(PaDELTimeoutError):
+            _popen_timeout(argv, timeout=0.2)
+    assert report.counts == {"timeouts": 1}
+    assert report.exit_codes and report.exit_codes[0] != 0
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+@patch("padelpy.wrapper._popen_timeout", return_value=(b"", b""))
+def test_padeldescriptor_call_event(_mock_popen, _mock_which) -> None:
+    events = []
+    add_hook(events.append)
+    try:
+        padeldescriptor(mol_dir="in.smi", d_file="out.csv")
+    finally:
+        remove_hook(events.append)
+    assert [(e.kind, e.name) for e in events] == [("call", "padeldescriptor")]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_disabled_instrumentation_emits_nothing(mock_padel) -> None:
+    mock_padel.side_effect = _write_rows
+    with patch.object(instrument_module, "_emit") as emit:
+        from_smiles(["C", "CC"])
+    emit.assert_not_called()
+    assert instrument_module._hooks == ()
+
+
+def test_remove_unknown_hook_raises() -> None:
+    with pytest.raises(ValueError):
+        remove_hook(lambda event: None)
+
+
+def test_event_fields() -> None:
+    assert Event("stage", "parse", 0.5)._asdict() == {
+        "kind": "stage",
+        "name": "parse",
+        "value": 0.5,
+        "call": None,
+    }
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_report_groups_concurrent_calls(mock_padel) -> None:
+    barrier = threading.Barrier(2)
+
+    def _together(**kwargs):
+        barrier.wait(timeout=5)  # both calls are inside PaDEL at once
+        _write_rows(**kwargs)
+
+    mock_padel.side_effect = _together
+    batches = [["C"], ["CC", "CCC", "CCCC"]]
+    with instrument() as report, ThreadPoolExecutor(2) as executor:
+        list(executor.map(from_smiles, batches))
+    calls = report.by_call
+    assert None not in calls and len(calls) == 2
+    molecules = sorted(call.counts["molecules"] for call in calls.values())
+    assert molecules == [1, 3]
+    for call in calls.values():
+        assert list(call.calls) == ["from_smiles"]
+        assert call.counts["rows"] == call.counts["molecules"]
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_async_calls_get_their_own_call_ids(_mock_which) -> None:
+    async def _communicate(command, timeout):
+        csv = Path(command[command.index("-file") + 1])
+        csv.write_text("Name,nC\nAUTOGEN_1,1\n", encoding="utf-8")
+        await asyncio.sleep(0)
+        return b"", b""
+
+    async def _both():
+        return await asyncio.gather(afrom_smiles("C"), afrom_smiles("CC"))
+
+    with instrument() as report, patch("padelpy.aio._acommunicate", _communicate):
+        asyncio.run(_both())
+    calls = report.by_call
+    assert len(calls) == 2 and None not in calls
+    for call in calls.values():
+        # apadeldescriptor runs inside afrom_smiles and shares its call id
+        assert set(call.calls) == {"afrom_smiles", "apadeldescriptor"}
+        assert call.counts == {"molecules": 1, "rows": 1}
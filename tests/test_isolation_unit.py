@@ -0,0 +1,183 @@
+"""Unit tests for padelpy.isolation with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf_isolated, from_smiles, from_smiles_isolated
+from padelpy.isolation import MoleculeError
+from padelpy.timeouts import Deadline
+from padelpy.wrapper import PaDELTimeoutError
+
+
+def _smiles_in(kwargs) -> list[str]:
+    return Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+
+
+def _padel_fails_on(bad: set[str], empty: frozenset[str] = frozenset()):
+    """Raise for batches containing a ``bad`` SMILES; blank rows for ``empty``."""
+    batches = []
+
+    def _side_effect(**kwargs):
+        smiles = _smiles_in(kwargs)
+        batches.append(smiles)
+        if bad & set(smiles):
+            raise RuntimeError("PaDEL-Descriptor encountered an error: bad input")
+        lines = ["Name,nC"] + [
+            f"AUTOGEN_{smi}," + ("" if smi in empty else str(len(smi)))
+            for smi in smiles
+        ]
+        Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    return _side_effect, batches
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_all_good_runs_padel_once(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on(set())
+    result = from_smiles_isolated(["C", "CC", "CCC"])
+    assert [row["nC"] for row in result.rows] == ["1", "2", "3"]
+    assert result.errors == []
+    assert len(batches) == 1
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_bisection_pins_failure_and_computes_rest_once(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on({"XX"})
+    smiles = ["C", "CC", "CCC", "XX", "CCCCC", "CCCCCC", "CCCCCCC", "CCCCCCCC"]
+    result = from_smiles_isolated(smiles)
+    assert result.failed == [3]
+    assert result.errors[0] == MoleculeError(
+        3, "XX", "parse_failure", "PaDEL-Descriptor encountered an error: bad input"
+    )
+    assert result.rows[3] is None
+    assert [row["nC"] for i, row in enumerate(result.rows) if i != 3] == [
+        str(len(smi)) for i, smi in enumerate(smiles) if i != 3
+    ]
+    computed_ok = [smi for batch in batches if "XX" not in batch for smi in batch]
+    assert sorted(computed_ok) == sorted(smi for smi in smiles if smi != "XX")
+    # no batch is retried: 1 full + 2 halves + 2 quarters + 2 singles
+    assert len(batches) == 7
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_empty_rows_fail_without_bisection(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on(set(), frozenset({"CC"}))
+    result = from_smiles_isolated(["C", "CC", "CCC"])
+    assert result.failed == [1]
+    assert result.status == ["ok", "empty", "ok"]
+    assert "no values" in result.errors[0].message
+    assert len(batches) == 1
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_empty_rows_under_maxruntime_stay_empty(mock_padel) -> None:
+    # an empty row may be a maxruntime give-up or a failure; nothing confirms
+    # a timeout, so it is not reported as one
+    mock_padel.side_effect, _ = _padel_fails_on(set(), frozenset({"CC"}))
+    result = from_smiles_isolated(["C", "CC", "CCC"], maxruntime=5)
+    assert result.status == ["ok", "empty", "ok"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_subprocess_timeout_is_reported_as_timeout(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        if "CC" in _smiles_in(kwargs):
+            raise PaDELTimeoutError("PaDEL-Descriptor timed out during subprocess call")
+        Path(kwargs["d_file"]).write_text("Name,nC\nAUTOGEN_C,1\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    result = from_smiles_isolated(["C", "CC"])
+    assert result.status == ["ok", "timeout"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_passed_deadline_is_reported_as_timeout(mock_padel) -> None:
+    deadline = Deadline(60)
+    with patch("padelpy.timeouts.monotonic", return_value=deadline.expires):
+        isolated = from_smiles_isolated(["C", "CC", "CCC"], timeout=deadline)
+        collected = from_smiles(["C", "CC"], timeout=deadline, on_error="collect")
+    assert isolated.status == ["timeout"] * 3
+    assert collected.status == ["timeout"] * 2
+    assert "Deadline passed" in collected.errors[0].message
+    mock_padel.assert_not_called()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_collect_keeps_successful_rows(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect, _ = _padel_fails_on({"XX"}, frozenset({"CCC"}))
+    out = tmp_path / "out.csv"
+    result = from_smiles(
+        ["C", "XX", "CCC", "CCCC"], output_csv=str(out), on_error="collect"
+    )
+    assert result.status == ["ok", "parse_failure", "empty", "ok"]
+    assert result.rows[0] == {"nC": "1"}
+    assert result.rows[3] == {"nC": "4"}
+    assert out.read_text(encoding="utf-8").splitlines() == [
+        "Name,nC",
+        "AUTOGEN_C,1",
+        "AUTOGEN_CCCC,4",
+    ]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_collect_dedup_fans_out_errors(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on({"X"})
+    result = from_smiles(["CC", "X", "CC", "X"], on_error="collect", dedup=True)
+    assert batches[0] == ["CC", "X"]
+    assert result.rows[0] == result.rows[2] == {"nC": "2"}
+    assert result.failed == [1, 3]
+    assert [error.molecule for error in result.errors] == ["X", "X"]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_smiles_collect_does_not_retry(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on({"XX"})
+    result = from_smiles("XX", on_error="collect")
+    assert result.failed == [0]
+    assert len(batches) == 1
+
+
+def test_from_smiles_on_error_validation() -> None:
+    with pytest.raises(ValueError, match="on_error"):
+        from_smiles("C", on_error="ignore")
+    with pytest.raises(ValueError, match="output='dict'"):
+        from_smiles("C", on_error="collect", output="array")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_batch_size_limits_initial_batches(mock_padel) -> None:
+    mock_padel.side_effect, batches = _padel_fails_on(set())
+    from_smiles_isolated(["C", "CC", "CCC"], batch_size=2)
+    assert batches == [["C", "CC"], ["CCC"]]
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_from_sdf_isolated_reports_failing_record(mock_padel, tmp_path) -> None:
+    records = [f"m{n}\n\n  0  0\nM  END\n" for n in range(4)]
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("".join(f"{rec}$$$$\n" for rec in records), encoding="utf-8")
+
+    def _side_effect(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        names = [block.split("\n")[0] for block in text.split("$$$$\n") if block]
+        if "m2" in names:
+            raise RuntimeError("PaDEL-Descriptor encountered an error: m2")
+        lines = ["Name,nC"] + [f"{name},1" for name in names]
+        Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    result = from_sdf_isolated(str(sdf))
+    assert result.failed == [2]
+    assert result.errors[0].molecule == records[2]
+    assert sum(row is not None for row in result.rows) == 3
+
+
+def test_isolated_input_validation() -> None:
+    with pytest.raises(RuntimeError, match="Unknown input format"):
+        from_smiles_isolated("CCC")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match=r"\.sdf"):
+        from_sdf_isolated("mols.mdl")
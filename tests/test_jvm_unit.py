@@ -0,0 +1,167 @@
+"""Unit tests for padelpy.jvm and the JVM options of padelpy.wrapper (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import create_cds_archive, from_smiles, from_smiles_sharded
+from padelpy.jvm import JVMOptions, get_default_jvm, set_default_jvm
+from padelpy.wrapper import _PADEL_PATH, _padel_command, padeldescriptor
+
+
+@pytest.fixture(autouse=True)
+def _restore_default_jvm():
+    yield
+    set_default_jvm(None)
+
+
+def test_jvm_options_args_order() -> None:
+    options = JVMOptions(
+        max_heap="4g",
+        initial_heap=512,
+        gc="serial",
+        cds_archive="/tmp/padel.jsa",
+        flags=("-XX:TieredStopAtLevel=1",),
+    )
+    assert options.args() == [
+        "-Xmx4g",
+        "-Xms512m",
+        "-XX:+UseSerialGC",
+        "-XX:SharedArchiveFile=/tmp/padel.jsa",
+        "-XX:TieredStopAtLevel=1",
+    ]
+    assert JVMOptions().args() == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        JVMOptions(max_heap="lots"),
+        JVMOptions(initial_heap=0),
+        JVMOptions(max_heap=True),
+        JVMOptions(gc="fast"),
+    ],
+)
+def test_jvm_options_invalid(options: JVMOptions) -> None:
+    with pytest.raises(ValueError):
+        options.args()
+    with pytest.raises(ValueError):
+        set_default_jvm(options)
+    assert get_default_jvm() == JVMOptions()
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_default_jvm_used_by_command(_mock_which) -> None:
+    set_default_jvm(JVMOptions(max_heap=256, gc="serial"))
+    argv = _padel_command(mol_dir="in.smi", d_file="out.csv")
+    assert argv[:5] == [
+        "java",
+        "-Xmx256m",
+        "-XX:+UseSerialGC",
+        "-Djava.awt.headless=true",
+        "-jar",
+    ]
+    assert argv[5] == _PADEL_PATH
+
+    # an explicit jvm wins over the default
+    argv = _padel_command(jvm=JVMOptions(java="/opt/jdk/bin/java"))
+    assert argv[:3] == ["/opt/jdk/bin/java", "-Djava.awt.headless=true", "-jar"]
+
+
+@patch("padelpy.wrapper.which", return_value=None)
+def test_custom_java_not_found(_mock_which) -> None:
+    with pytest.raises(ReferenceError, match="/opt/jdk/bin/java"):
+        _padel_command(jvm=JVMOptions(java="/opt/jdk/bin/java"))
+    with pytest.raises(ReferenceError, match="Java not found on PATH"):
+        _padel_command()
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+@patch("padelpy.wrapper._popen_timeout", return_value=(b"", b""))
+def test_padeldescriptor_jvm_argv(mock_popen, _mock_which) -> None:
+    padeldescriptor(
+        mol_dir="in.smi",
+        d_file="out.csv",
+        jvm=JVMOptions(max_heap="2g"),
+        headless=False,
+    )
+    argv, _ = mock_popen.call_args.args
+    assert argv[:4] == ["java", "-Xmx2g", "-jar", _PADEL_PATH]
+
+    with pytest.raises(ValueError):
+        padeldescriptor(jvm=JVMOptions(gc="fast"))
+
+
+def _archive_writer(created: list):
+    """Stand-in for _popen_timeout that writes the -XX:ArchiveClassesAtExit file."""
+
+    def _run(command, timeout):
+        flag = next(arg for arg in command if arg.startswith("-XX:ArchiveClasses"))
+        partial = flag.split("=", 1)[1]
+        with open(partial, "wb") as handle:
+            handle.write(b"archive")
+        created.append(command)
+        return b"", b""
+
+    return _run
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+def test_create_cds_archive_reuse_and_force(_mock_which, tmp_path) -> None:
+    path = str(tmp_path / "cds" / "padel.jsa")
+    runs = []
+    jvm = JVMOptions(max_heap="1g", cds_archive="/old.jsa")
+    with patch("padelpy.wrapper._popen_timeout", side_effect=_archive_writer(runs)):
+        assert create_cds_archive(path, jvm=jvm) == path
+        assert create_cds_archive(path, jvm=jvm) == path
+        assert len(runs) == 1
+        assert create_cds_archive(path, jvm=jvm, force=True) == path
+        assert len(runs) == 2
+
+    command = runs[0]
+    assert command[:2] == ["java", "-Xmx1g"]
+    assert not any(arg.startswith("-XX:SharedArchiveFile") for arg in command)
+    assert "-3d" in command and "-fingerprints" in command
+    assert sorted(p.name for p in (tmp_path / "cds").iterdir()) == ["padel.jsa"]
+
+
+@patch("padelpy.wrapper.which", return_value="/usr/bin/java")
+@patch(
+    "padelpy.wrapper._popen_timeout",
+    return_value=(b"", b"Unrecognized VM option 'ArchiveClassesAtExit'"),
+)
+def test_create_cds_archive_unsupported_java(_mock_popen, _mock_which, tmp_path):
+    path = tmp_path / "padel.jsa"
+    with pytest.raises(RuntimeError, match="Unrecognized VM option"):
+        create_cds_archive(str(path))
+    assert not path.exists()
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_high_level_functions_pass_jvm(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    jvm = JVMOptions(max_heap="2g")
+    from_smiles("CCC", jvm=jvm)
+    assert mock_padel.call_args.kwargs["jvm"] == jvm
+    # without jvm=, padeldescriptor falls back to this process's default
+    from_smiles("CCC")
+    assert "jvm" not in mock_padel.call_args.kwargs
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sharded_runs_carry_the_default_jvm(mock_padel) -> None:
+    # worker processes start without this process's default, so shards carry it
+    mock_padel.side_effect = _echo_smiles_rows
+    set_default_jvm(JVMOptions(gc="serial"))
+    from_smiles_sharded(["C", "CC", "CCC"], shard_size=1)
+    jvms = {call.kwargs["jvm"] for call in mock_padel.call_args_list}
+    assert jvms == {JVMOptions(gc="serial")}
@@ -0,0 +1,90 @@
+"""Unit tests for padelpy.parallel with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf_sharded, from_smiles_sharded
+from padelpy.parallel import ShardTiming
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sharded_rows_reassembled_in_input_order(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    smiles = ["C" * n for n in range(1, 8)]
+    result = from_smiles_sharded(smiles, shard_size=3, workers=3)
+    assert [row["nC"] for row in result.rows] == [str(n) for n in range(1, 8)]
+    assert all("Name" not in row for row in result.rows)
+    assert mock_padel.call_count == 3
+    assert [(s.index, s.start, s.stop) for s in result.shards] == [
+        (0, 0, 3),
+        (1, 3, 6),
+        (2, 6, 7),
+    ]
+    assert all(isinstance(s, ShardTiming) and s.seconds >= 0 for s in result.shards)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sharded_defaults_to_one_padel_thread_per_process(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    from_smiles_sharded(["CCC"], maxruntime=2)
+    assert mock_padel.call_args.kwargs["threads"] == 1
+    assert mock_padel.call_args.kwargs["maxruntime"] == 2000
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sharded_short_shard_raises_runtime_error(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text("Name,nC\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    with pytest.raises(RuntimeError, match="shard 0"):
+        from_smiles_sharded(["CCC", "CCCC"], shard_size=2, workers=1)
+
+
+def test_sharded_rejects_non_list_input() -> None:
+    with pytest.raises(RuntimeError, match="Unknown input format"):
+        from_smiles_sharded("CCC")  # type: ignore[arg-type]
+
+
+def test_sharded_rejects_bad_shard_size() -> None:
+    with pytest.raises(ValueError, match="shard_size"):
+        from_smiles_sharded(["CCC"], shard_size=0)
+
+
+def _echo_sdf_rows(**kwargs) -> None:
+    text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+    titles = [record.split("\n")[0] for record in text.split("$$$$\n") if record]
+    lines = ["Name,nC"] + [f"{title},{title[1:]}" for title in titles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sdf_sharded_rows_in_file_order(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect = _echo_sdf_rows
+    sdf = tmp_path / "library.sdf"
+    sdf.write_text("".join(f"m{i}\n\n\nM  END\n$$$$\n" for i in range(5)))
+    result = from_sdf_sharded(str(sdf), shard_size=2, workers=2)
+    assert [row["nC"] for row in result.rows] == ["0", "1", "2", "3", "4"]
+    assert [(s.start, s.stop) for s in result.shards] == [(0, 2), (2, 4), (4, 5)]
+    assert (tmp_path / "library.sdf.padelidx").exists()
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sdf_sharded_by_bytes(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect = _echo_sdf_rows
+    sdf = tmp_path / "library.sdf"
+    sdf.write_text("".join(f"m{i}\n\n\nM  END\n$$$$\n" for i in range(4)))
+    result = from_sdf_sharded(str(sdf), shard_size=10, shard_bytes=40, workers=1)
+    assert [(s.start, s.stop) for s in result.shards] == [(0, 2), (2, 4)]
+    with pytest.raises(ValueError, match="extension"):
+        from_sdf_sharded(str(tmp_path / "library.txt"))
@@ -0,0 +1,113 @@
+"""Unit tests for progress reporting with a fake PaDEL subprocess (no Java)."""
+
+from __future__ import annotations
+
+import sys
+import time
+from subprocess import TimeoutExpired
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import iter_progress, padeldescriptor
+from padelpy.progress import Progress, _Tracker
+from padelpy.wrapper import PaDELTimeoutError, _popen_timeout
+
+
+def _fake_padel(n: int, delay: float = 0.0, tail: str = "") -> list:
+    """argv printing PaDEL-style progress lines for ``n`` molecules."""
+    script = (
+        "import sys, time\n"
+        f"for i in range(1, {n} + 1):\n"
+        f"    time.sleep({delay})\n"
+        "    print(f'Processing AUTOGEN_{i} in /tmp/in.smi ({i}/" + str(n) + "). "
+        "Average speed: 0.01 s/mol.', flush=True)\n"
+        "print('Descriptor calculation completed in 0.1 secs . "
+        "Average speed: 0.01 s/mol.', flush=True)\n" + tail
+    )
+    return [sys.executable, "-c", script]
+
+
+def test_tracker_parses_processing_lines() -> None:
+    tracker = _Tracker()
+    assert tracker.update(b"Descriptor calculation completed in 1 secs\n") is None
+    first = tracker.update(b"Processing m in a b.smi (2/3). Average speed: 1 s/mol.\n")
+    assert first[:3] == (1, 3, "m")
+    assert first.rate is None and first.eta is None
+    time.sleep(0.01)
+    second = tracker.update(b"Processing n in a.smi (1/3). Average speed: 1 s/mol.\n")
+    assert second[:3] == (2, 3, "n")
+    assert second.rate > 0
+    assert second.eta == pytest.approx(1 / second.rate)
+
+
+def test_popen_timeout_reports_each_molecule() -> None:
+    updates = []
+    out, err = _popen_timeout(_fake_padel(3), timeout=30, progress=updates.append)
+    assert [(u.processed, u.total, u.molecule) for u in updates] == [
+        (1, 3, "AUTOGEN_1"),
+        (2, 3, "AUTOGEN_2"),
+        (3, 3, "AUTOGEN_3"),
+    ]
+    assert all(isinstance(u, Progress) for u in updates)
+    assert b"completed" in out
+    assert err == b""
+
+
+def test_progress_timeout_kills_process() -> None:
+    argv = _fake_padel(1, tail="time.sleep(30)\n")
+    began = time.monotonic()
+    with pytest.raises(PaDELTimeoutError, match="timed out"):
+        _popen_timeout(argv, timeout=0.5, progress=lambda update: None)
+    assert time.monotonic() - began < 10
+
+
+@patch("padelpy.wrapper._follow", side_effect=TimeoutExpired(["java"], 1))
+@patch("padelpy.wrapper.Popen")
+def test_progress_timeout_is_not_reaped_twice(mock_popen, mock_follow) -> None:
+    # _follow kills the process and joins its pumps before raising
+    with pytest.raises(PaDELTimeoutError):
+        _popen_timeout(["java"], timeout=1, progress=lambda update: None)
+    mock_popen.return_value.kill.assert_not_called()
+    mock_popen.return_value.communicate.assert_not_called()
+
+
+def test_raising_callback_kills_process() -> None:
+    def _abort(update: Progress) -> None:
+        raise KeyboardInterrupt("reshard")
+
+    began = time.monotonic()
+    with pytest.raises(KeyboardInterrupt, match="reshard"):
+        _popen_timeout(_fake_padel(1, tail="time.sleep(30)\n"), 60, _abort)
+    assert time.monotonic() - began < 10
+
+
+@patch("padelpy.wrapper._padel_command")
+def test_padeldescriptor_progress_callback(mock_command) -> None:
+    mock_command.return_value = _fake_padel(2)
+    updates = []
+    padeldescriptor(mol_dir="in.smi", d_file="out.csv", progress=updates.append)
+    assert [u.processed for u in updates] == [1, 2]
+
+
+@patch("padelpy.wrapper._padel_command")
+def test_iter_progress_yields_then_raises_padel_errors(mock_command) -> None:
+    mock_command.return_value = _fake_padel(
+        2, tail="sys.stderr.write('bad molecule')\n"
+    )
+    updates = []
+    with pytest.raises(RuntimeError, match="bad molecule"):
+        for update in iter_progress(mol_dir="in.smi", d_file="out.csv"):
+            updates.append(update)
+    assert [u.processed for u in updates] == [1, 2]
+    mock_command.assert_called_once_with(mol_dir="in.smi", d_file="out.csv")
+
+
+@patch("padelpy.wrapper._padel_command")
+def test_closing_iter_progress_kills_padel(mock_command) -> None:
+    mock_command.return_value = _fake_padel(1, tail="time.sleep(30)\n")
+    began = time.monotonic()
+    for update in iter_progress(mol_dir="in.smi"):
+        assert update.processed == 1
+        break
+    assert time.monotonic() - began < 10
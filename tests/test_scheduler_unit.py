@@ -0,0 +1,159 @@
+"""Unit tests for padelpy.scheduler with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_smiles_adaptive
+from padelpy.scheduler import ScheduledResult, SchedulePlan, _Scheduler
+from padelpy.timeouts import Deadline, ScaledTimeout
+from padelpy.wrapper import PaDELTimeoutError
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _scheduler(**kwargs) -> _Scheduler:
+    settings = dict(
+        workers=4, min_batch=1, max_batch=1000, overhead=0.1, timeout=60, prior=None
+    )
+    settings.update(kwargs)
+    return _Scheduler(**settings)
+
+
+def test_model_fit_and_batch_limits() -> None:
+    scheduler = _scheduler()
+    assert not scheduler.ready
+    scheduler.record(8, 2.08)
+    assert not scheduler.ready  # one batch size cannot separate the costs
+    scheduler.record(16, 2.16)
+    assert scheduler.startup == pytest.approx(2.0)
+    assert scheduler.per_molecule == pytest.approx(0.01)
+    # start-up would be 10% of a 1800-molecule batch: max_batch wins
+    assert scheduler.batch_size == 1000
+
+    # half of a 10 s timeout leaves 3 s for molecules at 0.01 s each
+    prior = SchedulePlan(1000, 4, 2.0, 0.01, 0.0)
+    assert _scheduler(timeout=10, prior=prior).batch_size == 300
+
+    # one failed batch per 2000 molecules: sqrt(2 / (0.01 / 2000)) = 633
+    scheduler.record_failure(1976)
+    assert scheduler.failure_rate == pytest.approx(1 / 2000)
+    assert scheduler.batch_size == 633
+
+
+def test_batch_limit_resolves_timeout_policies() -> None:
+    prior = SchedulePlan(1000, 4, 2.0, 0.01, 0.0)
+    # a 600-molecule batch gets 10 + 6 s, half of which covers 2 + 6 s
+    policy = ScaledTimeout(per_molecule=0.01, startup=10, maximum=20)
+    assert _scheduler(timeout=policy, prior=prior).batch_size == 600
+    assert _scheduler(timeout=Deadline(10), prior=prior).batch_size in (299, 300)
+
+    deadline = Deadline(10)
+    with patch("padelpy.timeouts.monotonic", return_value=deadline.expires):
+        assert _scheduler(timeout=deadline, prior=prior).batch_size == 1
+
+
+def test_concurrency_climbs_while_throughput_improves() -> None:
+    scheduler = _scheduler(workers=4)
+    assert scheduler.concurrency == 2
+    clock = iter([1.0, 2.0, 3.0])
+    with patch("padelpy.scheduler.perf_counter", side_effect=lambda: next(clock)):
+        scheduler._window_start = 0.0
+        for _ in range(2):
+            scheduler.record(10, 1.0)  # 20 molecules/s
+        assert scheduler.concurrency == 3
+        for _ in range(3):
+            scheduler.record(20, 1.0)  # 60 molecules/s: keep climbing
+        assert scheduler.concurrency == 4
+        for _ in range(4):
+            scheduler.record(10, 1.0)  # 40 molecules/s: step back and stay
+    assert scheduler.concurrency == 3
+    assert not scheduler.climbing
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_adaptive_rows_in_input_order(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    smiles = ["C" * (1 + idx % 9) for idx in range(120)]
+    result = from_smiles_adaptive(smiles, workers=3, probe_size=4, max_batch=50)
+    assert isinstance(result, ScheduledResult)
+    assert [row["nC"] for row in result.rows] == [str(len(smi)) for smi in smiles]
+    assert sorted((b.start, b.stop) for b in result.batches)[:2] == [(0, 4), (4, 12)]
+    assert sum(b.stop - b.start for b in result.batches) == 120
+    assert 1 <= result.plan.batch_size <= 50
+    assert mock_padel.call_args.kwargs["threads"] == 1
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_failed_batches_are_split(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+        if len(smiles) > 3:
+            raise PaDELTimeoutError("PaDEL-Descriptor timed out during subprocess call")
+        _echo_smiles_rows(**kwargs)
+
+    mock_padel.side_effect = _side_effect
+    smiles = ["C" * n for n in range(1, 21)]
+    result = from_smiles_adaptive(smiles, workers=2, probe_size=4)
+    assert [row["nC"] for row in result.rows] == [str(n) for n in range(1, 21)]
+    assert result.plan.failure_rate > 0
+    assert all(b.stop - b.start <= 3 for b in result.batches)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_single_failing_molecule_raises(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+        if "bad" in smiles:
+            Path(kwargs["d_file"]).write_text("Name,nC\n", encoding="utf-8")
+        else:
+            _echo_smiles_rows(**kwargs)
+
+    mock_padel.side_effect = _side_effect
+    smiles = ["C", "CC", "bad", "CCC", "CCCC", "CCCCC"]
+    with pytest.raises(RuntimeError, match="failed on bad"):
+        from_smiles_adaptive(smiles, workers=1, probe_size=2)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_learned_plan_is_saved_and_reused(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    state = tmp_path / "state" / "plans.json"
+    smiles = ["CC"] * 40
+    first = from_smiles_adaptive(
+        smiles, workers=2, probe_size=4, max_batch=10, state_path=str(state)
+    )
+    saved = json.loads(state.read_text())["modes"]
+    assert len(saved) == 1
+    assert next(iter(saved.values()))["batch_size"] == first.plan.batch_size
+
+    # a known mode skips the probes: batches are sized from the saved model
+    key = next(iter(saved))
+    saved[key].update(SchedulePlan(7, 1, 1.0, 0.01, 0.0)._asdict())
+    state.write_text(json.dumps({"version": 1, "modes": saved}))
+    second = from_smiles_adaptive(
+        smiles, workers=2, max_batch=10, state_path=str(state)
+    )
+    assert sorted((b.start, b.stop) for b in second.batches)[0] == (0, 10)
+    assert all(b.concurrency == 1 for b in second.batches)
+
+    # another descriptor mode gets its own entry
+    from_smiles_adaptive(["CC"] * 4, mode="2d", state_path=str(state))
+    assert len(json.loads(state.read_text())["modes"]) == 2
+
+
+def test_adaptive_rejects_bad_arguments() -> None:
+    with pytest.raises(RuntimeError, match="Unknown input format"):
+        from_smiles_adaptive("CCC")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="min_batch"):
+        from_smiles_adaptive(["CCC"], min_batch=5, max_batch=2)
+    with pytest.raises(ValueError, match="overhead"):
+        from_smiles_adaptive(["CCC"], overhead=1.5)
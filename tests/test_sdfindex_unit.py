@@ -0,0 +1,101 @@
+"""Unit tests for padelpy.sdfindex."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import sdfindex
+from padelpy.functions import _iter_mol_records
+from padelpy.sdfindex import SDFShard, index_sdf
+
+
+def _records(index) -> list[str]:
+    """Indexed byte ranges, without their ``$$$$`` line, with LF newlines."""
+    data = Path(index.path).read_bytes()
+    return [
+        re.sub(
+            r"\$\$\$\$\r*\n?\Z",
+            "",
+            data[index.bounds[i] : index.bounds[i + 1]].decode("utf-8"),
+        ).replace("\r\n", "\n")
+        for i in range(len(index))
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a\nM  END\n$$$$\nb\nM  END\n$$$$\n",
+        "a\r\nM  END\r\n$$$$\r\nb\r\nM  END\r\n$$$$\r\n",
+        "a\nM  END\n$$$$\nb\nM  END\n",  # last record unterminated
+        "a\nM  END\n$$$$\n\n  \n",  # whitespace tail is not a record
+        "a\n$$$$ x\nM  END\n$$$$",  # "$$$$ x" is not a delimiter
+        "",
+    ],
+)
+def test_index_matches_record_reader(tmp_path, text) -> None:
+    path = tmp_path / "mols.sdf"
+    path.write_bytes(text.encode("utf-8"))
+    index = index_sdf(str(path), cache=False)
+    expected = list(_iter_mol_records(str(path)))
+    assert len(index) == len(expected)
+    assert _records(index) == [want.replace("\r\n", "\n") for want in expected]
+
+
+def test_cache_is_reused_until_file_changes(tmp_path) -> None:
+    path = tmp_path / "mols.sdf"
+    path.write_text("a\n$$$$\nb\n$$$$\n")
+    first = index_sdf(str(path))
+    assert Path(f"{path}.padelidx").exists()
+    with patch.object(sdfindex, "_scan", side_effect=AssertionError):
+        assert list(index_sdf(str(path)).bounds) == list(first.bounds)
+
+    path.write_text("a\n$$$$\nb\n$$$$\nc\n$$$$\n")
+    assert len(index_sdf(str(path))) == 3
+
+
+def test_corrupt_or_unwritable_cache_is_ignored(tmp_path) -> None:
+    path = tmp_path / "mols.sdf"
+    path.write_text("a\n$$$$\n")
+    Path(f"{path}.padelidx").write_bytes(b"junk")
+    assert len(index_sdf(str(path))) == 1
+    with patch.object(sdfindex, "replace", side_effect=PermissionError):
+        assert len(index_sdf(str(path), cache=True)) == 1
+
+
+def test_shards_by_count_and_bytes(tmp_path) -> None:
+    path = tmp_path / "mols.sdf"
+    # records of 10, 10, 29 and 10 bytes
+    path.write_text(
+        "a\nxx\n$$$$\nb\nxx\n$$$$\n" + "c" * 20 + "\nxx\n$$$$\nd\nxx\n$$$$\n"
+    )
+    index = index_sdf(str(path), cache=False)
+    assert index.shards(molecules=3) == [
+        SDFShard(0, 0, 3, 0, 49),
+        SDFShard(1, 3, 4, 49, 10),
+    ]
+    assert [(s.start, s.stop) for s in index.shards(max_bytes=20)] == [
+        (0, 2),
+        (2, 3),  # larger than max_bytes on its own
+        (3, 4),
+    ]
+    assert [(s.start, s.stop) for s in index.shards(molecules=1, max_bytes=100)] == [
+        (0, 1),
+        (1, 2),
+        (2, 3),
+        (3, 4),
+    ]
+    with pytest.raises(ValueError):
+        index.shards()
+
+
+def test_copy_writes_byte_range(tmp_path) -> None:
+    path = tmp_path / "mols.sdf"
+    path.write_text("a\n$$$$\nb\n$$$$\nc\n$$$$\n")
+    index = index_sdf(str(path), cache=False)
+    index.copy(1, 3, str(tmp_path / "part.sdf"))
+    assert (tmp_path / "part.sdf").read_text() == "b\n$$$$\nc\n$$$$\n"
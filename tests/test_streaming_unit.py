@@ -0,0 +1,96 @@
+"""Unit tests for padelpy.streaming with mocked padeldescriptor (no Java)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import iter_sdf, iter_smiles
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _echo_sdf_rows(**kwargs) -> None:
+    text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+    names = [block.split("\n")[0] for block in text.split("$$$$\n") if block]
+    lines = ["Name,nC"] + [f"{name},{len(name)}" for name in names]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_smiles_yields_rows_in_order_per_chunk(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    source = ("C" * n for n in range(1, 6))  # lazily consumed generator
+    rows = list(iter_smiles(source, chunk_size=2))
+    assert [row["nC"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert all("Name" not in row for row in rows)
+    assert mock_padel.call_count == 3
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_smiles_blank_entry_raises_value_error(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    smi = tmp_path / "mols.smi"
+    smi.write_text(" CCC\nCCCC \n", encoding="utf-8")
+    with open(smi, encoding="utf-8") as handle:
+        rows = list(iter_smiles(handle))
+    assert [row["nC"] for row in rows] == ["3", "4"]  # whitespace is stripped
+
+    # skipping the blank line would shift every later row up one position
+    smi.write_text("CCC\n\nCCCC\n", encoding="utf-8")
+    with open(smi, encoding="utf-8") as handle:
+        with pytest.raises(ValueError, match="position 1"):
+            list(iter_smiles(handle))
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_smiles_short_chunk_raises_runtime_error(mock_padel) -> None:
+    def _side_effect(**kwargs):
+        Path(kwargs["d_file"]).write_text("Name,nC\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    with pytest.raises(RuntimeError, match="failed on one or more mols"):
+        list(iter_smiles(["CCC"]))
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_smiles_early_close_stops_after_prefetch(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    rows = iter_smiles(["C", "CC", "CCC", "CCCC"], chunk_size=1)
+    assert next(rows)["nC"] == "1"
+    rows.close()
+    assert mock_padel.call_count <= 2
+
+
+def test_iter_smiles_rejects_single_string() -> None:
+    with pytest.raises(RuntimeError, match="Unknown input format"):
+        iter_smiles("CCC")
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_iter_sdf_streams_records_in_chunks(mock_padel, tmp_path) -> None:
+    mock_padel.side_effect = _echo_sdf_rows
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text(
+        "".join(f"m{'x' * n}\n\n  0  0\nM  END\n$$$$\n" for n in range(5)),
+        encoding="utf-8",
+    )
+    rows = list(iter_sdf(str(sdf), chunk_size=2))
+    assert [row["nC"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert mock_padel.call_count == 3
+
+
+def test_iter_sdf_bad_extension_raises_value_error() -> None:
+    with pytest.raises(ValueError, match=r"\.sdf"):
+        iter_sdf("mols.mdl")
+
+
+def test_iter_bad_chunk_size_raises_value_error() -> None:
+    with pytest.raises(ValueError, match="chunk_size"):
+        iter_smiles(["CCC"], chunk_size=0)
@@ -0,0 +1,139 @@
+"""Unit tests for padelpy.timeouts and split-on-timeout (no Java)."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from padelpy import from_sdf, from_smiles
+from padelpy.instrument import instrument
+from padelpy.timeouts import Deadline, ScaledTimeout, _timeout_seconds
+from padelpy.wrapper import PaDELTimeoutError
+
+_TIMEOUT = "PaDEL-Descriptor encountered an error: timed out during subprocess call"
+
+
+def _echo_smiles_rows(**kwargs) -> None:
+    smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+    lines = ["Name,nC"] + [f"AUTOGEN_{smi},{len(smi)}" for smi in smiles]
+    Path(kwargs["d_file"]).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _times_out_above(limit: int):
+    """PaDEL mock that times out on more than ``limit`` SMILES."""
+
+    def _side_effect(**kwargs):
+        smiles = Path(kwargs["mol_dir"]).read_text(encoding="utf-8").split("\n")
+        if len(smiles) > limit:
+            raise PaDELTimeoutError(_TIMEOUT)
+        _echo_smiles_rows(**kwargs)
+
+    return _side_effect
+
+
+def test_policies_scale_with_molecules() -> None:
+    policy = ScaledTimeout(per_molecule=0.5, startup=20)
+    assert policy.seconds(1) == 20.5
+    assert policy.seconds(100) == 70.0
+    assert ScaledTimeout(maximum=100).seconds(1000) == 100.0
+
+    deadline = Deadline(60)
+    assert 59 < deadline.seconds(1000) <= 60
+    with patch("padelpy.timeouts.monotonic", return_value=deadline.expires + 1):
+        with pytest.raises(TimeoutError, match="Deadline passed"):
+            deadline.seconds(5)
+    with pytest.raises(ValueError, match="seconds"):
+        Deadline(0)
+
+    # plain seconds, None and objects without a seconds() method pass through
+    assert _timeout_seconds(60, 10) == 60
+    assert _timeout_seconds(None, 10) is None
+    assert _timeout_seconds(timedelta(seconds=5), 10) == timedelta(seconds=5)
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_scaled_timeout_is_resolved_per_run(mock_padel) -> None:
+    mock_padel.side_effect = _echo_smiles_rows
+    from_smiles(["C", "CC", "CCC"], timeout=ScaledTimeout(per_molecule=2, startup=5))
+    assert mock_padel.call_args.kwargs["sp_timeout"] == 11.0
+
+    mock_padel.side_effect = _times_out_above(2)
+    from_smiles(["C"] * 4, timeout=ScaledTimeout(per_molecule=2, startup=5))
+    timeouts = [call.kwargs["sp_timeout"] for call in mock_padel.call_args_list[1:]]
+    assert timeouts == [13.0, 9.0, 9.0]  # each half gets a smaller budget
+
+
+@pytest.mark.parametrize("output", ["dict", "array"])
+@patch("padelpy.functions.padeldescriptor")
+def test_timed_out_batch_is_split_not_retried(mock_padel, tmp_path, output) -> None:
+    if output == "array":
+        pytest.importorskip("numpy")
+    mock_padel.side_effect = _times_out_above(3)
+    smiles = ["C" * n for n in range(1, 11)]
+    out_csv = tmp_path / "out.csv"
+    with instrument() as report:
+        result = from_smiles(smiles, output_csv=str(out_csv), output=output)
+    if output == "array":
+        assert result.values[:, 0].tolist() == list(range(1, 11))
+    else:
+        assert [row["nC"] for row in result] == [str(n) for n in range(1, 11)]
+    # 10 -> 5 + 5 -> (2 + 3) + (2 + 3): one run per size, never a retry
+    assert mock_padel.call_count == 7
+    assert report.counts["splits"] == 3
+    assert "retries" not in report.counts
+    lines = out_csv.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 11 and lines[-1] == "AUTOGEN_CCCCCCCCCC,10"
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_single_molecule_timeout_raises(mock_padel) -> None:
+    mock_padel.side_effect = PaDELTimeoutError(_TIMEOUT)
+    with pytest.raises(RuntimeError, match="timed out"):
+        from_smiles(["CCC"])
+    assert mock_padel.call_count == 1
+
+    mock_padel.side_effect = _times_out_above(0)
+    with pytest.raises(RuntimeError, match="timed out"):
+        from_smiles(["C", "CC"])
+    assert mock_padel.call_count == 3  # the pair, then the first half
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_stderr_mentioning_timed_out_is_not_a_timeout(mock_padel) -> None:
+    # only PaDELTimeoutError splits a batch; PaDEL's own messages are retried
+    mock_padel.side_effect = RuntimeError("Molecule X: timed out reading ring")
+    with pytest.raises(RuntimeError, match="timed out reading") as exc_info:
+        from_smiles(["C", "CC"])
+    assert not isinstance(exc_info.value, PaDELTimeoutError)
+    assert mock_padel.call_count == 3
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_sdf_batch_is_split_on_timeout(mock_padel, tmp_path) -> None:
+    sdf = tmp_path / "mols.sdf"
+    sdf.write_text("".join(f"m{idx}\n\n  0  0\nM  END\n$$$$\n" for idx in range(5)))
+
+    def _side_effect(**kwargs):
+        text = Path(kwargs["mol_dir"]).read_text(encoding="utf-8")
+        names = [block.split("\n")[0] for block in text.split("$$$$\n")[:-1]]
+        if len(names) > 2:
+            raise PaDELTimeoutError(_TIMEOUT)
+        rows = ["Name,n"] + [f"{name},{name[1:]}" for name in names]
+        Path(kwargs["d_file"]).write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    mock_padel.side_effect = _side_effect
+    rows = from_sdf(str(sdf), timeout=ScaledTimeout(per_molecule=1, startup=1))
+    assert [row["n"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert mock_padel.call_args_list[0].kwargs["sp_timeout"] == 6.0
+
+
+@patch("padelpy.functions.padeldescriptor")
+def test_expired_deadline_stops_before_running(mock_padel) -> None:
+    deadline = Deadline(60)
+    with patch("padelpy.timeouts.monotonic", return_value=deadline.expires):
+        with pytest.raises(TimeoutError, match="Deadline passed"):
+            from_smiles(["C", "CC"], timeout=deadline)
+    mock_padel.assert_not_called()
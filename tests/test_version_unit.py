@@ -33,6 +33,23 @@ def test_public_all_and_version_export() -> None:
         "from_mdl",
         "from_sdf",
         "padeldescriptor",
+        "BatchCoalescer",
+        "from_smiles_sharded",
+        "DescriptorCache",
+        "iter_smiles",
+        "iter_sdf",
+        "iter_dataframes",
+        "from_smiles_adaptive",
+        "from_smiles_isolated",
+        "from_sdf_isolated",
+        "afrom_smiles",
+        "afrom_sdf",
+        "apadeldescriptor",
+        "iter_progress",
+        "create_cds_archive",
+        "from_sdf_resumable",
+        "from_sdf_sharded",
+        "PaDELTimeoutError",
         "__version__",
     }
 
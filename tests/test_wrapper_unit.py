@@ -7,7 +7,12 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from padelpy.wrapper import _PADEL_PATH, _popen_timeout, padeldescriptor
+from padelpy.wrapper import (
+    _PADEL_PATH,
+    PaDELTimeoutError,
+    _popen_timeout,
+    padeldescriptor,
+)
 
 _ERROR_PREFIX = "PaDEL-Descriptor encountered an error:"
 _TIMEOUT_STDERR = b"PaDEL-Descriptor timed out during subprocess call"
@@ -103,7 +108,7 @@ def test_padeldescriptor_timeout_raises_runtime_error_with_prefix(
 
 
 @patch("padelpy.wrapper.Popen")
-def test_popen_timeout_kills_and_returns_timeout_stderr(mock_popen_cls) -> None:
+def test_popen_timeout_kills_and_raises_padel_timeout_error(mock_popen_cls) -> None:
     proc = MagicMock()
     proc.communicate.side_effect = [
         TimeoutExpired(cmd=["java"], timeout=2),
@@ -112,10 +117,11 @@ def test_popen_timeout_kills_and_returns_timeout_stderr(mock_popen_cls) -> None:
     mock_popen_cls.return_value = proc
 
     argv = ["java", "-jar", "/tmp/fake.jar"]
-    stdout, stderr = _popen_timeout(argv, timeout=2)
+    with pytest.raises(PaDELTimeoutError, match=_ERROR_PREFIX) as exc_info:
+        _popen_timeout(argv, timeout=2)
 
-    assert stdout == -1
-    assert stderr == _TIMEOUT_STDERR
+    assert isinstance(exc_info.value, RuntimeError)
+    assert _TIMEOUT_STDERR.decode() in str(exc_info.value)
     mock_popen_cls.assert_called_once_with(argv, stdout=PIPE, stderr=PIPE)
     proc.communicate.assert_any_call(timeout=2)
     proc.kill.assert_called_once()